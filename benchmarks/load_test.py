@@ -0,0 +1,314 @@
+# Générateur de charge pour l'API Flask du cerveau artificiel
+#
+# Rejoue des traces de conversation contre /api/interact, /api/feedback et
+# /api/retrieve_memory, à concurrence et débit configurables, et rapporte
+# par fenêtre de temps le débit, les latences p50/p95/p99, le taux d'erreur
+# et la taille de la mémoire à long terme.
+#
+#   python main.py &                                         # instance à tester
+#   python benchmarks/load_test.py --rate 5 --duration 60
+#   python benchmarks/load_test.py --ramp-step 2 --ramp-interval 30 --output charge.json
+import os
+import sys
+import json
+import time
+import queue
+import random
+import argparse
+import threading
+from datetime import datetime
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+import numpy as np
+import requests
+
+import dataset_readers
+from benchmarks.workloads import make_texts
+
+KINDS = ('interact', 'feedback', 'retrieve')
+
+def load_trace(source, limit=5000, seed=0):
+    """
+    Messages à rejouer:
+    - 'history': entrées de data/interaction_history.json
+    - 'datasets': phrases lues en flux dans data/datasets
+    - 'synthetic' (ou source vide): phrases générées
+    - sinon: chemin d'un fichier d'historique JSON
+    """
+    messages = []
+    if source in ('history', None) or (source not in ('datasets', 'synthetic') and os.path.isfile(source)):
+        path = 'data/interaction_history.json' if source in ('history', None) else source
+        if os.path.exists(path):
+            with open(path) as f:
+                messages = [entry['input'] for entry in json.load(f) if isinstance(entry.get('input'), str)]
+    elif source == 'datasets':
+        data_dir = 'data/datasets'
+        for name in sorted(os.listdir(data_dir)) if os.path.isdir(data_dir) else []:
+            path = os.path.join(data_dir, name)
+            if not dataset_readers.is_supported_path(path):
+                continue
+            for text in dataset_readers.iter_texts(path):
+                # Des messages de la taille d'une phrase de conversation
+                messages.extend(s.strip() for s in text.split('.') if 10 < len(s.strip()) < 200)
+                if len(messages) >= limit:
+                    break
+            if len(messages) >= limit:
+                break
+
+    if not messages:
+        if source not in ('synthetic', None):
+            print(f"Aucun message trouvé pour la source '{source}', utilisation de phrases générées")
+        messages = make_texts(limit, seed=seed, max_words=12)
+
+    random.Random(seed).shuffle(messages)
+    return messages[:limit]
+
+def parse_mix(mix):
+    """'interact=0.7,feedback=0.1,retrieve=0.2' -> poids normalisés"""
+    weights = {kind: 0.0 for kind in KINDS}
+    for item in mix.split(','):
+        kind, _, weight = item.partition('=')
+        if kind.strip() not in weights:
+            raise ValueError(f"Type de requête inconnu: {kind}")
+        weights[kind.strip()] = float(weight)
+    total = sum(weights.values())
+    return {kind: weight / total for kind, weight in weights.items()}
+
+class LoadGenerator:
+    """
+    Envoie des requêtes depuis `concurrency` threads.
+    Avec un débit cible, les requêtes sont planifiées à intervalle régulier
+    (charge ouverte) et la latence est comptée depuis l'instant planifié, pour
+    ne pas masquer l'attente quand le serveur décroche.
+    """
+
+    def __init__(self, base_url, messages, mix, concurrency=4, timeout=30, seed=0):
+        self.base_url = base_url.rstrip('/')
+        self.messages = messages
+        self.mix = mix
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.rng = random.Random(seed)
+
+        self.rate = 0.0  # Requêtes/s (0 = aussi vite que possible)
+        self.records = []  # (fin, type, latence, succès)
+        self.records_lock = threading.Lock()
+        self.tickets = queue.Queue()
+        self.stop_event = threading.Event()
+        self.recent_interactions = []  # Réponses réutilisées pour les feedbacks
+
+    def _pick_kind(self):
+        value = self.rng.random()
+        for kind in KINDS:
+            value -= self.mix[kind]
+            if value < 0:
+                return kind
+        return 'interact'
+
+    def _send(self, session, kind):
+        """Envoie une requête; retourne True si elle a réussi"""
+        message = self.rng.choice(self.messages)
+        if kind == 'feedback' and self.recent_interactions:
+            input_msg, output_msg = self.rng.choice(self.recent_interactions)
+            response = session.post(f"{self.base_url}/api/feedback", timeout=self.timeout, json={
+                'input': input_msg, 'output': output_msg, 'is_positive': self.rng.random() < 0.7})
+        elif kind == 'retrieve':
+            response = session.post(f"{self.base_url}/api/retrieve_memory", timeout=self.timeout,
+                                    json={'query': message, 'top_k': 5})
+        else:
+            response = session.post(f"{self.base_url}/api/interact", timeout=self.timeout,
+                                    json={'message': message})
+            if response.status_code == 200:
+                data = response.json()
+                if data.get('status') == 'success':
+                    self.recent_interactions.append((data['input'], data['response']))
+                    del self.recent_interactions[:-100]
+        return response.status_code == 200
+
+    def _worker(self):
+        session = requests.Session()
+        while not self.stop_event.is_set():
+            if self.rate > 0:
+                try:
+                    scheduled = self.tickets.get(timeout=0.2)
+                except queue.Empty:
+                    continue
+            else:
+                scheduled = time.perf_counter()
+
+            kind = self._pick_kind()
+            try:
+                ok = self._send(session, kind)
+            except requests.RequestException:
+                ok = False
+            end = time.perf_counter()
+            with self.records_lock:
+                self.records.append((end, kind, end - scheduled, ok))
+
+    def _scheduler(self):
+        """Planifie les requêtes au débit cible (charge ouverte)"""
+        next_time = time.perf_counter()
+        while not self.stop_event.is_set():
+            if self.rate <= 0:
+                time.sleep(0.05)
+                next_time = time.perf_counter()
+                continue
+            now = time.perf_counter()
+            if now < next_time:
+                time.sleep(min(next_time - now, 0.05))
+                continue
+            self.tickets.put(next_time)
+            next_time += 1.0 / self.rate
+
+    def start(self):
+        threads = [threading.Thread(target=self._scheduler, daemon=True)]
+        threads.extend(threading.Thread(target=self._worker, daemon=True) for _ in range(self.concurrency))
+        for thread in threads:
+            thread.start()
+        self.threads = threads
+
+    def stop(self):
+        self.stop_event.set()
+        for thread in self.threads:
+            thread.join(timeout=self.timeout)
+
+    def take_records(self):
+        with self.records_lock:
+            records, self.records = self.records, []
+        return records
+
+    def backlog(self):
+        """Requêtes planifiées mais pas encore envoyées"""
+        return self.tickets.qsize()
+
+    def brain_status(self):
+        """Taille des mémoires, lue sur /api/status"""
+        try:
+            stats = requests.get(f"{self.base_url}/api/status", timeout=self.timeout).json()['stats']
+            return {key: stats['memory'][key] for key in ('stm_size', 'ltm_size', 'total_memories')}
+        except Exception:
+            return {'stm_size': None, 'ltm_size': None, 'total_memories': None}
+
+def summarize(records, elapsed, target_rate):
+    """Débit, latences et taux d'erreur d'une fenêtre"""
+    window = {'target_rate': target_rate, 'requests': len(records),
+              'throughput': len(records) / elapsed if elapsed else 0.0}
+    if not records:
+        window.update({'error_rate': 0.0, 'p50': None, 'p95': None, 'p99': None, 'by_kind': {}})
+        return window
+
+    latencies = np.array([r[2] for r in records])
+    window['error_rate'] = sum(1 for r in records if not r[3]) / len(records)
+    window['p50'], window['p95'], window['p99'] = (float(v) for v in np.percentile(latencies, [50, 95, 99]))
+    window['by_kind'] = {}
+    for kind in KINDS:
+        kind_latencies = [r[2] for r in records if r[1] == kind]
+        if kind_latencies:
+            window['by_kind'][kind] = {'requests': len(kind_latencies),
+                                       'p95': float(np.percentile(kind_latencies, 95))}
+    return window
+
+def _format_ms(value):
+    return f"{value * 1000:8.1f}" if value is not None else f"{'-':>8}"
+
+def main():
+    parser = argparse.ArgumentParser(description="Test de charge de l'API de Baby AI Brain")
+    parser.add_argument('--url', default='http://127.0.0.1:5000', help="Adresse de l'instance à tester")
+    parser.add_argument('--trace', default='synthetic',
+                        help="Source des messages: history, datasets, synthetic ou fichier d'historique JSON")
+    parser.add_argument('--mix', default='interact=0.7,feedback=0.1,retrieve=0.2',
+                        help='Proportions des types de requêtes')
+    parser.add_argument('--concurrency', type=int, default=4, help='Nombre de clients simultanés')
+    parser.add_argument('--rate', type=float, default=0,
+                        help='Débit cible en requêtes/s (0 = aussi vite que possible)')
+    parser.add_argument('--duration', type=float, default=60, help='Durée totale du test (secondes)')
+    parser.add_argument('--report-interval', type=float, default=10, help='Durée d\'une fenêtre de mesure')
+    parser.add_argument('--ramp-step', type=float, default=0,
+                        help='Augmente le débit de cette valeur à chaque palier (recherche du point de rupture)')
+    parser.add_argument('--ramp-interval', type=float, default=30, help='Durée d\'un palier (secondes)')
+    parser.add_argument('--max-error-rate', type=float, default=0.05,
+                        help="Taux d'erreur au-delà duquel l'instance est considérée comme saturée")
+    parser.add_argument('--max-p99', type=float, default=5.0,
+                        help='Latence p99 (secondes) au-delà de laquelle l\'instance est considérée comme saturée')
+    parser.add_argument('--timeout', type=float, default=30, help='Délai maximal par requête')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='Fichier JSON où écrire le rapport')
+    args = parser.parse_args()
+
+    messages = load_trace(args.trace, seed=args.seed)
+    generator = LoadGenerator(args.url, messages, parse_mix(args.mix), concurrency=args.concurrency,
+                              timeout=args.timeout, seed=args.seed)
+    if args.ramp_step and not args.rate:
+        args.rate = args.ramp_step
+    generator.rate = args.rate
+
+    print(f"{len(messages)} messages, {args.concurrency} clients, débit cible "
+          f"{args.rate or 'maximal'} req/s sur {args.url}\n")
+    print(f"{'t(s)':>6} {'cible':>6} {'débit':>7} {'erreurs':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+          f"{'attente':>8} {'LTM':>8}")
+
+    windows = []
+    saturation = None
+    start = time.perf_counter()
+    last_report = start
+    last_ramp = start
+    generator.start()
+    try:
+        while time.perf_counter() - start < args.duration:
+            time.sleep(max(0.0, min(args.report_interval - (time.perf_counter() - last_report), 1.0)))
+            now = time.perf_counter()
+            if now - last_report < args.report_interval:
+                continue
+
+            window = summarize(generator.take_records(), now - last_report, generator.rate)
+            window['time'] = round(now - start, 1)
+            window['backlog'] = generator.backlog()
+            window.update(generator.brain_status())
+            windows.append(window)
+            last_report = now
+
+            print(f"{window['time']:>6.0f} {window['target_rate'] or 0:>6.1f} {window['throughput']:>7.1f} "
+                  f"{window['error_rate']:>8.1%} {_format_ms(window['p50'])} {_format_ms(window['p95'])} "
+                  f"{_format_ms(window['p99'])} {window['backlog']:>8} {str(window['ltm_size']):>8}")
+
+            # Saturation: trop d'erreurs ou latence de queue trop élevée
+            saturated = window['error_rate'] > args.max_error_rate or \
+                (window['p99'] is not None and window['p99'] > args.max_p99)
+            if saturated and saturation is None:
+                saturation = {'time': window['time'], 'rate': window['target_rate'],
+                              'throughput': window['throughput'], 'ltm_size': window['ltm_size']}
+                print(f"\nSaturation atteinte à {window['target_rate']} req/s "
+                      f"(LTM: {window['ltm_size']} souvenirs)\n")
+                if args.ramp_step:
+                    break
+
+            if args.ramp_step and now - last_ramp >= args.ramp_interval:
+                generator.rate += args.ramp_step
+                last_ramp = now
+    except KeyboardInterrupt:
+        print("\nInterrompu")
+    finally:
+        generator.stop()
+
+    sustained = [w['throughput'] for w in windows if w['error_rate'] <= args.max_error_rate
+                 and w['p99'] is not None and w['p99'] <= args.max_p99]
+    report = {
+        'meta': {'timestamp': datetime.now().isoformat(), 'url': args.url, 'trace': args.trace,
+                 'concurrency': args.concurrency, 'mix': args.mix, 'rate': args.rate,
+                 'ramp_step': args.ramp_step, 'ramp_interval': args.ramp_interval},
+        'windows': windows,
+        'max_sustained_throughput': max(sustained) if sustained else None,
+        'saturation': saturation
+    }
+    print(f"\nDébit maximal soutenu: {report['max_sustained_throughput'] or 0:.1f} req/s")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Rapport écrit dans {args.output}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,144 @@
+# Exécute la suite de benchmarks et compare les résultats à une référence
+#
+#   python benchmarks/run_benchmarks.py                      # tout, comparé à baseline.json
+#   python benchmarks/run_benchmarks.py --quick --only retrieve_memory
+#   python benchmarks/run_benchmarks.py --update-baseline    # enregistre une nouvelle référence
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+from datetime import datetime
+
+# Les composants du cerveau sont des modules à la racine du projet
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+import numpy as np
+import torch
+
+from benchmarks.suite import BENCHMARKS
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+def run_suite(config, only=None):
+    """Exécute les benchmarks sélectionnés et retourne le rapport complet"""
+    results = []
+    for name, (function, description) in BENCHMARKS.items():
+        if only and name not in only:
+            continue
+        print(f"- {name}: {description}")
+        start = time.perf_counter()
+        try:
+            for item in function(config):
+                results.append(item)
+                print(f"    {item['name']}: {item['value']:.6g} {item['unit']}")
+        except Exception as e:
+            print(f"    Erreur lors du benchmark {name}: {str(e)}")
+        print(f"    ({time.perf_counter() - start:.1f}s)")
+
+    return {
+        'meta': {
+            'timestamp': datetime.now().isoformat(),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'torch': torch.__version__,
+            'platform': platform.platform(),
+            'config': config
+        },
+        'results': {item['name']: item for item in results}
+    }
+
+def compare(report, baseline, threshold):
+    """
+    Compare chaque résultat à la référence
+    Retourne la liste des régressions (résultat plus mauvais de plus de `threshold`)
+    """
+    regressions = []
+    print(f"\n{'benchmark':<36} {'référence':>12} {'actuel':>12} {'écart':>9}")
+    for name, current in report['results'].items():
+        reference = baseline['results'].get(name)
+        if reference is None or not reference['value']:
+            print(f"{name:<36} {'-':>12} {current['value']:>12.6g} {'nouveau':>9}")
+            continue
+
+        # Écart positif = amélioration, quel que soit le sens de la mesure
+        if current['higher_is_better']:
+            change = current['value'] / reference['value'] - 1
+        else:
+            change = reference['value'] / current['value'] - 1 if current['value'] else 0.0
+
+        flag = ''
+        if change < -threshold:
+            flag = '  RÉGRESSION'
+            regressions.append((name, change))
+        print(f"{name:<36} {reference['value']:>12.6g} {current['value']:>12.6g} {change:>+8.1%}{flag}")
+
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmarks des chemins critiques de Baby AI Brain')
+    parser.add_argument('--sizes', default='1000,10000,100000',
+                        help='Tailles de mémoire pour retrieve_memory et consolidate_memories')
+    parser.add_argument('--quick', action='store_true',
+                        help='Tailles réduites (1000,10000) et moins de répétitions')
+    parser.add_argument('--repeat', type=int, default=5, help='Répétitions par mesure (médiane)')
+    parser.add_argument('--seed', type=int, default=0, help='Graine des charges synthétiques')
+    parser.add_argument('--only', nargs='*', choices=list(BENCHMARKS), help='Benchmarks à exécuter')
+    parser.add_argument('--output', help='Fichier JSON où écrire les résultats')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help='Fichier JSON de référence')
+    parser.add_argument('--update-baseline', action='store_true',
+                        help='Enregistre les résultats comme nouvelle référence')
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help='Dégradation relative tolérée avant de signaler une régression')
+    parser.add_argument('--check', action='store_true',
+                        help='Code de sortie 1 en cas de régression')
+    args = parser.parse_args()
+
+    config = {
+        'sizes': [1000, 10000] if args.quick else [int(s) for s in args.sizes.split(',')],
+        'repeat': 3 if args.quick else args.repeat,
+        'seed': args.seed,
+        'import_entries': 300 if args.quick else 1000,
+        'explore_pages': 10,
+        'save_size': 10000
+    }
+
+    report = run_suite(config, only=args.only)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nRésultats écrits dans {args.output}")
+
+    if args.update_baseline:
+        baseline = {'meta': report['meta'], 'results': {}}
+        if os.path.exists(args.baseline):
+            # Une exécution partielle (--only) ne remplace que ses propres résultats
+            with open(args.baseline) as f:
+                baseline = json.load(f)
+            baseline['meta'] = report['meta']
+        baseline['results'].update(report['results'])
+        with open(args.baseline, 'w') as f:
+            json.dump(baseline, f, indent=2)
+        print(f"\nRéférence mise à jour: {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"\nAucune référence trouvée ({args.baseline}); utilisez --update-baseline pour en créer une")
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    regressions = compare(report, baseline, args.threshold)
+
+    if regressions:
+        print(f"\n{len(regressions)} régression(s) au-delà de {args.threshold:.0%}")
+        return 1 if args.check else 0
+    print("\nAucune régression détectée")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,294 @@
+# Benchmarks des chemins critiques du cerveau artificiel
+import os
+import io
+import time
+import tempfile
+import statistics
+from contextlib import contextmanager, redirect_stdout
+
+import numpy as np
+
+from neural_network import NeuralCore
+from memory_system import MemorySystem
+from learning_system import LearningSystem
+from web_explorer import WebExplorer
+from dataset_importer import DatasetImporter
+
+from benchmarks.workloads import (seed_everything, make_texts, make_paragraphs,
+                                  build_memory_system, add_random_edges, StubWebServer)
+
+# Benchmarks enregistrés: nom -> (fonction, description)
+BENCHMARKS = {}
+
+def benchmark(name, description):
+    """Enregistre une fonction de benchmark; elle retourne une liste de résultats"""
+    def decorator(function):
+        BENCHMARKS[name] = (function, description)
+        return function
+    return decorator
+
+def result(name, value, unit, higher_is_better, **details):
+    """Résultat d'une mesure (débit: higher_is_better=True, durée: False)"""
+    return {
+        'name': name,
+        'value': value,
+        'unit': unit,
+        'higher_is_better': higher_is_better,
+        'details': details
+    }
+
+def measure(function, repeat=5, setup=None):
+    """Durée médiane (secondes) d'un appel, sur `repeat` répétitions"""
+    durations = []
+    for _ in range(repeat):
+        argument = setup() if setup is not None else None
+        start = time.perf_counter()
+        if setup is not None:
+            function(argument)
+        else:
+            function()
+        durations.append(time.perf_counter() - start)
+    return statistics.median(durations)
+
+@contextmanager
+def quiet():
+    """Masque les messages des composants pendant une mesure"""
+    with redirect_stdout(io.StringIO()):
+        yield
+
+@contextmanager
+def working_directory(path):
+    """Exécute le bloc dans un autre répertoire (les composants utilisent des chemins relatifs)"""
+    previous = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+@benchmark('retrieve_memory', "Requêtes retrieve_memory par seconde selon la taille de la mémoire")
+def bench_retrieve_memory(config):
+    results = []
+    queries = make_texts(200, seed=config['seed'] + 1)
+    for size in config['sizes']:
+        memory_system = build_memory_system(size, seed=config['seed'])
+        duration = measure(lambda: [memory_system.retrieve_memory(q, top_k=5) for q in queries],
+                           repeat=config['repeat'])
+        results.append(result(f'retrieve_memory[{size}]', len(queries) / duration, 'queries/s', True,
+                              memories=size))
+    return results
+
+@benchmark('retrieve_activation', "Requêtes retrieve_memory (mode activation) par seconde, réseau de degré 10")
+def bench_retrieve_activation(config):
+    results = []
+    queries = make_texts(200, seed=config['seed'] + 1)
+    for size in config['sizes']:
+        memory_system = build_memory_system(size, seed=config['seed'])
+        add_random_edges(memory_system, degree=10, seed=config['seed'])
+        # La matrice de transition est construite à la première requête puis conservée
+        start = time.perf_counter()
+        memory_system.retrieve_memory(queries[0], top_k=5, mode='activation')
+        build_time = time.perf_counter() - start
+        duration = measure(lambda: [memory_system.retrieve_memory(q, top_k=5, mode='activation')
+                                    for q in queries], repeat=config['repeat'])
+        results.append(result(f'retrieve_activation[{size}]', len(queries) / duration, 'queries/s', True,
+                              memories=size, build_time=build_time))
+    return results
+
+@benchmark('retrieve_activation_live', "Requêtes retrieve_memory (mode activation) par seconde, entrecoupées de consolidations")
+def bench_retrieve_activation_live(config):
+    results = []
+    queries = make_texts(200, seed=config['seed'] + 1)
+    texts = make_texts(20, seed=config['seed'] + 2)
+    for size in config['sizes']:
+        memory_system = build_memory_system(size, seed=config['seed'])
+        add_random_edges(memory_system, degree=10, seed=config['seed'])
+        memory_system.retrieve_memory(queries[0], top_k=5, mode='activation')
+        # Chaque consolidation ajoute des liens au réseau; seules les requêtes sont chronométrées
+        duration = 0.0
+        for round_index, text in enumerate(texts):
+            memory_system.add_memory(text, importance=0.9)
+            batch = queries[round_index::len(texts)]
+            start = time.perf_counter()
+            for query in batch:
+                memory_system.retrieve_memory(query, top_k=5, mode='activation')
+            duration += time.perf_counter() - start
+        results.append(result(f'retrieve_activation_live[{size}]', len(queries) / duration, 'queries/s', True,
+                              memories=size, consolidations=len(texts),
+                              builds=memory_system.spreading_activation.stats['builds']))
+    return results
+
+@benchmark('retrieve_hybrid', "Requêtes retrieve_memory par seconde en modes lexical (BM25) et hybride")
+def bench_retrieve_hybrid(config):
+    results = []
+    queries = make_texts(200, seed=config['seed'] + 1)
+    for size in config['sizes']:
+        memory_system = build_memory_system(size, seed=config['seed'])
+        for mode in ('lexical', 'hybrid'):
+            duration = measure(lambda: [memory_system.retrieve_memory(q, top_k=5, mode=mode) for q in queries],
+                               repeat=config['repeat'])
+            results.append(result(f'retrieve_{mode}[{size}]', len(queries) / duration, 'queries/s', True,
+                                  memories=size))
+    return results
+
+@benchmark('retrieve_cached', "Requêtes retrieve_memory par seconde avec cache, 200 requêtes dont 20 distinctes")
+def bench_retrieve_cached(config):
+    results = []
+    distinct = make_texts(20, seed=config['seed'] + 1)
+    queries = [distinct[i] for i in np.random.default_rng(config['seed']).integers(len(distinct), size=200)]
+    for size in config['sizes']:
+        memory_system = build_memory_system(size, seed=config['seed'], retrieval_cache_size=256)
+        duration = measure(lambda: [memory_system.retrieve_memory(q, top_k=5) for q in queries],
+                           repeat=config['repeat'])
+        report = memory_system.retrieval_cache_report()
+        results.append(result(f'retrieve_cached[{size}]', len(queries) / duration, 'queries/s', True,
+                              memories=size, hit_rate=report['hit_rate']))
+    return results
+
+@benchmark('retrieve_tiered', "Requêtes retrieve_memory par seconde (modes cosinus, lexical et hybride) avec 10 % des souvenirs en mémoire vive et le reste en SQLite")
+def bench_retrieve_tiered(config):
+    results = []
+    queries = make_texts(200, seed=config['seed'] + 1)
+    for size in config['sizes']:
+        memory_system = build_memory_system(size, seed=config['seed'])
+        with tempfile.TemporaryDirectory() as directory:
+            memory_system.enable_cold_storage(os.path.join(directory, 'cold_memories.db'))
+            memory_system.ltm_capacity = max(1, size // 10)
+            memory_system.enforce_ltm_capacity()
+            memory_system.cold_storage.flush()
+            # Les promotions des requêtes précédentes font partie du coût mesuré
+            for mode in ('cosine', 'lexical', 'hybrid'):
+                duration = measure(lambda: [memory_system.retrieve_memory(q, top_k=5, mode=mode) for q in queries],
+                                   repeat=config['repeat'])
+                name = 'retrieve_tiered' if mode == 'cosine' else f'retrieve_tiered_{mode}'
+                results.append(result(f'{name}[{size}]', len(queries) / duration, 'queries/s', True,
+                                      memories=size, cold=len(memory_system.cold_storage)))
+            memory_system.cold_storage.close()
+    return results
+
+@benchmark('consolidate_memories', "Durée de consolidate_memories (mémoire à court terme pleine)")
+def bench_consolidate_memories(config):
+    results = []
+    for size in config['sizes']:
+        memory_system = build_memory_system(size, seed=config['seed'])
+        batches = iter([make_texts(memory_system.stm_capacity, seed=config['seed'] + 100 + i)
+                        for i in range(config['repeat'])])
+
+        def fill_stm():
+            for text in next(batches):
+                memory_system.add_memory(text, metadata={'type': 'paragraph'}, importance=0.5,
+                                         deduplicate=False)
+
+        duration = measure(lambda _: memory_system.consolidate_memories(), repeat=config['repeat'],
+                           setup=fill_stm)
+        results.append(result(f'consolidate_memories[{size}]', duration, 's', False, memories=size))
+    return results
+
+@benchmark('encode_memory', "Textes encodés par seconde par _encode_memory")
+def bench_encode_memory(config):
+    texts = make_texts(5000, seed=config['seed'])
+    results = []
+
+    # Cache des mots vide à chaque répétition, puis cache déjà rempli
+    duration = measure(lambda memory_system: [memory_system._encode_memory(t) for t in texts],
+                       repeat=config['repeat'], setup=MemorySystem)
+    results.append(result('encode_memory[cold]', len(texts) / duration, 'texts/s', True))
+
+    memory_system = MemorySystem()
+    for text in texts:
+        memory_system._encode_memory(text)
+    duration = measure(lambda: [memory_system._encode_memory(t) for t in texts], repeat=config['repeat'])
+    results.append(result('encode_memory[warm]', len(texts) / duration, 'texts/s', True))
+    return results
+
+@benchmark('neural_learn', "Étapes NeuralCore.learn par seconde")
+def bench_neural_learn(config):
+    seed_everything(config['seed'])
+    neural_core = NeuralCore(input_size=100, hidden_size=128, output_size=100)
+    inputs = np.random.rand(200, 100)
+    duration = measure(lambda: [neural_core.learn(x, reward=0.1) for x in inputs], repeat=config['repeat'])
+    return [result('neural_learn', len(inputs) / duration, 'steps/s', True)]
+
+@benchmark('evolve_architecture', "Durée d'une évolution de l'architecture (ajout d'un neurone caché)")
+def bench_evolve_architecture(config):
+    seed_everything(config['seed'])
+    neural_core = NeuralCore(input_size=100, hidden_size=128, output_size=100)
+    neural_core.experience_counter = 1000  # Déclenche l'évolution à chaque appel
+
+    with quiet():
+        duration = measure(neural_core.evolve_architecture, repeat=config['repeat'])
+    return [result('evolve_architecture', duration, 's', False,
+                   hidden_size=neural_core.hidden_layer.out_features)]
+
+def _create_learning_system(seed):
+    seed_everything(seed)
+    neural_core = NeuralCore(input_size=100, hidden_size=128, output_size=100)
+    memory_system = MemorySystem(stm_capacity=50, encoding_size=100)
+    return LearningSystem(neural_core=neural_core, memory_system=memory_system)
+
+@benchmark('dataset_import', "Entrées importées par seconde par DatasetImporter (corpus généré)")
+def bench_dataset_import(config):
+    paragraphs = make_paragraphs(config['import_entries'], seed=config['seed'])
+    durations = []
+    imported = 0
+
+    for _ in range(config['repeat']):
+        with tempfile.TemporaryDirectory() as directory, working_directory(directory), quiet():
+            os.makedirs('data/datasets')
+            with open('data/datasets/bench_corpus.txt', 'w', encoding='utf-8') as f:
+                f.write('\n\n'.join(paragraphs))
+
+            learning_system = _create_learning_system(config['seed'])
+            importer = DatasetImporter(learning_system.memory_system, learning_system)
+            importer.available_datasets = {
+                'bench_corpus': {
+                    'file': 'data/datasets/bench_corpus.txt',
+                    'parser': importer._parse_text_dialogue,
+                    'description': 'Corpus synthétique',
+                    'size_mb': 0,
+                    'is_local': True
+                }
+            }
+
+            start = time.perf_counter()
+            imported = importer.import_dataset('bench_corpus', max_entries=len(paragraphs))
+            durations.append(time.perf_counter() - start)
+
+    duration = statistics.median(durations)
+    return [result('dataset_import', len(paragraphs) / duration, 'entries/s', True,
+                   entries=len(paragraphs), memories_added=imported)]
+
+@benchmark('explore_web', "Pages explorées par seconde contre un serveur local")
+def bench_explore_web(config):
+    pages = config['explore_pages']
+    durations = []
+
+    for _ in range(config['repeat']):
+        with StubWebServer(page_count=pages * 2, seed=config['seed']) as server:
+            learning_system = _create_learning_system(config['seed'])
+            explorer = WebExplorer(learning_system, start_urls=[f"{server.base_url}/page/0"])
+            explorer.min_delay_between_requests = 0
+
+            with quiet():
+                start = time.perf_counter()
+                explored = explorer.explore_web(max_pages=pages)
+                durations.append(time.perf_counter() - start)
+
+    duration = statistics.median(durations)
+    return [result('explore_web', explored / duration, 'pages/s', True, pages=explored)]
+
+@benchmark('save_load', "Durée de sauvegarde et de chargement du système de mémoire")
+def bench_save_load(config):
+    size = config['save_size']
+    memory_system = build_memory_system(size, seed=config['seed'])
+
+    with tempfile.TemporaryDirectory() as directory, quiet():
+        path = os.path.join(directory, 'memory_system.pkl')
+        save = measure(lambda: memory_system.save_memory_system(path), repeat=config['repeat'])
+        load = measure(lambda: MemorySystem().load_memory_system(path), repeat=config['repeat'])
+        file_size = os.path.getsize(path)
+
+    return [
+        result(f'save_memory_system[{size}]', save, 's', False, memories=size, bytes=file_size),
+        result(f'load_memory_system[{size}]', load, 's', False, memories=size, bytes=file_size)
+    ]
@@ -0,0 +1,134 @@
+# Charges de travail synthétiques et reproductibles pour les benchmarks
+# (textes générés à partir d'un vocabulaire fixe et d'une graine)
+import random
+import threading
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import torch
+
+from memory_system import MemorySystem
+
+# Vocabulaire fixe: les textes générés ne dépendent que de la graine
+WORDS = (
+    "le la les un une des du de et ou mais donc car ni que qui quoi dont où "
+    "cerveau mémoire apprendre connaissance science nature monde langage "
+    "histoire technologie humain vie comprendre communication réseau neurone "
+    "souvenir concept idée question réponse recherche exploration découverte "
+    "soleil lune étoile planète océan montagne forêt rivière ville maison "
+    "enfant parent ami école livre musique art couleur lumière temps espace "
+    "learn knowledge science art history technology nature human world life "
+    "rapide lent grand petit nouveau ancien simple complexe important curieux"
+).split()
+
+def seed_everything(seed):
+    random.seed(seed)
+    np.random.seed(seed)
+    torch.manual_seed(seed)
+
+def make_text(rng, min_words=8, max_words=25):
+    """Génère une phrase aléatoire à partir du vocabulaire"""
+    return ' '.join(rng.choice(WORDS) for _ in range(rng.randint(min_words, max_words))).capitalize() + '.'
+
+def make_texts(count, seed=0, min_words=8, max_words=25):
+    rng = random.Random(seed)
+    return [make_text(rng, min_words, max_words) for _ in range(count)]
+
+def make_paragraphs(count, seed=0):
+    """Paragraphes de plusieurs phrases (corpus d'import, pages web)"""
+    rng = random.Random(seed)
+    return [' '.join(make_text(rng) for _ in range(rng.randint(3, 6))) for _ in range(count)]
+
+def build_memory_system(size, seed=0, stm_capacity=50, encoding_size=100, retrieval_cache_size=0):
+    """
+    Construit un système de mémoire contenant `size` souvenirs à long terme.
+    Les souvenirs sont insérés directement dans le réseau et l'index (sans
+    les liens de consolidation, dont la création est quadratique) pour que
+    la construction reste rapide à 100k souvenirs.
+    Le cache des recherches est désactivé par défaut: les benchmarks répètent
+    les mêmes requêtes et mesureraient sinon le cache au lieu de la recherche.
+    """
+    memory_system = MemorySystem(stm_capacity=stm_capacity, encoding_size=encoding_size)
+    memory_system.retrieval_cache_size = retrieval_cache_size
+    types = ('interaction', 'web_content', 'paragraph', 'sentence', 'concept')
+    created_at = datetime(2024, 1, 1).isoformat()
+
+    for memory_id, text in enumerate(make_texts(size, seed)):
+        memory = {
+            'id': memory_id,
+            'content': text,
+            'encoding': memory_system._encode_memory(text),
+            'metadata': {'type': types[memory_id % len(types)]},
+            'importance': 0.5,
+            'created_at': created_at,
+            'access_count': 0,
+            'last_accessed': None
+        }
+        memory_system._set_memory_fields(memory)
+        memory_system.ltm_network.add_node(memory_id, **memory)
+        memory_system.memory_index.add(memory_system.ltm_network.nodes[memory_id])
+        memory_system.lexical_index.add(memory_id, memory_system._memory_tokens(memory))
+
+    memory_system.memory_counter = size
+    return memory_system
+
+def add_random_edges(memory_system, degree=10, seed=0):
+    """
+    Ajoute au réseau à long terme `degree` liens symétriques par souvenir
+    vers des souvenirs tirés au hasard (poids uniformes dans [0.3, 1])
+    """
+    rng = np.random.default_rng(seed)
+    size = len(memory_system.ltm_network)
+    sources = np.repeat(np.arange(size), degree)
+    targets = rng.integers(0, size, sources.size)
+    weights = rng.uniform(0.3, 1.0, sources.size)
+    edges = [(int(u), int(v), {'weight': float(w)}) for u, v, w in zip(sources, targets, weights) if u != v]
+    memory_system.ltm_network.add_edges_from(edges)
+    memory_system.ltm_network.add_edges_from((v, u, data) for u, v, data in edges)
+    memory_system.graph_version += 1
+    memory_system.edge_version += 1
+
+def make_html_page(index, page_count, rng):
+    """Page HTML synthétique: quelques paragraphes et des liens vers d'autres pages"""
+    paragraphs = ''.join(f"<p>{' '.join(make_text(rng, 15, 40) for _ in range(3))}</p>" for _ in range(8))
+    links = ''.join(f'<a href="/page/{rng.randrange(page_count)}">lien</a>' for _ in range(10))
+    return f"<html><head><title>Page {index}</title></head><body>{paragraphs}{links}</body></html>"
+
+class StubWebServer:
+    """Serveur HTTP local servant des pages synthétiques à l'explorateur web"""
+
+    def __init__(self, page_count=50, seed=0):
+        rng = random.Random(seed)
+        pages = {f"/page/{i}": make_html_page(i, page_count, rng).encode('utf-8') for i in range(page_count)}
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                body = pages.get(self.path)
+                if body is None:
+                    self.send_response(404)
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
@@ -0,0 +1,580 @@
+import os
+import json
+import sqlite3
+import threading
+from collections import Counter
+
+import numpy as np
+
+class ColdStorage:
+    """
+    Niveau froid de la mémoire à long terme, dans une base SQLite locale.
+    - Les souvenirs froids (contenu en JSON, encodage en BLOB) et leurs liens
+      sont sur le disque; seul un index compact reste en mémoire vive:
+      encodages quantifiés sur 8 bits (une échelle par souvenir), soit environ
+      8 fois moins qu'un encodage en float64
+    - Une recherche parcourt l'index quantifié par blocs, puis relit les
+      meilleurs candidats dans la base pour les reclasser avec leur encodage exact
+    - Les mots des souvenirs froids sont rangés dans la base, une ligne par mot
+      et par démotion (ids, fréquences et générations en BLOB); seuls la
+      génération et le nombre de mots de chaque souvenir restent en mémoire
+      vive. Comme dans LexicalIndex, une promotion ne fait que marquer le
+      souvenir comme absent: les entrées périmées sont ignorées à la lecture,
+      puis purgées par le thread d'écriture quand elles deviennent nombreuses
+    - Les écritures (démotions) et suppressions (promotions) sont faites par un
+      thread dédié: l'index en mémoire est mis à jour immédiatement et les
+      souvenirs en attente d'écriture restent lisibles depuis `pending`
+    """
+
+    # Version du schéma de la base (1: mots des souvenirs dans la table postings)
+    SCHEMA_VERSION = 1
+
+    def __init__(self, path, encoding_size, initial_capacity=1024, chunk_size=65536, rerank_factor=4,
+                 tokens_of=None, max_posting_rows=32):
+        """
+        - chunk_size: lignes de l'index quantifié converties à la fois pendant une recherche
+        - rerank_factor: candidats relus dans la base par résultat demandé
+        - tokens_of: fonction retournant les mots indexés d'un souvenir (None: pas
+          de recherche lexicale dans le niveau froid)
+        - max_posting_rows: démotions écrites au-delà desquelles les listes de mots
+          sont regroupées (une ligne par mot)
+        """
+        self.path = path
+        self.encoding_size = encoding_size
+        self.chunk_size = chunk_size
+        self.rerank_factor = rerank_factor
+        self.tokens_of = tokens_of
+        self.max_posting_rows = max_posting_rows
+
+        # Index quantifié
+        self.codes = np.zeros((initial_capacity, encoding_size), dtype=np.int8)
+        self.scales = np.zeros(initial_capacity, dtype=np.float32)
+        self.ids = np.zeros(initial_capacity, dtype=np.int64)
+        self.valid = np.zeros(initial_capacity, dtype=bool)
+        self.size = 0
+        self.removed = 0
+        self.row_of = {}  # id du souvenir -> ligne de l'index
+
+        # Statistiques lexicales (indexées par id du souvenir)
+        self.generations = np.zeros(initial_capacity, dtype=np.int32)  # Génération courante (0: pas froid)
+        self.lengths = np.zeros(initial_capacity, dtype=np.float32)  # Nombre de mots
+        self.total_length = 0
+        self.generation = 0  # Dernière génération attribuée (une par démotion)
+        self.posting_rows = 0  # Démotions écrites depuis le dernier regroupement des listes
+        self.stale_length = 0  # Mots des souvenirs promus encore présents dans les listes
+
+        # Écritures en arrière-plan
+        self.pending = {}  # id -> (souvenir, liens, code, échelle, {mot: fréquence}, génération) en attente d'écriture
+        self.operations = []  # Opérations ('put', ids) ou ('delete', ids) dans l'ordre
+        self.busy = False
+        self.condition = threading.Condition()
+        self.worker = None
+        self.stats = {'demoted': 0, 'promoted': 0, 'searches': 0, 'rows_read': 0}
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.connection = self._connect()
+        self.db_lock = threading.Lock()  # Connexion des lectures (thread appelant)
+        self._create_tables()
+        self._load_index()
+
+    def _connect(self):
+        connection = sqlite3.connect(self.path, check_same_thread=False)
+        connection.execute('PRAGMA journal_mode=WAL')
+        connection.execute('PRAGMA synchronous=NORMAL')
+        return connection
+
+    def _create_tables(self):
+        with self.connection:
+            self.connection.execute(
+                'CREATE TABLE IF NOT EXISTS memories ('
+                'id INTEGER PRIMARY KEY, record TEXT NOT NULL, encoding BLOB NOT NULL, '
+                'code BLOB NOT NULL, scale REAL NOT NULL)')
+            self.connection.execute(
+                'CREATE TABLE IF NOT EXISTS edges ('
+                'source INTEGER NOT NULL, target INTEGER NOT NULL, weight REAL NOT NULL, '
+                'PRIMARY KEY (source, target)) WITHOUT ROWID')
+            self.connection.execute('CREATE INDEX IF NOT EXISTS edges_target ON edges (target)')
+            self.connection.execute(
+                'CREATE TABLE IF NOT EXISTS postings ('
+                'term TEXT NOT NULL, generation INTEGER NOT NULL, '
+                'ids BLOB NOT NULL, frequencies BLOB NOT NULL, generations BLOB NOT NULL, '
+                'PRIMARY KEY (term, generation)) WITHOUT ROWID')
+
+    def _load_index(self):
+        """Reconstruit l'index quantifié et les statistiques lexicales à partir de la base (sans relire les encodages)"""
+        cursor = self.connection.execute('SELECT id, code, scale FROM memories')
+        while True:
+            rows = cursor.fetchmany(self.chunk_size)
+            if not rows:
+                break
+            ids = np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows))
+            codes = np.frombuffer(b''.join(row[1] for row in rows), dtype=np.int8).reshape(len(rows), -1)
+            scales = np.fromiter((row[2] for row in rows), dtype=np.float32, count=len(rows))
+            self._index_add(ids, codes, scales)
+
+        if self.tokens_of is None:
+            return
+        if self.connection.execute('PRAGMA user_version').fetchone()[0] < self.SCHEMA_VERSION:
+            self._index_stored_terms()
+
+        # Génération courante d'un souvenir: la plus récente de ses entrées (les
+        # entrées d'une démotion antérieure sont périmées)
+        ids_parts, frequency_parts, generation_parts = [], [], []
+        for ids, frequencies, generations in self.connection.execute(
+                'SELECT ids, frequencies, generations FROM postings'):
+            ids_parts.append(np.frombuffer(ids, dtype=np.int64))
+            frequency_parts.append(np.frombuffer(frequencies, dtype=np.int32))
+            generation_parts.append(np.frombuffer(generations, dtype=np.int32))
+        if not ids_parts:
+            return
+        ids = np.concatenate(ids_parts)
+        frequencies = np.concatenate(frequency_parts)
+        generations = np.concatenate(generation_parts)
+        self._ensure_id_capacity(max(int(ids.max()), max(self.row_of, default=0)))
+        np.maximum.at(self.generations, ids, generations)
+        cold = np.zeros(len(self.generations), dtype=bool)
+        cold[list(self.row_of)] = True
+        self.generations[~cold] = 0
+        live = self.generations[ids] == generations
+        np.add.at(self.lengths, ids[live], frequencies[live])
+        self.total_length = int(self.lengths.sum())
+        self.stale_length = int(frequencies[~live].sum())
+        # Les lignes regroupées ont leur propre génération (clé de la ligne)
+        self.generation = self.connection.execute('SELECT MAX(generation) FROM postings').fetchone()[0]
+
+    def _index_stored_terms(self):
+        """Range les mots des souvenirs d'une base antérieure à la table postings"""
+        with self.connection:
+            cursor = self.connection.execute('SELECT id, record FROM memories')
+            while True:
+                rows = cursor.fetchmany(self.chunk_size)
+                if not rows:
+                    break
+                self.generation += 1
+                self._write_postings(self.connection, [
+                    (memory_id, Counter(self.tokens_of(json.loads(record))), self.generation)
+                    for memory_id, record in rows])
+            self.connection.execute(f'PRAGMA user_version = {self.SCHEMA_VERSION}')
+
+    def _ensure_id_capacity(self, memory_id):
+        """Agrandit les tableaux indexés par id pour contenir `memory_id`"""
+        if memory_id < len(self.generations):
+            return
+        capacity = max(memory_id + 1, 2 * len(self.generations))
+        generations = np.zeros(capacity, dtype=np.int32)
+        generations[:len(self.generations)] = self.generations
+        lengths = np.zeros(capacity, dtype=np.float32)
+        lengths[:len(self.lengths)] = self.lengths
+        self.generations, self.lengths = generations, lengths
+
+    def __len__(self):
+        return len(self.row_of)
+
+    def __contains__(self, memory_id):
+        return memory_id in self.row_of
+
+    @staticmethod
+    def quantize(encodings):
+        """Quantification symétrique sur 8 bits, une échelle par ligne"""
+        encodings = np.asarray(encodings, dtype=np.float32)
+        scales = np.abs(encodings).max(axis=1) / 127.0
+        scales[scales == 0] = 1.0
+        codes = np.round(encodings / scales[:, None]).astype(np.int8)
+        return codes, scales
+
+    def _index_add(self, ids, codes, scales):
+        count = len(ids)
+        while self.size + count > len(self.ids):
+            self._grow()
+        rows = slice(self.size, self.size + count)
+        self.codes[rows] = codes
+        self.scales[rows] = scales
+        self.ids[rows] = ids
+        self.valid[rows] = True
+        for row, memory_id in enumerate(ids.tolist(), start=self.size):
+            self.row_of[memory_id] = row
+        self.size += count
+
+    def _grow(self):
+        """Double la capacité de l'index"""
+        capacity = max(1, 2 * len(self.ids))
+        codes = np.zeros((capacity, self.encoding_size), dtype=np.int8)
+        codes[:self.size] = self.codes[:self.size]
+        scales = np.zeros(capacity, dtype=np.float32)
+        scales[:self.size] = self.scales[:self.size]
+        ids = np.zeros(capacity, dtype=np.int64)
+        ids[:self.size] = self.ids[:self.size]
+        valid = np.zeros(capacity, dtype=bool)
+        valid[:self.size] = self.valid[:self.size]
+        self.codes, self.scales, self.ids, self.valid = codes, scales, ids, valid
+
+    def _index_remove(self, memory_ids):
+        for memory_id in memory_ids:
+            row = self.row_of.pop(memory_id, None)
+            if row is not None:
+                self.valid[row] = False
+                self.removed += 1
+        if self.removed > 1024 and self.removed > self.size // 2:
+            self._compact()
+
+    def _compact(self):
+        """Reconstruit l'index sans les lignes supprimées"""
+        keep = np.nonzero(self.valid[:self.size])[0]
+        count = len(keep)
+        self.codes[:count] = self.codes[keep]
+        self.scales[:count] = self.scales[keep]
+        self.ids[:count] = self.ids[keep]
+        self.valid[:count] = True
+        self.valid[count:] = False
+        self.size = count
+        self.removed = 0
+        self.row_of = dict(zip(self.ids[:count].tolist(), range(count)))
+
+    def demote(self, memories, edges):
+        """
+        Range des souvenirs dans le niveau froid
+        - memories: souvenirs (avec leur encodage) quittant la mémoire vive
+        - edges: liens (source, cible, poids) touchant ces souvenirs
+        L'index est mis à jour immédiatement, l'écriture se fait en arrière-plan
+        """
+        if not memories:
+            return
+        ids = np.array([memory['id'] for memory in memories], dtype=np.int64)
+        codes, scales = self.quantize([memory['encoding'] for memory in memories])
+        counts = [Counter(self.tokens_of(memory)) if self.tokens_of is not None else Counter()
+                  for memory in memories]
+
+        edges_of = {memory['id']: [] for memory in memories}
+        for source, target, weight in edges:
+            for memory_id in (source, target):
+                if memory_id in edges_of:
+                    edges_of[memory_id].append((source, target, weight))
+
+        with self.condition:
+            # Un souvenir déjà froid (nouvelle démotion) est remplacé
+            self._forget_terms(ids.tolist())
+            self._index_remove(ids.tolist())
+            self._index_add(ids, codes, scales)
+            self.generation += 1
+            self._ensure_id_capacity(int(ids.max()))
+            for memory, code, scale, count in zip(memories, codes, scales, counts):
+                self.pending[memory['id']] = (memory, edges_of[memory['id']], code, float(scale), count, self.generation)
+                length = sum(count.values())
+                self.generations[memory['id']] = self.generation if length else 0
+                self.lengths[memory['id']] = length
+                self.total_length += length
+            self.operations.append(('put', ids.tolist()))
+            self.stats['demoted'] += len(memories)
+            self._ensure_worker()
+            self.condition.notify_all()
+
+    def promote(self, memory_ids):
+        """
+        Retire des souvenirs du niveau froid pour les remettre en mémoire vive
+        Retourne (souvenirs, liens): les liens vers des souvenirs restés froids
+        sont conservés dans la base pour leur propre promotion
+        """
+        memory_ids = [memory_id for memory_id in memory_ids if memory_id in self.row_of]
+        if not memory_ids:
+            return [], []
+        memories = self.fetch(memory_ids)
+        edges = self.fetch_edges(memory_ids)
+        self.remove(memory_ids)
+        self.stats['promoted'] += len(memory_ids)
+        return [memories[memory_id] for memory_id in memory_ids if memory_id in memories], edges
+
+    def remove(self, memory_ids):
+        """Retire des souvenirs du niveau froid (la suppression dans la base se fait en arrière-plan)"""
+        with self.condition:
+            self._forget_terms(memory_ids)
+            self._index_remove(memory_ids)
+            for memory_id in memory_ids:
+                self.pending.pop(memory_id, None)
+            self.operations.append(('delete', list(memory_ids)))
+            self._ensure_worker()
+            self.condition.notify_all()
+
+    def _forget_terms(self, memory_ids):
+        """Marque les mots de souvenirs quittant le niveau froid comme périmés (verrou tenu)"""
+        for memory_id in memory_ids:
+            if memory_id in self.row_of and memory_id < len(self.lengths):
+                length = int(self.lengths[memory_id])
+                self.total_length -= length
+                if memory_id not in self.pending:
+                    self.stale_length += length
+                self.lengths[memory_id] = 0
+                self.generations[memory_id] = 0
+
+    def lexical_statistics(self):
+        """Statistiques BM25 du niveau froid: (nombre de souvenirs, nombre total de mots)"""
+        with self.condition:
+            return len(self.row_of), self.total_length
+
+    def lexical_postings(self, terms):
+        """
+        Souvenirs froids contenant chacun des mots: {mot: (ids, fréquences, longueurs)}
+        Les souvenirs en attente d'écriture sont lus depuis `pending`
+        """
+        terms = set(terms)
+        if self.tokens_of is None or not terms:
+            return {}
+        pending_parts = {}
+        with self.condition:
+            for memory_id, entry in self.pending.items():
+                for term in terms.intersection(entry[4]):
+                    pending_parts.setdefault(term, []).append((memory_id, entry[4][term]))
+            # Souvenirs en attente (lus depuis `pending`, même s'ils sont déjà écrits)
+            in_pending = None
+            if self.pending:
+                in_pending = np.zeros(len(self.generations), dtype=bool)
+                in_pending[list(self.pending)] = True
+
+        parts = {}
+        placeholders = ','.join('?' * len(terms))
+        with self.db_lock:
+            rows = self.connection.execute(
+                f'SELECT term, ids, frequencies, generations FROM postings WHERE term IN ({placeholders})',
+                list(terms)).fetchall()
+        for term, ids, frequencies, generations in rows:
+            parts.setdefault(term, []).append((np.frombuffer(ids, dtype=np.int64),
+                                               np.frombuffer(frequencies, dtype=np.int32),
+                                               np.frombuffer(generations, dtype=np.int32)))
+
+        postings = {}
+        with self.condition:
+            for term in terms:
+                ids_parts, frequency_parts = [], []
+                for ids, frequencies, generations in parts.get(term, ()):
+                    # Entrées périmées (promotion, nouvelle démotion) et souvenirs en attente ignorés
+                    live = self.generations[ids] == generations
+                    if in_pending is not None:
+                        live &= ~in_pending[ids]
+                    ids_parts.append(ids[live])
+                    frequency_parts.append(frequencies[live])
+                if term in pending_parts:
+                    ids, frequencies = zip(*pending_parts[term])
+                    ids_parts.append(np.array(ids, dtype=np.int64))
+                    frequency_parts.append(np.array(frequencies, dtype=np.int32))
+                if ids_parts:
+                    ids = np.concatenate(ids_parts)
+                    if len(ids):
+                        postings[term] = (ids, np.concatenate(frequency_parts).astype(np.float32),
+                                          self.lengths[ids])
+        return postings
+
+    def fetch(self, memory_ids):
+        """Souvenirs complets (avec encodage) à partir de leurs ids: {id: souvenir}"""
+        found = {}
+        missing = []
+        with self.condition:
+            for memory_id in memory_ids:
+                entry = self.pending.get(memory_id)
+                if entry is not None:
+                    found[memory_id] = dict(entry[0])
+                else:
+                    missing.append(memory_id)
+
+        for start in range(0, len(missing), 500):
+            batch = missing[start:start + 500]
+            with self.db_lock:
+                rows = self.connection.execute(
+                    f"SELECT id, record, encoding FROM memories WHERE id IN ({','.join('?' * len(batch))})",
+                    batch).fetchall()
+            self.stats['rows_read'] += len(rows)
+            for memory_id, record, encoding in rows:
+                memory = json.loads(record)
+                memory['encoding'] = np.frombuffer(encoding, dtype=np.float64).copy()
+                found[memory_id] = memory
+        return found
+
+    def fetch_edges(self, memory_ids):
+        """Liens (source, cible, poids) touchant des souvenirs froids"""
+        edges = {}
+        missing = []
+        with self.condition:
+            for memory_id in memory_ids:
+                entry = self.pending.get(memory_id)
+                if entry is not None:
+                    edges.update(((source, target), weight) for source, target, weight in entry[1])
+                else:
+                    missing.append(memory_id)
+
+        for start in range(0, len(missing), 500):
+            batch = missing[start:start + 500]
+            placeholders = ','.join('?' * len(batch))
+            with self.db_lock:
+                rows = self.connection.execute(
+                    f'SELECT source, target, weight FROM edges WHERE source IN ({placeholders}) '
+                    f'UNION SELECT source, target, weight FROM edges WHERE target IN ({placeholders})',
+                    batch + batch).fetchall()
+            edges.update(((source, target), weight) for source, target, weight in rows)
+        return [(source, target, weight) for (source, target), weight in edges.items()]
+
+    def search(self, query_encoding, top_k=3, accept=None):
+        """
+        Retourne les top_k couples (souvenir, similarité) les plus proches
+        - accept: filtre optionnel appliqué aux souvenirs relus (ex: type)
+        La similarité retournée est exacte (reclassement avec l'encodage stocké)
+        """
+        if not self.row_of or top_k <= 0:
+            return []
+        self.stats['searches'] += 1
+        query = np.asarray(query_encoding, dtype=np.float32)
+        candidate_count = top_k * self.rerank_factor * (4 if accept is not None else 1)
+
+        with self.condition:
+            size = self.size
+            approximate = np.empty(size, dtype=np.float32)
+            for start in range(0, size, self.chunk_size):
+                stop = min(start + self.chunk_size, size)
+                approximate[start:stop] = (self.codes[start:stop].astype(np.float32) @ query) * self.scales[start:stop]
+            approximate[~self.valid[:size]] = -np.inf
+            k = min(candidate_count, len(self.row_of))
+            rows = np.argpartition(-approximate, k - 1)[:k] if k < size else np.arange(size)
+            rows = rows[np.isfinite(approximate[rows])]
+            candidate_ids = self.ids[rows].tolist()
+
+        memories = self.fetch(candidate_ids)
+        results = []
+        for memory_id in candidate_ids:
+            memory = memories.get(memory_id)
+            if memory is None or (accept is not None and not accept(memory)):
+                continue
+            results.append((memory, float(np.dot(memory['encoding'], query_encoding))))
+        results.sort(key=lambda item: item[1], reverse=True)
+        return results[:top_k]
+
+    def _ensure_worker(self):
+        """Démarre le thread d'écriture s'il n'est pas déjà actif"""
+        if self.worker is None or not self.worker.is_alive():
+            self.worker = threading.Thread(target=self._run, name='cold-storage', daemon=True)
+            self.worker.start()
+
+    def _run(self):
+        """Boucle du thread d'écriture: applique les opérations en attente par transaction"""
+        connection = self._connect()
+        while True:
+            with self.condition:
+                while not self.operations:
+                    self.condition.wait()
+                operations, self.operations = self.operations, []
+                self.busy = True
+                # Copie des souvenirs à écrire (pending peut changer pendant l'écriture)
+                writes = {}
+                for kind, memory_ids in operations:
+                    if kind == 'put':
+                        for memory_id in memory_ids:
+                            if memory_id in self.pending:
+                                writes[memory_id] = self.pending[memory_id]
+
+            try:
+                with connection:
+                    for kind, memory_ids in operations:
+                        if kind == 'put':
+                            self._write(connection, [(memory_id, writes[memory_id])
+                                                     for memory_id in memory_ids if memory_id in writes])
+                        else:
+                            self._delete(connection, memory_ids)
+                    self._compact_postings(connection, sum(kind == 'put' for kind, _ in operations))
+                written = writes
+            except Exception as e:
+                print(f"Erreur lors de l'écriture de la mémoire froide: {str(e)}")
+                written = {}
+
+            with self.condition:
+                for memory_id, entry in written.items():
+                    # Le souvenir a pu être promu ou démis à nouveau entre-temps
+                    if self.pending.get(memory_id) is entry:
+                        del self.pending[memory_id]
+                self.busy = False
+                self.condition.notify_all()
+
+    @classmethod
+    def _write(cls, connection, entries):
+        records = []
+        edges = []
+        terms = []
+        for memory_id, (memory, memory_edges, code, scale, counts, generation) in entries:
+            record = {key: value for key, value in memory.items() if key != 'encoding'}
+            encoding = np.asarray(memory['encoding'], dtype=np.float64).tobytes()
+            records.append((memory_id, json.dumps(record, ensure_ascii=False, default=str),
+                            encoding, code.tobytes(), scale))
+            edges.extend((int(source), int(target), float(weight)) for source, target, weight in memory_edges)
+            terms.append((memory_id, counts, generation))
+        connection.executemany('INSERT OR REPLACE INTO memories VALUES (?, ?, ?, ?, ?)', records)
+        connection.executemany('INSERT OR REPLACE INTO edges VALUES (?, ?, ?)', edges)
+        cls._write_postings(connection, terms)
+
+    @staticmethod
+    def _write_postings(connection, entries):
+        """Écrit les mots de souvenirs (id, {mot: fréquence}, génération): une ligne par mot et par génération"""
+        lists = {}
+        for memory_id, counts, generation in entries:
+            for term, frequency in counts.items():
+                posting = lists.setdefault((term, generation), ([], []))
+                posting[0].append(memory_id)
+                posting[1].append(frequency)
+        connection.executemany('INSERT OR REPLACE INTO postings VALUES (?, ?, ?, ?, ?)', [
+            (term, generation, np.array(ids, dtype=np.int64).tobytes(),
+             np.array(frequencies, dtype=np.int32).tobytes(),
+             np.full(len(ids), generation, dtype=np.int32).tobytes())
+            for (term, generation), (ids, frequencies) in lists.items()])
+
+    def _compact_postings(self, connection, written):
+        """
+        Regroupe les listes de mots (une ligne par mot, sans les entrées périmées)
+        quand les démotions écrites ou les entrées périmées deviennent nombreuses
+        """
+        with self.condition:
+            self.posting_rows += written
+            if self.posting_rows <= self.max_posting_rows and self.stale_length <= self.total_length:
+                return
+            self.generation += 1
+            generation = self.generation
+            current = self.generations.copy()
+            stale_length = self.stale_length
+
+        lists = {}
+        for term, ids, frequencies, generations in connection.execute(
+                'SELECT term, ids, frequencies, generations FROM postings'):
+            ids = np.frombuffer(ids, dtype=np.int64)
+            generations = np.frombuffer(generations, dtype=np.int32)
+            live = current[ids] == generations
+            if live.any():
+                lists.setdefault(term, []).append((ids[live], np.frombuffer(frequencies, dtype=np.int32)[live],
+                                                   generations[live]))
+        connection.execute('DELETE FROM postings')
+        connection.executemany('INSERT INTO postings VALUES (?, ?, ?, ?, ?)', [
+            (term, generation, *(np.concatenate(column).tobytes() for column in zip(*parts)))
+            for term, parts in lists.items()])
+
+        with self.condition:
+            self.posting_rows = 0
+            self.stale_length -= stale_length
+
+    def _delete(self, connection, memory_ids):
+        """Supprime des souvenirs promus et leurs liens vers des souvenirs qui ne sont plus froids"""
+        for start in range(0, len(memory_ids), 500):
+            batch = memory_ids[start:start + 500]
+            placeholders = ','.join('?' * len(batch))
+            connection.execute(f'DELETE FROM memories WHERE id IN ({placeholders})', batch)
+            rows = connection.execute(
+                f'SELECT source, target FROM edges WHERE source IN ({placeholders}) '
+                f'UNION SELECT source, target FROM edges WHERE target IN ({placeholders})',
+                batch + batch).fetchall()
+            with self.condition:
+                stale = [(source, target) for source, target in rows
+                         if source not in self.row_of and target not in self.row_of]
+            connection.executemany('DELETE FROM edges WHERE source = ? AND target = ?', stale)
+
+    def flush(self, timeout=None):
+        """Attend que toutes les opérations en attente soient écrites"""
+        with self.condition:
+            return self.condition.wait_for(lambda: not self.operations and not self.busy, timeout)
+
+    def close(self):
+        self.flush()
+        with self.db_lock:
+            self.connection.close()
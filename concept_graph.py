@@ -0,0 +1,148 @@
+import os
+import numpy as np
+
+class ConceptGraph:
+    """
+    Associations entre concepts.
+    Chaque concept reçoit un id entier et ses associations sont rangées dans
+    une liste d'adjacence creuse (id -> {id voisin: force}): les voisins d'un
+    concept s'obtiennent en O(degré) au lieu de parcourir tous les concepts.
+    Les associations sont symétriques. La sauvegarde est binaire (.npz: noms
+    des concepts et liste des paires (source, cible, force)).
+    """
+
+    def __init__(self):
+        self.names = []  # id -> nom du concept
+        self.ids = {}  # nom du concept -> id
+        self.adjacency = []  # id -> {id voisin: force}
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, name):
+        return name in self.ids
+
+    def concept_id(self, name):
+        """Id d'un concept (attribué à sa première apparition)"""
+        concept_id = self.ids.get(name)
+        if concept_id is None:
+            concept_id = len(self.names)
+            self.ids[name] = concept_id
+            self.names.append(name)
+            self.adjacency.append({})
+        return concept_id
+
+    def associate(self, name1, name2, strength):
+        """Crée ou met à jour l'association (symétrique) entre deux concepts"""
+        id1, id2 = self.concept_id(name1), self.concept_id(name2)
+        self.adjacency[id1][id2] = strength
+        self.adjacency[id2][id1] = strength
+
+    def strength(self, name1, name2):
+        """Force de l'association entre deux concepts (None s'ils ne sont pas associés)"""
+        if name1 not in self.ids or name2 not in self.ids:
+            return None
+        return self.adjacency[self.ids[name1]].get(self.ids[name2])
+
+    def edge_count(self):
+        """Nombre d'associations (chaque paire comptée une fois)"""
+        return sum(1 for source, neighbours in enumerate(self.adjacency)
+                   for target in neighbours if source <= target)
+
+    def neighbours(self, name, threshold=0.0):
+        """Concepts directement associés: liste de (nom, force) par force décroissante"""
+        if name not in self.ids:
+            return []
+        related = [(self.names[other], strength)
+                   for other, strength in self.adjacency[self.ids[name]].items() if strength >= threshold]
+        related.sort(key=lambda item: item[1], reverse=True)
+        return related
+
+    def related(self, name, threshold=0.3, max_hops=1):
+        """
+        Concepts atteignables en au plus `max_hops` associations d'au moins `threshold`
+        La force d'un concept est le produit des forces sur le meilleur chemin
+        Retourne une liste de {'name', 'strength', 'hops'} par force décroissante
+        """
+        if name not in self.ids:
+            return []
+        start = self.ids[name]
+
+        # Parcours en largeur, un niveau par association: frontier garde la
+        # meilleure force de chemin de chaque concept atteint au niveau courant
+        best = {}
+        hops = {}
+        frontier = {start: 1.0}
+        for depth in range(1, max_hops + 1):
+            next_frontier = {}
+            for concept_id, path_strength in frontier.items():
+                for other, strength in self.adjacency[concept_id].items():
+                    if strength < threshold or other == start:
+                        continue
+                    if path_strength * strength > next_frontier.get(other, 0.0):
+                        next_frontier[other] = path_strength * strength
+            for other, path_strength in next_frontier.items():
+                if path_strength > best.get(other, 0.0):
+                    best[other] = path_strength
+                    hops[other] = depth
+            frontier = next_frontier
+
+        related = [{'name': self.names[concept_id], 'strength': strength, 'hops': hops[concept_id]}
+                   for concept_id, strength in best.items()]
+        related.sort(key=lambda item: item['strength'], reverse=True)
+        return related
+
+    def clear(self):
+        self.names = []
+        self.ids = {}
+        self.adjacency = []
+
+    def save(self, path):
+        """Sauvegarde binaire (chaque paire n'est écrite qu'une fois)"""
+        pairs = [(source, target, strength)
+                 for source, neighbours in enumerate(self.adjacency)
+                 for target, strength in neighbours.items() if source <= target]
+        sources, targets, strengths = zip(*pairs) if pairs else ((), (), ())
+
+        temp_path = path + '.tmp'
+        with open(temp_path, 'wb') as f:
+            np.savez(f,
+                     names=np.array(self.names, dtype=str),
+                     sources=np.array(sources, dtype=np.int32),
+                     targets=np.array(targets, dtype=np.int32),
+                     strengths=np.array(strengths, dtype=np.float64))
+        os.replace(temp_path, path)
+
+    def load(self, path):
+        """Charge une sauvegarde binaire"""
+        with np.load(path) as data:
+            names = data['names'].tolist()
+            sources, targets, strengths = data['sources'], data['targets'], data['strengths']
+
+            self.clear()
+            for name in names:
+                self.concept_id(name)
+            for source, target, strength in zip(sources.tolist(), targets.tolist(), strengths.tolist()):
+                self.adjacency[source][target] = strength
+                self.adjacency[target][source] = strength
+
+    def load_legacy(self, association_strengths, concept_names):
+        """
+        Convertit l'ancien format {"concept1_concept2": force}
+        Les noms pouvant contenir '_', chaque clé est découpée à la position
+        où les deux parties sont des concepts connus
+        """
+        self.clear()
+        for name in concept_names:
+            self.concept_id(name)
+
+        unresolved = 0
+        for key, strength in association_strengths.items():
+            for position in (i for i, char in enumerate(key) if char == '_'):
+                name1, name2 = key[:position], key[position + 1:]
+                if name1 in self.ids and name2 in self.ids:
+                    self.associate(name1, name2, strength)
+                    break
+            else:
+                unresolved += 1
+        return unresolved
@@ -5,8 +5,96 @@ import urllib.request
 import zipfile
 import csv
 import time
+import hashlib
+import glob
+import re
+from datetime import datetime
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
 from tqdm import tqdm  # Pour les barres de progression
 
+import dataset_readers
+from memory_system import MemorySystem
+from learning_system import LearningSystem
+from tokenizer import tokenize
+
+# Nombre de paragraphes envoyés à la fois à un processus d'import
+IMPORT_CHUNK_SIZE = 64
+
+# Système de mémoire propre à chaque processus d'import (encodage uniquement)
+_worker_memory_system = None
+
+
+def _init_import_worker(encoding_size):
+    """Initialise un processus d'import"""
+    global _worker_memory_system
+    _worker_memory_system = MemorySystem(encoding_size=encoding_size)
+
+
+def split_paragraph(paragraph):
+    """
+    Nettoie un paragraphe importé et le découpe en phrases
+    Retourne (paragraphe, phrases), ou (None, []) s'il est trop court
+    """
+    paragraph = paragraph.replace('\n', ' ').replace('  ', ' ').strip()
+    if len(paragraph) <= 50:  # Ignorer les paragraphes trop courts
+        return None, []
+    
+    # Séparer également en phrases pour un apprentissage plus granulaire
+    sentences = [s.strip() for s in paragraph.split('.') if len(s.strip()) > 20]
+    return paragraph, sentences[:3]  # Limiter à 3 phrases par paragraphe
+
+
+def _prepare_record(content, metadata, importance):
+    """
+    Encode un souvenir dans un processus d'import (texte découpé une seule fois)
+    Le vecteur d'entrée du réseau est calculé par lot dans _prepare_import_chunk
+    """
+    tokens = tokenize(content).tokens
+    return {
+        'content': content,
+        'metadata': metadata,
+        'importance': importance,
+        'encoding': _worker_memory_system._encode_memory(content, tokens),
+        'signature': _worker_memory_system.dedup_index.compute_signature(content, tokens),
+        'tokens': tokens,
+        'vector': None
+    }
+
+
+def _prepare_import_chunk(paragraphs, basename):
+    """
+    Découpe et encode un lot de paragraphes dans un processus d'import
+    Retourne une liste de (souvenir du paragraphe, souvenirs des phrases)
+    """
+    groups = []
+    for raw_paragraph in paragraphs:
+        paragraph, sentences = split_paragraph(raw_paragraph)
+        if paragraph is None:
+            continue
+        paragraph_record = _prepare_record(paragraph, {
+            'source': 'dataset_import',
+            'type': 'paragraph',
+            'filename': basename
+        }, 0.6)
+        sentence_records = [_prepare_record(sentence, {
+            'source': 'dataset_import',
+            'type': 'sentence',
+            'context': paragraph[:100]
+        }, 0.5) for sentence in sentences]
+        groups.append((paragraph_record, sentence_records))
+    
+    # Vecteurs d'entrée du réseau de tout le lot en un seul appel
+    records = [record for paragraph_record, sentence_records in groups
+               for record in [paragraph_record] + sentence_records]
+    if records:
+        vectors = LearningSystem.encode_texts([record['content'] for record in records])
+        for record, vector in zip(records, vectors):
+            record['vector'] = vector
+    return groups
+
+
 class DatasetImporter:
     """
     Module pour importer des jeux de données de conversations et pré-alimenter 
@@ -22,6 +110,19 @@ class DatasetImporter:
         # Crée le répertoire des datasets s'il n'existe pas
         os.makedirs(self.data_dir, exist_ok=True)
         
+        # Statistiques de déduplication du dernier import de chaque dataset
+        self.last_dedup_report = {}
+        
+        # Nombre maximal de lots en attente lors d'un import parallèle
+        self.max_in_flight = 2
+        
+        # Manifestes de reprise des imports (un fichier par dataset)
+        self.manifest_dir = "data/import_manifests"
+        self.checkpoint_interval = 1000  # Entrées lues entre deux points de reprise
+        # Appelée avant d'enregistrer un point de reprise, pour sauvegarder
+        # l'état du cerveau (sinon la reprise sauterait des entrées perdues)
+        self.checkpoint_callback = None
+        
         # Liste des sources de données locales disponibles
         self.available_datasets = {
             "phrases_francaises": {
@@ -54,40 +155,107 @@ class DatasetImporter:
             }
         }
         
+        # Datasets supplémentaires déclarés dans le fichier de configuration
+        self.config_file = os.path.join(self.data_dir, "datasets.json")
+        self._load_dataset_config()
+        
+    def _load_dataset_config(self):
+        """
+        Ajoute les datasets déclarés dans le fichier de configuration, par exemple:
+        {
+            "corpus_wiki": {
+                "path": "data/corpus/wiki-*.jsonl.gz",
+                "format": "jsonl",
+                "options": {"text_field": "text"},
+                "description": "Articles Wikipédia"
+            }
+        }
+        - path: fichier, répertoire, motif glob ou archive (.gz, .bz2, .zip)
+        - format: nom d'un format du registre (déduit de l'extension si absent)
+        - options: paramètres du lecteur (text_field, text_column, ...)
+        """
+        if not os.path.exists(self.config_file):
+            return
+        
+        try:
+            with open(self.config_file, 'r', encoding='utf-8') as f:
+                config = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"Erreur lors de la lecture de {self.config_file}: {str(e)}")
+            return
+        
+        for name, entry in config.items():
+            if not isinstance(entry, dict) or 'path' not in entry:
+                print(f"Dataset '{name}' ignoré: chemin manquant")
+                continue
+            format_name = entry.get('format')
+            if format_name is not None and format_name not in dataset_readers.FORMATS:
+                print(f"Dataset '{name}' ignoré: format inconnu '{format_name}'")
+                continue
+            self.available_datasets[name] = {
+                "path": entry['path'],
+                "format": format_name,
+                "options": entry.get('options', {}),
+                "parser": self._parse_text_dialogue,
+                "description": entry.get('description', name),
+                "is_local": True
+            }
+    
     def list_available_datasets(self):
         """Affiche les jeux de données disponibles"""
         print("\nJeux de données disponibles:")
         print("----------------------------")
         for key, dataset in self.available_datasets.items():
-            print(f"- {key}: {dataset['description']} ({dataset['size_mb']} MB)")
+            size_mb = dataset.get('size_mb')
+            if size_mb is None:
+                size = sum(os.path.getsize(f) for f in self.get_dataset_files(key, quiet=True))
+                size_mb = round(size / (1024 * 1024), 1)
+            print(f"- {key}: {dataset['description']} ({size_mb} MB)")
         print("----------------------------")
         
-    def get_dataset_file(self, dataset_name):
-        """Récupère le chemin vers le fichier de données local"""
+    def get_dataset_files(self, dataset_name, quiet=False):
+        """
+        Récupère la liste des fichiers locaux d'un dataset
+        (un fichier, le contenu d'un répertoire ou les fichiers d'un motif glob)
+        """
         if dataset_name not in self.available_datasets:
-            print(f"Erreur: Le jeu de données '{dataset_name}' n'est pas disponible")
-            return None
+            if not quiet:
+                print(f"Erreur: Le jeu de données '{dataset_name}' n'est pas disponible")
+            return []
             
         dataset = self.available_datasets[dataset_name]
         
         # Vérifie si c'est un dataset local
-        if dataset.get("is_local", False):
-            file_path = dataset["file"]
-            # Vérifie si le fichier existe
-            if os.path.exists(file_path):
-                return file_path
-            else:
-                print(f"Erreur: Le fichier local {file_path} n'existe pas")
-                return None
-        else:
+        if not dataset.get("is_local", False):
             # Ancienne logique de téléchargement (non utilisée pour l'instant)
-            print(f"Les datasets distants ne sont plus supportés")
-            return None
+            if not quiet:
+                print(f"Les datasets distants ne sont plus supportés")
+            return []
+        
+        path = dataset.get("file") or dataset["path"]
+        if os.path.isdir(path):
+            files = []
+            for root, _, names in os.walk(path):
+                files.extend(os.path.join(root, n) for n in names if dataset_readers.is_supported_path(n))
+        elif glob.has_magic(path):
+            files = [f for f in glob.glob(path, recursive=True) if os.path.isfile(f)]
+        else:
+            files = [path] if os.path.exists(path) else []
+        
+        if not files and not quiet:
+            print(f"Erreur: Aucun fichier local trouvé pour {path}")
+        return sorted(files)
+    
+    def get_dataset_file(self, dataset_name):
+        """Récupère le chemin vers le (premier) fichier de données local"""
+        files = self.get_dataset_files(dataset_name)
+        return files[0] if files else None
     
-    def import_dataset(self, dataset_name, max_entries=500):
+    def import_dataset(self, dataset_name, max_entries=500, executor=None):
         """
         Importe un jeu de données spécifique et pré-alimente le système de mémoire
         - max_entries: nombre maximum d'entrées à importer pour éviter de surcharger
+        - executor: pool de processus pour découper et encoder en parallèle
         """
         if dataset_name not in self.available_datasets:
             print(f"Erreur: Le jeu de données '{dataset_name}' n'est pas disponible")
@@ -95,9 +263,9 @@ class DatasetImporter:
             
         dataset = self.available_datasets[dataset_name]
         
-        # Récupérer le chemin du fichier
-        filename = self.get_dataset_file(dataset_name)
-        if not filename:
+        # Récupérer les chemins des fichiers
+        files = self.get_dataset_files(dataset_name)
+        if not files:
             print(f"Impossible d'accéder au fichier pour {dataset_name}")
             return 0
         
@@ -105,29 +273,243 @@ class DatasetImporter:
         print(f"Importation des données de {dataset_name}...")
         
         try:
-            entries_imported = dataset["parser"](filename, max_entries)
+            dedup_start = dict(self.memory_system.dedup_stats)
+            if dataset["parser"] == self._parse_text_dialogue:
+                entries_imported = self._import_streamed_files(dataset_name, dataset, files, max_entries, executor)
+            else:
+                entries_imported = dataset["parser"](files[0], max_entries)
             print(f"Importation terminée: {entries_imported} éléments ajoutés à la mémoire")
+            
+            # Rapport de déduplication pour ce dataset
+            dedup = self.memory_system.dedup_report(dedup_start)
+            self.last_dedup_report[dataset_name] = dedup
+            print(f"Doublons fusionnés: {dedup['duplicates']}/{dedup['checked']} ({dedup['ratio']:.1%})")
             return entries_imported
         except Exception as e:
             print(f"Erreur lors de l'importation: {str(e)}")
             return 0
     
-    def import_multiple_datasets(self, max_entries_per_dataset=200):
-        """Importe plusieurs jeux de données avec un nombre limité d'entrées par dataset"""
+    def _import_streamed_files(self, dataset_name, dataset, files, max_entries, executor=None):
+        """
+        Importe en flux les fichiers d'un dataset, avec reprise au dernier point
+        enregistré; max_entries s'applique à l'ensemble des fichiers
+        """
+        format_name = dataset.get("format")
+        options = dataset.get("options")
+        
+        # Un manifeste par fichier (nommé comme le dataset s'il n'a qu'un fichier)
+        manifests = []
+        for filename in files:
+            key = dataset_name
+            if len(files) > 1:
+                key = dataset_name + '.' + re.sub(r'[^\w.-]+', '_', os.path.relpath(filename))
+            manifests.append(self._load_manifest(dataset_name, filename, key))
+        
+        remaining = max_entries - sum(m['entry_index'] for m in manifests)
+        if remaining <= 0 or all(m['completed'] for m in manifests):
+            read = sum(m['entry_index'] for m in manifests)
+            print(f"{dataset_name} déjà importé ({read} entrées lues), ignoré")
+            return 0
+        
+        imported_count = 0
+        for filename, manifest in zip(files, manifests):
+            if remaining <= 0:
+                break
+            if manifest['completed']:
+                continue
+            
+            start = manifest['entry_index']
+            if start:
+                print(f"Reprise de {os.path.basename(filename)} à l'entrée {start}")
+            
+            file_max_entries = start + remaining
+            if executor is not None:
+                imported_count += self._parse_text_dialogue_parallel(
+                    filename, file_max_entries, executor, manifest, format_name, options)
+            else:
+                imported_count += self._parse_text_dialogue(
+                    filename, file_max_entries, manifest, format_name, options)
+            remaining -= manifest['entry_index'] - start
+        
+        return imported_count
+    
+    def _manifest_path(self, key):
+        return os.path.join(self.manifest_dir, f"{key}.json")
+    
+    def _file_hash(self, filename):
+        """Empreinte SHA-256 du fichier, lue par blocs"""
+        digest = hashlib.sha256()
+        with open(filename, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+        return digest.hexdigest()
+    
+    def _load_manifest(self, dataset_name, filename, key=None):
+        """
+        Charge le manifeste d'import d'un dataset
+        Un fichier modifié depuis le dernier import repart de zéro
+        """
+        stat = os.stat(filename)
+        key = key or dataset_name
+        manifest = None
+        path = self._manifest_path(key)
+        if os.path.exists(path):
+            try:
+                with open(path, 'r') as f:
+                    manifest = json.load(f)
+            except (OSError, json.JSONDecodeError) as e:
+                print(f"Manifeste illisible pour {dataset_name}, import depuis le début: {str(e)}")
+        
+        # L'empreinte n'est recalculée que si la taille ou la date ont changé
+        if manifest and manifest.get('file_size') == stat.st_size and manifest.get('file_mtime') == stat.st_mtime:
+            file_hash = manifest['file_hash']
+        else:
+            file_hash = self._file_hash(filename)
+        
+        if not manifest or manifest.get('file_hash') != file_hash:
+            manifest = {
+                'dataset': dataset_name,
+                'key': key,
+                'file': filename,
+                'entry_index': 0,
+                'entries_imported': 0,
+                'completed': False
+            }
+        
+        manifest.update({
+            'key': key,
+            'file_hash': file_hash,
+            'file_size': stat.st_size,
+            'file_mtime': stat.st_mtime
+        })
+        return manifest
+    
+    def _save_manifest(self, manifest):
+        """Écrit le manifeste de manière atomique"""
+        os.makedirs(self.manifest_dir, exist_ok=True)
+        path = self._manifest_path(manifest['key'])
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_path, path)
+    
+    def _checkpoint(self, manifest, entry_index, imported_count, completed=False):
+        """Enregistre un point de reprise après avoir sauvegardé l'état du cerveau"""
+        if self.checkpoint_callback is not None:
+            self.checkpoint_callback()
+        manifest['entry_index'] = entry_index
+        manifest['entries_imported'] = manifest.get('imported_before_run', 0) + imported_count
+        manifest['completed'] = completed
+        manifest['updated_at'] = datetime.now().isoformat()
+        self._save_manifest({k: v for k, v in manifest.items() if k != 'imported_before_run'})
+    
+    def import_multiple_datasets(self, max_entries_per_dataset=200, workers=1):
+        """
+        Importe plusieurs jeux de données avec un nombre limité d'entrées par dataset
+        - workers: nombre de processus qui découpent et encodent les textes en parallèle
+        """
+        if workers > 1:
+            # Nombre de lots en cours borné pour garder une mémoire constante
+            self.max_in_flight = 2 * workers
+            with ProcessPoolExecutor(max_workers=workers,
+                                     initializer=_init_import_worker,
+                                     initargs=(self.memory_system.encoding_size,)) as executor:
+                return self._import_all(max_entries_per_dataset, executor)
+        return self._import_all(max_entries_per_dataset)
+    
+    def _import_all(self, max_entries_per_dataset, executor=None):
+        """Importe successivement tous les jeux de données disponibles"""
         total_imported = 0
         for dataset_name in self.available_datasets.keys():
             try:
                 print(f"\nImportation de {dataset_name}...")
-                imported = self.import_dataset(dataset_name, max_entries_per_dataset)
+                imported = self.import_dataset(dataset_name, max_entries_per_dataset, executor)
                 total_imported += imported
-                
-                # Petite pause entre les datasets pour éviter de surcharger le système
-                time.sleep(1)
             except Exception as e:
                 print(f"Erreur lors de l'importation de {dataset_name}: {str(e)}")
         
         return total_imported
     
+    def _add_memory_if_new(self, content, metadata, importance):
+        """
+        Ajoute un souvenir et indique s'il est nouveau
+        (False si un quasi-doublon existant a seulement été renforcé)
+        """
+        (_, is_new), = self.memory_system.add_memories([{
+            'content': content,
+            'metadata': metadata,
+            'importance': importance
+        }])
+        return is_new
+    
+    def _insert_prepared_groups(self, groups):
+        """
+        Insère en bloc les souvenirs préparés par les processus d'import,
+        puis entraîne le réseau sur les nouveaux textes en un seul lot
+        """
+        paragraph_results = self.memory_system.add_memories([p for p, _ in groups])
+        
+        # Les phrases d'un paragraphe déjà connu sont ignorées
+        new_records = []
+        sentence_records = []
+        for (paragraph_record, sentences), (_, is_new) in zip(groups, paragraph_results):
+            if is_new:
+                new_records.append(paragraph_record)
+                sentence_records.extend(sentences)
+        
+        sentence_results = self.memory_system.add_memories(sentence_records)
+        new_records.extend(r for r, (_, is_new) in zip(sentence_records, sentence_results) if is_new)
+        
+        # Apprentissage par lot
+        if new_records:
+            self.learning_system.learn_from_exploration_batch(
+                [r['content'] for r in new_records],
+                input_vectors=[r['vector'] for r in new_records])
+        
+        return len(new_records)
+    
+    def _parse_text_dialogue_parallel(self, filename, max_entries, executor, manifest=None,
+                                      format_name=None, options=None):
+        """
+        Variante parallèle de _parse_text_dialogue: le fichier est lu en flux,
+        les lots de paragraphes sont découpés et encodés par les processus
+        d'import, et le processus principal insère et entraîne par lots
+        """
+        imported_count = 0
+        basename = os.path.basename(filename)
+        start = self._begin_run(manifest)
+        paragraphs = islice(dataset_readers.iter_texts(filename, format_name, options), start, max_entries)
+        
+        pending = deque()  # Couples (lot en cours, nombre d'entrées du lot)
+        entry_index = start
+        last_checkpoint = start
+        
+        try:
+            while True:
+                while len(pending) < self.max_in_flight:
+                    chunk = list(islice(paragraphs, IMPORT_CHUNK_SIZE))
+                    if not chunk:
+                        break
+                    pending.append((executor.submit(_prepare_import_chunk, chunk, basename), len(chunk)))
+                
+                if not pending:
+                    break
+                future, chunk_length = pending.popleft()
+                imported_count += self._insert_prepared_groups(future.result())
+                
+                # Les lots sont insérés dans l'ordre: le point de reprise est exact
+                entry_index += chunk_length
+                if manifest is not None and entry_index - last_checkpoint >= self.checkpoint_interval:
+                    self._checkpoint(manifest, entry_index, imported_count)
+                    last_checkpoint = entry_index
+            
+            if manifest is not None:
+                self._checkpoint(manifest, entry_index, imported_count, completed=entry_index < max_entries)
+        except Exception as e:
+            print(f"Erreur lors du parsing du fichier texte: {str(e)}")
+        
+        return imported_count
+    
     def _parse_daily_dialog(self, filename, max_entries):
         """Parse le jeu de données Daily Dialog"""
         # Localisation des fichiers après décompression
@@ -140,7 +522,11 @@ class DatasetImporter:
         imported_count = 0
         
         with open(train_file, 'r', encoding='utf-8') as f:
-            dialogs = json.load(f)
+            # Parcours incrémental: seuls les dialogues utilisés sont décodés
+            kind, dialogs = dataset_readers.open_json_document(f)
+            if kind != 'array':
+                print(f"Format inattendu pour {train_file}")
+                return 0
             
             # Traduction simple en français (normalement on utiliserait un service de traduction)
             translations = {
@@ -160,7 +546,7 @@ class DatasetImporter:
             }
             
             # Limite au nombre d'entrées spécifié
-            for dialog in dialogs[:max_entries]:
+            for dialog in islice(dialogs, max_entries):
                 try:
                     context = ""
                     
@@ -196,181 +582,121 @@ class DatasetImporter:
         
         return imported_count
     
-    def _parse_text_dialogue(self, filename, max_entries):
-        """Parse les dialogues à partir d'un fichier texte"""
+    def _begin_run(self, manifest):
+        """Prépare le manifeste pour une nouvelle exécution et retourne l'entrée de départ"""
+        if manifest is None:
+            return 0
+        manifest['imported_before_run'] = manifest.get('entries_imported', 0)
+        return manifest['entry_index']
+    
+    def _import_paragraph(self, raw_paragraph, basename):
+        """Mémorise un paragraphe et ses phrases, et retourne le nombre de souvenirs créés"""
+        # Nettoyer le texte (les paragraphes trop courts sont ignorés)
+        paragraph, sentences = split_paragraph(raw_paragraph)
+        if paragraph is None:
+            return 0
+        
+        # Ajouter à la mémoire (un doublon renforce seulement le souvenir existant)
+        is_new = self._add_memory_if_new(
+            content=paragraph,
+            metadata={
+                'source': 'dataset_import',
+                'type': 'paragraph',
+                'filename': basename
+            },
+            importance=0.6  # Importance moyenne-haute
+        )
+        if not is_new:
+            return 0
+        imported_count = 1
+        
+        # Apprentissage direct
+        self.learning_system.learn_from_exploration(paragraph)
+        
+        for sentence in sentences:
+            is_new = self._add_memory_if_new(
+                content=sentence,
+                metadata={
+                    'source': 'dataset_import',
+                    'type': 'sentence',
+                    'context': paragraph[:100]  # Limiter le contexte
+                },
+                importance=0.5  # Importance moyenne
+            )
+            if not is_new:
+                continue
+            imported_count += 1
+            
+            # Apprentissage direct
+            self.learning_system.learn_from_exploration(sentence)
+        
+        return imported_count
+    
+    def _parse_text_dialogue(self, filename, max_entries, manifest=None, format_name=None, options=None):
+        """
+        Parse les dialogues à partir d'un fichier texte
+        - manifest: manifeste d'import pour reprendre au dernier point enregistré
+        - format_name: format du registre de lecteurs (déduit de l'extension si absent)
+        - options: paramètres du lecteur (colonne ou champ de texte, ...)
+        """
         # Cette fonction est adaptative et fonctionne avec divers formats textes
         imported_count = 0
+        basename = os.path.basename(filename)
+        start = self._begin_run(manifest)
+        entry_index = start
         
         try:
-            with open(filename, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
-                
-                # Détecter le format selon l'extension
-                if filename.endswith('.json'):
-                    # Essayer de parser comme JSON
-                    try:
-                        data = json.loads(content)
-                        # Extraire le texte selon la structure
-                        if isinstance(data, list):
-                            # Si c'est une liste, parcourir les éléments
-                            text_items = []
-                            for item in data[:max_entries*2]:  # Double pour avoir plus de choix
-                                if isinstance(item, dict):
-                                    # Extraire des valeurs de dictionnaire
-                                    for k, v in item.items():
-                                        if isinstance(v, str) and len(v) > 30:
-                                            text_items.append(v)
-                                elif isinstance(item, str) and len(item) > 30:
-                                    text_items.append(item)
-                            # Limiter au nombre demandé
-                            paragraphs = text_items[:max_entries]
-                        elif isinstance(data, dict):
-                            # Si c'est un dict, extraire les valeurs string
-                            paragraphs = []
-                            for k, v in data.items():
-                                if isinstance(v, str) and len(v) > 40:
-                                    paragraphs.append(v)
-                                elif isinstance(v, dict):
-                                    # Récursion simple sur un niveau
-                                    for k2, v2 in v.items():
-                                        if isinstance(v2, str) and len(v2) > 40:
-                                            paragraphs.append(v2)
-                            # Limiter au nombre demandé
-                            paragraphs = paragraphs[:max_entries]
-                        else:
-                            paragraphs = [str(data)][:max_entries]
-                    except json.JSONDecodeError:
-                        # Si échec de JSON, traiter comme texte normal
-                        paragraphs = [p.strip() for p in content.split('\n\n') if p.strip()][:max_entries]
-                
-                elif filename.endswith('.csv'):
-                    # Traiter comme CSV
-                    try:
-                        # Utiliser un StringIO pour éviter de réécrire sur disque
-                        import io
-                        import csv
-                        reader = csv.reader(io.StringIO(content))
-                        paragraphs = []
-                        for row in reader:
-                            if row and any(len(cell) > 30 for cell in row):
-                                # Concaténer les cellules de la ligne
-                                paragraphs.append(" ".join(cell for cell in row if len(cell) > 2))
-                            if len(paragraphs) >= max_entries:
-                                break
-                    except Exception as csv_err:
-                        print(f"Erreur lors du parsing CSV: {str(csv_err)}")
-                        # Fallback en texte
-                        paragraphs = [p.strip() for p in content.split('\n') if len(p.strip()) > 50][:max_entries]
+            # Traitement et mémorisation des paragraphes, au fil de la lecture
+            stream = islice(dataset_readers.iter_texts(filename, format_name, options), start, max_entries)
+            for entry_index, raw_paragraph in enumerate(stream, start + 1):
+                imported_count += self._import_paragraph(raw_paragraph, basename)
                 
-                elif filename.endswith('.md'):
-                    # Traiter comme Markdown
-                    lines = content.split('\n')
-                    paragraphs = []
-                    current_paragraph = []
-                    
-                    for line in lines:
-                        line = line.strip()
-                        # Ignore les lignes de titre et les séparateurs
-                        if line.startswith('#') or line.startswith('---') or line.startswith('```'):
-                            if current_paragraph:
-                                paragraphs.append(' '.join(current_paragraph))
-                                current_paragraph = []
-                        elif line:  # Ligne non vide
-                            current_paragraph.append(line)
-                        elif current_paragraph:  # Ligne vide après un paragraphe
-                            paragraphs.append(' '.join(current_paragraph))
-                            current_paragraph = []
-                    
-                    # Ajouter le dernier paragraphe si nécessaire
-                    if current_paragraph:
-                        paragraphs.append(' '.join(current_paragraph))
-                    
-                    # Filtrer les paragraphes trop courts
-                    paragraphs = [p for p in paragraphs if len(p) > 50][:max_entries]
-                else:
-                    # Format texte générique
-                    paragraphs = [p.strip() for p in content.split('\n\n') if p.strip() and len(p.strip()) > 50][:max_entries]
-                
-                # Traitement et mémorisation des paragraphes
-                for paragraph in paragraphs:
-                    # Nettoyer le texte
-                    paragraph = paragraph.replace('\n', ' ').replace('  ', ' ').strip()
-                    
-                    if len(paragraph) > 50:  # Ignorer les paragraphes trop courts
-                        # Ajouter à la mémoire
-                        self.memory_system.add_memory(
-                            content=paragraph,
-                            metadata={
-                                'source': 'dataset_import',
-                                'type': 'paragraph',
-                                'filename': os.path.basename(filename)
-                            },
-                            importance=0.6  # Importance moyenne-haute
-                        )
-                        imported_count += 1
-                        
-                        # Apprentissage direct
-                        self.learning_system.learn_from_exploration(paragraph)
-                        
-                        # Séparer également en phrases pour un apprentissage plus granulaire
-                        sentences = [s.strip() for s in paragraph.split('.') if len(s.strip()) > 20]
-                        for sentence in sentences[:3]:  # Limiter à 3 phrases par paragraphe
-                            self.memory_system.add_memory(
-                                content=sentence,
-                                metadata={
-                                    'source': 'dataset_import',
-                                    'type': 'sentence',
-                                    'context': paragraph[:100]  # Limiter le contexte
-                                },
-                                importance=0.5  # Importance moyenne
-                            )
-                            imported_count += 1
-                            
-                            # Apprentissage direct
-                            self.learning_system.learn_from_exploration(sentence)
+                if manifest is not None and (entry_index - start) % self.checkpoint_interval == 0:
+                    self._checkpoint(manifest, entry_index, imported_count)
+            
+            if manifest is not None:
+                self._checkpoint(manifest, entry_index, imported_count, completed=entry_index < max_entries)
         except Exception as e:
             print(f"Erreur lors du parsing du fichier texte: {str(e)}")
             
         return imported_count
     
-    def _parse_open_subtitles(self, filename, max_entries):
+    def _parse_open_subtitles(self, filename, max_entries, sample_window=5000):
         """Parse le jeu de données OpenSubtitles"""
         # Ce dataset est volumineux, nous allons donc échantillonner
         imported_count = 0
         
         try:
             with open(filename, 'r', encoding='utf-8', errors='ignore') as f:
-                lines = []
-                
-                # Lire les 5000 premières lignes pour échantillonner
-                for _ in range(5000):
-                    try:
-                        line = f.readline()
-                        if not line:
-                            break
-                        if len(line.strip()) > 10:
-                            lines.append(line.strip())
-                    except:
+                # Échantillonnage aléatoire par réservoir sur les premières lignes:
+                # seules max_entries lignes sont gardées en mémoire
+                samples = []
+                seen = 0
+                for line in islice(f, sample_window):
+                    line = line.strip()
+                    if len(line) <= 10:
                         continue
+                    seen += 1
+                    if len(samples) < max_entries:
+                        samples.append(line)
+                    else:
+                        j = random.randrange(seen)
+                        if j < max_entries:
+                            samples[j] = line
                 
-                # Échantillonner aléatoirement
-                if lines:
-                    sample_size = min(max_entries, len(lines))
-                    samples = random.sample(lines, sample_size)
+                for line in samples:
+                    self.memory_system.add_memory(
+                        content=line,
+                        metadata={
+                            'source': 'open_subtitles',
+                            'type': 'subtitle'
+                        },
+                        importance=0.5  # Importance moyenne
+                    )
+                    imported_count += 1
                     
-                    for line in samples:
-                        self.memory_system.add_memory(
-                            content=line,
-                            metadata={
-                                'source': 'open_subtitles',
-                                'type': 'subtitle'
-                            },
-                            importance=0.5  # Importance moyenne
-                        )
-                        imported_count += 1
-                        
-                        # Apprentissage direct
-                        self.learning_system.learn_from_exploration(line)
+                    # Apprentissage direct
+                    self.learning_system.learn_from_exploration(line)
         except Exception as e:
             print(f"Erreur lors du parsing d'OpenSubtitles: {str(e)}")
             
@@ -0,0 +1,402 @@
+"""
+Lecteurs de datasets en flux.
+
+Chaque lecteur prend un fichier ouvert et produit les textes un par un
+(générateur), sans jamais charger le fichier entier en mémoire: la
+consommation reste constante quelle que soit la taille du corpus.
+
+Les lecteurs sont enregistrés dans un registre de formats (`register_format`)
+associant un nom de format à ses extensions; `iter_texts` ouvre un chemin
+(y compris dans une archive .gz, .bz2 ou .zip, sans décompression sur
+disque) et le lit avec le lecteur approprié.
+"""
+import bz2
+import csv
+import gzip
+import io
+import json
+import os
+import zipfile
+
+# Dépendance optionnelle pour les formats colonnes (Parquet, Arrow)
+try:
+    import pyarrow
+    import pyarrow.ipc
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+# Taille des blocs lus pour le parsing JSON incrémental
+JSON_CHUNK_SIZE = 1 << 16
+
+# Au-delà de cette taille, un paragraphe sans ligne vide est découpé de force
+MAX_PARAGRAPH_CHARS = 100000
+
+_json_decoder = json.JSONDecoder()
+_VALUE_DELIMITERS = frozenset(' \t\r\n,:]}')
+
+
+def iter_text_paragraphs(f, min_length=50):
+    """Paragraphes séparés par des lignes vides"""
+    current = []
+    current_length = 0
+    for line in f:
+        if line.strip():
+            current.append(line.rstrip('\n'))
+            current_length += len(line)
+            if current_length < MAX_PARAGRAPH_CHARS:
+                continue
+        if current:
+            paragraph = '\n'.join(current).strip()
+            current = []
+            current_length = 0
+            if len(paragraph) > min_length:
+                yield paragraph
+    if current:
+        paragraph = '\n'.join(current).strip()
+        if len(paragraph) > min_length:
+            yield paragraph
+
+
+def iter_markdown_paragraphs(f, min_length=50):
+    """Paragraphes Markdown, en ignorant les titres, séparateurs et blocs de code"""
+    current = []
+    current_length = 0
+    for line in f:
+        line = line.strip()
+        # Ignore les lignes de titre et les séparateurs
+        if line.startswith('#') or line.startswith('---') or line.startswith('```'):
+            flush = True
+        elif line:  # Ligne non vide
+            current.append(line)
+            current_length += len(line)
+            flush = current_length >= MAX_PARAGRAPH_CHARS
+        else:  # Ligne vide après un paragraphe
+            flush = True
+
+        if flush and current:
+            paragraph = ' '.join(current)
+            current = []
+            current_length = 0
+            if len(paragraph) > min_length:
+                yield paragraph
+
+    # Dernier paragraphe si nécessaire
+    if current:
+        paragraph = ' '.join(current)
+        if len(paragraph) > min_length:
+            yield paragraph
+
+
+def iter_long_lines(f, min_length=50):
+    """Lignes non vides suffisamment longues (lecture de secours en texte brut)"""
+    for line in f:
+        line = line.strip()
+        if len(line) > min_length:
+            yield line
+
+
+def iter_csv_texts(f, min_cell_length=30, text_column=None):
+    """
+    Lignes CSV contenant au moins une cellule substantielle, cellules concaténées
+    - text_column: nom de la colonne de texte (en-tête); seule cette colonne est lue
+    """
+    reader = csv.reader(f)
+    if text_column is not None:
+        header = next(reader, None)
+        if header is None:
+            return
+        if text_column not in header:
+            raise csv.Error(f"Colonne '{text_column}' absente de l'en-tête")
+        index = header.index(text_column)
+        for row in reader:
+            if len(row) > index and len(row[index]) > min_cell_length:
+                yield row[index]
+        return
+
+    for row in reader:
+        if row and any(len(cell) > min_cell_length for cell in row):
+            yield " ".join(cell for cell in row if len(cell) > 2)
+
+
+def _skip_whitespace(buffer, pos):
+    while pos < len(buffer) and buffer[pos] in ' \t\r\n':
+        pos += 1
+    return pos
+
+
+class _JsonStream:
+    """Tampon glissant sur un fichier pour décoder un document JSON valeur par valeur"""
+
+    def __init__(self, f, chunk_size=JSON_CHUNK_SIZE):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self):
+        """Lit un bloc supplémentaire en abandonnant la partie déjà consommée"""
+        chunk = self.f.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """Retourne le prochain caractère significatif (None en fin de fichier)"""
+        while True:
+            self.pos = _skip_whitespace(self.buffer, self.pos)
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                return None
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise json.JSONDecodeError(f"'{char}' attendu", self.buffer, self.pos)
+        self.pos += 1
+
+    def decode(self):
+        """Décode la prochaine valeur JSON complète"""
+        self.peek()
+        while True:
+            try:
+                value, end = _json_decoder.raw_decode(self.buffer, self.pos)
+                # Un nombre coupé en fin de tampon ("1." ou "2e") se décode en
+                # partie: la valeur n'est sûre que si un délimiteur la suit
+                if self.eof or (end < len(self.buffer) and self.buffer[end] in _VALUE_DELIMITERS):
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            self._fill()
+
+
+def _iter_json_items(stream, first):
+    """Produit les éléments du conteneur JSON dont le premier caractère est `first`"""
+    if first not in '[{':
+        yield stream.decode()
+        return
+
+    closing = ']' if first == '[' else '}'
+    stream.pos += 1
+    expect_separator = False
+    while True:
+        char = stream.peek()
+        if char == closing:
+            return
+        if char is None:
+            raise json.JSONDecodeError("Document JSON incomplet", stream.buffer, stream.pos)
+        if expect_separator:
+            stream.expect(',')
+        if first == '[':
+            yield stream.decode()
+        else:
+            key = stream.decode()
+            stream.expect(':')
+            yield key, stream.decode()
+        expect_separator = True
+
+
+def open_json_document(f):
+    """
+    Prépare le parcours incrémental d'un document JSON
+    Retourne (type, itérateur) où type vaut:
+    - 'array': l'itérateur produit chaque élément du tableau
+    - 'object': l'itérateur produit chaque paire (clé, valeur)
+    - 'value': l'itérateur produit la valeur seule
+    - None: document vide
+    """
+    stream = _JsonStream(f)
+    first = stream.peek()
+    if first is None:
+        return None, iter(())
+    kind = {'[': 'array', '{': 'object'}.get(first, 'value')
+    return kind, _iter_json_items(stream, first)
+
+
+def _texts_from_item(item, min_length, text_field=None):
+    """Extrait les chaînes substantielles d'un élément JSON"""
+    if isinstance(item, dict):
+        if text_field is not None:
+            value = item.get(text_field)
+            if isinstance(value, str) and len(value) > min_length:
+                yield value
+            return
+        for v in item.values():
+            if isinstance(v, str) and len(v) > min_length:
+                yield v
+    elif isinstance(item, str) and len(item) > min_length:
+        yield item
+
+
+def iter_json_texts(f, text_field=None):
+    """
+    Textes d'un document JSON:
+    - liste: chaînes de plus de 30 caractères des éléments (ou de leurs valeurs)
+    - dictionnaire: chaînes de plus de 40 caractères, sur deux niveaux
+    - text_field: pour des éléments dictionnaires, seul ce champ est lu
+    """
+    kind, items = open_json_document(f)
+    if kind == 'array':
+        for item in items:
+            yield from _texts_from_item(item, 30, text_field)
+    elif kind == 'object':
+        for _, v in items:
+            if isinstance(v, str) and len(v) > 40:
+                yield v
+            elif isinstance(v, dict):
+                # Récursion simple sur un niveau
+                yield from _texts_from_item(v, 40, text_field)
+    elif kind == 'value':
+        for value in items:
+            yield str(value)
+
+
+def iter_jsonl_texts(f, text_field=None):
+    """Textes d'un fichier JSON Lines (un document par ligne)"""
+    for line in f:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            item = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+        yield from _texts_from_item(item, 30, text_field)
+
+
+def _require_pyarrow(format_name):
+    if pyarrow is None:
+        raise ImportError(f"Le format '{format_name}' nécessite le paquet pyarrow (pip install pyarrow)")
+
+
+def _iter_column_batches(batches, text_column, min_length):
+    """Textes d'une colonne à partir de lots d'enregistrements Arrow"""
+    for batch in batches:
+        column = batch.column(batch.schema.get_field_index(text_column))
+        for value in column.to_pylist():
+            if isinstance(value, str) and len(value) > min_length:
+                yield value
+
+
+def iter_parquet_texts(f, text_column='text', min_length=30, batch_size=1024):
+    """
+    Textes d'un fichier Parquet: seule la colonne de texte est lue,
+    lot par lot (les autres colonnes ne sont jamais décodées)
+    """
+    _require_pyarrow('parquet')
+    parquet_file = pyarrow.parquet.ParquetFile(f)
+    batches = parquet_file.iter_batches(batch_size=batch_size, columns=[text_column])
+    yield from _iter_column_batches(batches, text_column, min_length)
+
+
+def iter_arrow_texts(f, text_column='text', min_length=30):
+    """Textes d'un fichier Arrow IPC / Feather v2, lus lot par lot"""
+    _require_pyarrow('arrow')
+    reader = pyarrow.ipc.open_file(f)
+    batches = (reader.get_batch(i) for i in range(reader.num_record_batches))
+    yield from _iter_column_batches(batches, text_column, min_length)
+
+
+# Registre des formats: nom -> lecteur, extensions, mode binaire, lecteur de secours
+FORMATS = {}
+EXTENSIONS = {}
+COMPRESSIONS = {'.gz': gzip.open, '.bz2': bz2.open}
+
+
+def register_format(name, reader, extensions=(), binary=False, fallback=None):
+    """
+    Enregistre un lecteur de format
+    - reader: générateur reader(f, **options) produisant des textes
+    - extensions: extensions de fichier associées (ex: ('.txt',))
+    - binary: le lecteur attend un fichier binaire plutôt que texte
+    - fallback: lecteur texte utilisé si le fichier est mal formé
+    """
+    FORMATS[name] = {'reader': reader, 'binary': binary, 'fallback': fallback}
+    for extension in extensions:
+        EXTENSIONS[extension] = name
+
+
+register_format('text', iter_text_paragraphs, ('.txt',))
+register_format('markdown', iter_markdown_paragraphs, ('.md',))
+register_format('csv', iter_csv_texts, ('.csv',), fallback=iter_long_lines)
+register_format('json', iter_json_texts, ('.json',), fallback=iter_text_paragraphs)
+register_format('jsonl', iter_jsonl_texts, ('.jsonl',))
+register_format('lines', iter_long_lines)
+register_format('parquet', iter_parquet_texts, ('.parquet',), binary=True)
+register_format('arrow', iter_arrow_texts, ('.arrow', '.feather'), binary=True)
+
+
+def format_for_path(path):
+    """Devine le format d'un fichier d'après son extension (compression ignorée)"""
+    base, extension = os.path.splitext(path.lower())
+    if extension in COMPRESSIONS:
+        extension = os.path.splitext(base)[1]
+    # Format texte générique par défaut
+    return EXTENSIONS.get(extension, 'text')
+
+
+def is_supported_path(path):
+    """Indique si un fichier peut être lu (extension connue, éventuellement compressé)"""
+    base, extension = os.path.splitext(path.lower())
+    if extension == '.zip':
+        return True
+    if extension in COMPRESSIONS:
+        extension = os.path.splitext(base)[1]
+    return extension in EXTENSIONS
+
+
+def _open_member(opener, binary):
+    """Ouvre un flux binaire et l'expose en texte si nécessaire"""
+    raw = opener()
+    if binary:
+        return raw
+    return io.TextIOWrapper(raw, encoding='utf-8', errors='ignore')
+
+
+def iter_sources(path):
+    """
+    Produit les sources lisibles d'un chemin sous forme (nom, ouvreur binaire):
+    le fichier lui-même, son contenu décompressé, ou chaque membre d'une archive zip
+    """
+    extension = os.path.splitext(path.lower())[1]
+    if extension == '.zip':
+        with zipfile.ZipFile(path) as archive:
+            for member in sorted(archive.namelist()):
+                if member.endswith('/') or not is_supported_path(member):
+                    continue
+                yield member, lambda member=member: archive.open(member)
+    elif extension in COMPRESSIONS:
+        yield path, lambda: COMPRESSIONS[extension](path, 'rb')
+    else:
+        yield path, lambda: open(path, 'rb')
+
+
+def iter_texts(path, format_name=None, options=None):
+    """
+    Lit en flux tous les textes d'un chemin (fichier, fichier compressé ou
+    archive zip) avec le lecteur enregistré pour son format
+    - format_name: format imposé (sinon déduit de l'extension de chaque source)
+    - options: paramètres passés au lecteur (ex: {'text_column': 'texte'})
+    """
+    options = options or {}
+    for source_name, opener in iter_sources(path):
+        spec = FORMATS[format_name or format_for_path(source_name)]
+        with _open_member(opener, spec['binary']) as f:
+            produced = 0
+            try:
+                for text in spec['reader'](f, **options):
+                    produced += 1
+                    yield text
+            except (json.JSONDecodeError, csv.Error) as parse_err:
+                print(f"Erreur de format dans {os.path.basename(source_name)}: {str(parse_err)}")
+                # Si rien n'a pu être lu, relit le fichier comme du texte simple
+                if spec['fallback'] is None or produced:
+                    continue
+                f.seek(0)
+                yield from spec['fallback'](f)
@@ -0,0 +1,118 @@
+import hashlib
+import numpy as np
+from collections import defaultdict
+
+from tokenizer import tokenize
+
+class SimHashIndex:
+    """
+    Index de signatures SimHash pour détecter les contenus quasi identiques.
+    Chaque texte est résumé par une signature de 64 bits; deux textes dont les
+    signatures diffèrent d'au plus `max_distance` bits sont considérés comme
+    des doublons. La signature est découpée en bandes pour que la recherche
+    ne compare que quelques candidats au lieu de tout l'index.
+    """
+
+    SIGNATURE_BITS = 64
+
+    def __init__(self, max_distance=3, shingle_size=3):
+        self.max_distance = max_distance
+        self.shingle_size = shingle_size
+
+        # Avec max_distance + 1 bandes, deux signatures proches partagent
+        # forcément au moins une bande identique (principe des tiroirs)
+        self.num_bands = max_distance + 1
+        self.band_bits = self.SIGNATURE_BITS // self.num_bands
+
+        self.signatures = {}  # id du souvenir -> signature
+        self.bands = [defaultdict(set) for _ in range(self.num_bands)]
+
+    def _features(self, text, tokens=None):
+        """Découpe un texte (ou ses mots déjà extraits) en shingles de mots"""
+        if tokens is None:
+            tokens = tokenize(text).tokens
+        if len(tokens) < self.shingle_size:
+            return tokens
+        return [' '.join(tokens[i:i + self.shingle_size])
+                for i in range(len(tokens) - self.shingle_size + 1)]
+
+    def compute_signature(self, text, tokens=None):
+        """
+        Calcule la signature SimHash d'un texte
+        - tokens: mots du texte déjà extraits par le tokenizer partagé
+        """
+        features = self._features(text, tokens)
+        if not features:
+            return None
+
+        # Hachage stable (indépendant de PYTHONHASHSEED) pour la persistance
+        hashes = np.array([
+            int.from_bytes(hashlib.blake2b(f.encode('utf-8'), digest_size=8).digest(), 'little')
+            for f in features
+        ], dtype=np.uint64)
+
+        bits = np.unpackbits(hashes.view(np.uint8).reshape(-1, 8), axis=1, bitorder='little')
+        votes = np.sum(bits.astype(np.int32) * 2 - 1, axis=0)
+
+        signature = 0
+        for i in np.nonzero(votes > 0)[0]:
+            signature |= 1 << int(i)
+        return signature
+
+    def _band_keys(self, signature):
+        """Découpe une signature en clés de bandes"""
+        mask = (1 << self.band_bits) - 1
+        return [(signature >> (i * self.band_bits)) & mask for i in range(self.num_bands)]
+
+    def add(self, memory_id, signature):
+        """Ajoute une signature à l'index"""
+        if signature is None:
+            return
+        self.signatures[memory_id] = signature
+        for band, key in zip(self.bands, self._band_keys(signature)):
+            band[key].add(memory_id)
+
+    def remove(self, memory_id):
+        """Retire un souvenir de l'index"""
+        signature = self.signatures.pop(memory_id, None)
+        if signature is None:
+            return
+        for band, key in zip(self.bands, self._band_keys(signature)):
+            bucket = band.get(key)
+            if bucket is not None:
+                bucket.discard(memory_id)
+                if not bucket:
+                    del band[key]
+
+    def find_duplicate(self, signature):
+        """
+        Retourne l'id du souvenir le plus proche dont la signature est à
+        distance au plus max_distance, ou None
+        """
+        if signature is None:
+            return None
+
+        best_id = None
+        best_distance = self.max_distance + 1
+        seen = set()
+        for band, key in zip(self.bands, self._band_keys(signature)):
+            for memory_id in band.get(key, ()):
+                if memory_id in seen:
+                    continue
+                seen.add(memory_id)
+                distance = bin(self.signatures[memory_id] ^ signature).count('1')
+                if distance < best_distance:
+                    best_id = memory_id
+                    best_distance = distance
+        return best_id
+
+    def __contains__(self, memory_id):
+        return memory_id in self.signatures
+
+    def __len__(self):
+        return len(self.signatures)
+
+    def clear(self):
+        """Vide l'index"""
+        self.signatures = {}
+        self.bands = [defaultdict(set) for _ in range(self.num_bands)]
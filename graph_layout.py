@@ -0,0 +1,107 @@
+import threading
+
+import numpy as np
+import networkx as nx
+
+class GraphLayout:
+    """
+    Positions des nœuds du réseau de mémoire conservées entre deux rendus.
+    La disposition complète (Kamada-Kawai, coûteuse) n'est calculée qu'au
+    premier rendu ou quand la majorité des nœuds affichés est nouvelle; sinon
+    les nœuds déjà placés restent fixes et seuls les nouveaux sont placés
+    (près de leurs voisins, puis quelques itérations de spring layout limitées
+    aux nouveaux nœuds et à leur voisinage).
+    """
+
+    def __init__(self, kamada_kawai_limit=300, iterations=30, relayout_ratio=0.5, local_limit=500, seed=0):
+        """
+        - kamada_kawai_limit: au-delà, la disposition complète utilise spring layout
+        - iterations: itérations du placement incrémental des nouveaux nœuds
+        - relayout_ratio: part de nouveaux nœuds déclenchant une disposition complète
+        - local_limit: taille maximale du voisinage recalculé lors d'un placement incrémental
+        """
+        self.kamada_kawai_limit = kamada_kawai_limit
+        self.iterations = iterations
+        self.relayout_ratio = relayout_ratio
+        self.local_limit = local_limit
+        self.seed = seed
+        self.rng = np.random.default_rng(seed)
+
+        self.positions = {}  # id du nœud -> position (x, y)
+        self.lock = threading.Lock()
+        self.stats = {'full': 0, 'incremental': 0, 'cached': 0}
+
+    def update(self, node_ids, edges):
+        """
+        Retourne les positions des nœuds donnés ({id: array([x, y])})
+        - edges: liste de (source, cible, poids) entre ces nœuds
+        """
+        with self.lock:
+            known = [n for n in node_ids if n in self.positions]
+            new = [n for n in node_ids if n not in self.positions]
+            if not new:
+                self.stats['cached'] += 1
+                return {n: self.positions[n] for n in node_ids}
+
+            graph = nx.Graph()
+            graph.add_nodes_from(node_ids)
+            graph.add_weighted_edges_from(edges)
+
+            if not known or len(new) > self.relayout_ratio * len(node_ids):
+                positions = self._full_layout(graph)
+                self.stats['full'] += 1
+            else:
+                positions = self._incremental_layout(graph, known, new)
+                self.stats['incremental'] += 1
+
+            # Les nœuds sortis de la sélection gardent leur position pour leur retour
+            self.positions.update(positions)
+            return {n: self.positions[n] for n in node_ids}
+
+    def _full_layout(self, graph):
+        if len(graph) <= self.kamada_kawai_limit:
+            try:
+                return nx.kamada_kawai_layout(graph)
+            except Exception:
+                pass
+        return nx.spring_layout(graph, k=0.3, iterations=50, seed=self.seed)
+
+    def _incremental_layout(self, graph, known, new):
+        """Place les nouveaux nœuds sans déplacer ceux déjà affichés"""
+        positions = {n: self.positions[n] for n in known}
+        coordinates = np.array(list(positions.values()))
+        low, high = coordinates.min(axis=0), coordinates.max(axis=0)
+
+        for node in new:
+            neighbours = [positions[n] for n in graph.neighbors(node) if n in positions]
+            if neighbours:
+                # Près du centre de ses voisins déjà placés
+                positions[node] = np.mean(neighbours, axis=0) + self.rng.normal(0, 0.05, 2)
+            else:
+                positions[node] = self.rng.uniform(low, high)
+
+        # Seuls les nouveaux nœuds et leurs voisins (fixes) participent aux itérations
+        # (voisinage borné: networkx passe à une version bien plus lente au-delà de 500 nœuds)
+        new_nodes = set(new)
+        local_nodes = set(new_nodes)
+        for node in new:
+            if len(local_nodes) >= self.local_limit:
+                break
+            local_nodes.update(graph.neighbors(node))
+        local_graph = graph.subgraph(local_nodes)
+        fixed = [n for n in local_graph if n not in new_nodes]
+        local_positions = nx.spring_layout(local_graph, pos={n: positions[n] for n in local_graph},
+                                           fixed=fixed or None, k=1 / np.sqrt(len(graph)),
+                                           iterations=self.iterations, seed=self.seed)
+        positions.update(local_positions)
+        return positions
+
+    def forget(self, node_ids):
+        """Oublie la position de nœuds retirés du réseau"""
+        with self.lock:
+            for node_id in node_ids:
+                self.positions.pop(node_id, None)
+
+    def clear(self):
+        with self.lock:
+            self.positions = {}
@@ -0,0 +1,166 @@
+import math
+import numpy as np
+from collections import Counter
+
+from tokenizer import normalize, tokenize
+
+class InterestScorer:
+    """
+    Évalue l'intérêt des paragraphes pour l'explorateur web.
+    Chaque texte n'est mis en minuscules et découpé qu'une seule fois (les
+    textes déjà découpés par le tokenizer partagé sont acceptés tels quels),
+    et une page entière peut être évaluée en un seul appel vectorisé.
+
+    Modes disponibles:
+    - 'compat': recherche par sous-chaînes, scores identiques à l'ancien calcul
+    - 'tokens': intersection d'ensembles de mots (plus rapide, plus strict)
+    """
+
+    MODES = ('compat', 'tokens')
+
+    def __init__(self, keywords, mode='compat', memory_system=None, tfidf_weight=0.0):
+        """
+        - keywords: mots-clés augmentant l'intérêt d'un texte
+        - mode: 'compat' ou 'tokens'
+        - memory_system: source des fréquences documentaires pour le terme TF-IDF
+        - tfidf_weight: poids du terme de pertinence TF-IDF (0 pour le désactiver)
+        """
+        if mode not in self.MODES:
+            raise ValueError(f"Mode d'évaluation inconnu: {mode}")
+        self.mode = mode
+        self.memory_system = memory_system
+        self.tfidf_weight = tfidf_weight
+        self.set_keywords(keywords)
+
+        # Cache des IDF calculés à partir de la mémoire
+        self._idf = None
+        self._idf_version = None
+
+    def set_keywords(self, keywords):
+        """Précompile la liste des mots-clés"""
+        self.keywords = [k.lower() for k in keywords]
+        self.keyword_set = frozenset(normalize(k) for k in keywords)
+
+    def _prepare_query(self, query):
+        """Prépare les mots de la requête une seule fois pour tout un lot"""
+        if not query:
+            return None, 0
+        if self.mode == 'compat':
+            query_words = query.lower().split()
+        else:
+            query_words = tokenize(query).tokens
+        # Les mots très courts sont ignorés mais comptent dans le dénominateur
+        significant = [w for w in query_words if len(w) > 3]
+        return significant, len(query_words)
+
+    def _count_matches(self, tokenized, significant_query_words):
+        """Compte les mots-clés et les mots de la requête présents dans un texte"""
+        if self.mode == 'compat':
+            lowered_text = tokenized.text.lower()
+            keyword_hits = sum(1 for keyword in self.keywords if keyword in lowered_text)
+            query_hits = 0
+            if significant_query_words:
+                query_hits = sum(1 for word in significant_query_words if word in lowered_text)
+        else:
+            tokens = set(tokenized.tokens)
+            keyword_hits = len(self.keyword_set & tokens)
+            query_hits = 0
+            if significant_query_words:
+                query_hits = sum(1 for word in significant_query_words if word in tokens)
+        return keyword_hits, query_hits
+
+    def score(self, text, query=None):
+        """Évalue l'intérêt d'un seul texte"""
+        return float(self.score_batch([text], query)[0])
+
+    def score_batch(self, texts, query=None):
+        """
+        Évalue l'intérêt d'une liste de textes (chaînes ou TokenizedText) en un seul appel
+        Retourne un tableau numpy de scores entre 0 et 1
+        """
+        n = len(texts)
+        if n == 0:
+            return np.zeros(0)
+
+        significant_query_words, query_length = self._prepare_query(query)
+
+        lengths = np.empty(n)
+        keyword_hits = np.empty(n, dtype=np.int64)
+        query_hits = np.empty(n, dtype=np.int64)
+        tokenized_texts = [tokenize(text) for text in texts]
+
+        for i, tokenized in enumerate(tokenized_texts):
+            lengths[i] = len(tokenized.text)
+            keyword_hits[i], query_hits[i] = self._count_matches(tokenized, significant_query_words)
+
+        # Score de base et bonus de longueur
+        scores = np.full(n, 0.5)
+        scores += np.where((lengths > 100) & (lengths < 1000), 0.2,
+                           np.where(lengths >= 1000, 0.1, 0.0))
+
+        # Bonus par mot-clé, ajouté pas à pas pour reproduire exactement
+        # l'arrondi flottant de l'ancien calcul séquentiel
+        for i in range(int(keyword_hits.max())):
+            scores += np.where(keyword_hits > i, 0.05, 0.0)
+
+        # Bonus de pertinence par rapport à la requête
+        if query_length:
+            scores += (query_hits / query_length) * 0.5
+
+            if self.tfidf_weight > 0 and self.memory_system is not None:
+                scores += self.tfidf_weight * self._tfidf_relevance(query, tokenized_texts)
+
+        # Plafonne à 1.0
+        return np.minimum(scores, 1.0)
+
+    def _memory_version(self):
+        """Identifie l'état courant de la mémoire pour invalider le cache IDF"""
+        return (self.memory_system.memory_counter,
+                len(self.memory_system.ltm_network),
+                len(self.memory_system.stm_buffer))
+
+    def _get_idf(self):
+        """Calcule (ou récupère du cache) les IDF à partir des souvenirs textuels"""
+        version = self._memory_version()
+        if self._idf is not None and self._idf_version == version:
+            return self._idf
+
+        document_frequencies = Counter()
+        documents_count = 0
+        with self.memory_system.lock:
+            memories = list(self.memory_system.stm_buffer)
+            memories.extend(self.memory_system.ltm_network.nodes[n] for n in self.memory_system.ltm_network.nodes())
+        for memory in memories:
+            content = memory.get('content')
+            if isinstance(content, str):
+                document_frequencies.update(set(tokenize(content).tokens))
+                documents_count += 1
+
+        self._idf = {
+            token: math.log((1 + documents_count) / (1 + df)) + 1.0
+            for token, df in document_frequencies.items()
+        }
+        self._idf_default = math.log(1 + documents_count) + 1.0
+        self._idf_version = version
+        return self._idf
+
+    def _tfidf_vector(self, tokens, idf):
+        """Construit un vecteur TF-IDF creux (dictionnaire) normalisé"""
+        counts = Counter(tokens)
+        vector = {t: c * idf.get(t, self._idf_default) for t, c in counts.items()}
+        norm = math.sqrt(sum(v * v for v in vector.values()))
+        if norm > 0:
+            vector = {t: v / norm for t, v in vector.items()}
+        return vector
+
+    def _tfidf_relevance(self, query, tokenized_texts):
+        """Similarité cosinus TF-IDF entre la requête et chaque texte"""
+        idf = self._get_idf()
+        query_vector = self._tfidf_vector(tokenize(query).tokens, idf)
+        relevance = np.zeros(len(tokenized_texts))
+        if not query_vector:
+            return relevance
+        for i, tokenized in enumerate(tokenized_texts):
+            text_vector = self._tfidf_vector(tokenized.tokens, idf)
+            relevance[i] = sum(w * text_vector.get(t, 0.0) for t, w in query_vector.items())
+        return relevance
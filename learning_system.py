@@ -4,8 +4,16 @@ import random
 import time
 import json
 import os
+import threading
 from datetime import datetime
 
+from profiling import timed_methods
+from concept_graph import ConceptGraph
+from memory_system import synchronized
+
+@timed_methods('learn_from_interaction', 'learn_from_exploration', 'learn_from_exploration_batch',
+               'form_concept', 'associate_concepts', 'get_related_concepts',
+               'save_learning_state', 'load_learning_state')
 class LearningSystem:
     """
     Système d'apprentissage qui coordonne les différentes stratégies
@@ -16,6 +24,12 @@ class LearningSystem:
         self.neural_core = neural_core
         self.memory_system = memory_system
         
+        # Verrou de l'apprentissage: toute modification du réseau neuronal (learn,
+        # evolve_architecture) et des métriques passe par ce système, depuis les
+        # requêtes comme depuis les recherches et imports en arrière-plan. Le verrou
+        # de la mémoire est toujours pris après celui-ci
+        self.lock = threading.RLock()
+        
         # Paramètres d'apprentissage
         self.exploration_rate = 0.9  # Taux d'exploration élevé au début
         self.learning_rate_decay = 0.9999  # Diminution progressive du taux d'apprentissage
@@ -28,8 +42,46 @@ class LearningSystem:
         
         # Concepts appris
         self.concepts = {}
-        self.association_strengths = {}
         
+        # Associations entre concepts (ids entiers, adjacence creuse)
+        self.concept_graph = ConceptGraph()
+        
+    @staticmethod
+    def encode_text(text, size=100):
+        """
+        Encodage très simple du texte (à améliorer dans un vrai système):
+        chaque caractère est représenté par son code normalisé (ord / 255)
+        Les codes sont lus d'un bloc dans l'encodage UTF-32 du texte
+        """
+        vec = np.zeros(size)  # Taille arbitraire
+        codes = np.frombuffer(text[:size].encode('utf-32-le', 'surrogatepass'), dtype='<u4')
+        vec[:len(codes)] = codes / 255.0
+        return vec
+    
+    @staticmethod
+    def encode_texts(texts, size=100, out=None):
+        """
+        Encode une liste de textes (identique à encode_text pour chacun)
+        - out: matrice (len(texts), size) préallouée à remplir, sinon créée
+        Retourne la matrice des encodages
+        """
+        if out is None:
+            out = np.zeros((len(texts), size))
+        else:
+            out[:] = 0
+        
+        # Tous les caractères retenus sont convertis en un seul appel puis
+        # répartis dans la matrice (ligne = texte, colonne = position)
+        truncated = [text[:size] for text in texts]
+        lengths = np.fromiter((len(t) for t in truncated), dtype=np.int64, count=len(truncated))
+        codes = np.frombuffer(''.join(truncated).encode('utf-32-le', 'surrogatepass'), dtype='<u4')
+        rows = np.repeat(np.arange(len(truncated)), lengths)
+        starts = np.cumsum(lengths) - lengths
+        columns = np.arange(len(codes)) - np.repeat(starts, lengths)
+        out[rows, columns] = codes / 255.0
+        return out
+    
+    @synchronized
     def learn_from_interaction(self, input_data, feedback, is_positive=True):
         """
         Apprend à partir d'une interaction avec un humain
@@ -39,10 +91,7 @@ class LearningSystem:
         """
         # Préparation des données
         if isinstance(input_data, str):
-            # Encodage très simple du texte (à améliorer dans un vrai système)
-            input_vector = np.zeros(100)  # Taille arbitraire
-            for i, char in enumerate(input_data[:100]):
-                input_vector[i % 100] = ord(char) / 255.0
+            input_vector = self.encode_text(input_data)
         else:
             input_vector = input_data
             
@@ -68,9 +117,12 @@ class LearningSystem:
         
         # L'importance est basée sur la force de la récompense (positive ou négative)
         importance = abs(reward)
+        # Chaque interaction est une expérience distincte: pas de fusion des doublons
         self.memory_system.add_memory(json.dumps(memory_data), 
                                      metadata={'type': 'interaction'},
-                                     importance=importance)
+                                     importance=importance,
+                                     deduplicate=False,
+                                     fields=memory_data)
         
         # Évolution possible de l'architecture
         if self.total_experiences % 50 == 0:
@@ -88,6 +140,7 @@ class LearningSystem:
         
         return output, loss
     
+    @synchronized
     def learn_from_exploration(self, data):
         """
         Apprend de manière autonome à partir de données explorées
@@ -95,10 +148,7 @@ class LearningSystem:
         """
         # Simplifie les données pour l'apprentissage
         if isinstance(data, str):
-            # Encodage très simple du texte
-            input_vector = np.zeros(100)  # Taille arbitraire
-            for i, char in enumerate(data[:100]):
-                input_vector[i % 100] = ord(char) / 255.0
+            input_vector = self.encode_text(data)
         else:
             input_vector = data
             
@@ -120,7 +170,9 @@ class LearningSystem:
             
             self.memory_system.add_memory(json.dumps(memory_data), 
                                          metadata={'type': 'exploration'},
-                                         importance=0.3)  # Importance modérée
+                                         importance=0.3,  # Importance modérée
+                                         deduplicate=False,
+                                         fields=memory_data)
             
         else:
             # Mode exploitation: utilise les connaissances actuelles
@@ -132,6 +184,53 @@ class LearningSystem:
         
         return output, loss
     
+    @synchronized
+    def learn_from_exploration_batch(self, data, input_vectors=None):
+        """
+        Apprend à partir d'un lot de données explorées en une seule étape d'optimisation
+        - data: liste de données trouvées (texte, vecteurs, etc.)
+        - input_vectors: encodages déjà calculés (par exemple par les processus d'import)
+        """
+        if not data:
+            return np.zeros((0, self.neural_core.output_layer.out_features)), []
+        
+        if input_vectors is not None:
+            input_batch = np.asarray(input_vectors, dtype=np.float32)
+        elif all(isinstance(d, str) for d in data):
+            input_batch = self.encode_texts(data).astype(np.float32)
+        else:
+            input_batch = np.asarray([self.encode_text(d) if isinstance(d, str) else d for d in data],
+                                     dtype=np.float32)
+        
+        # Exploration ou exploitation, décidée pour chaque élément du lot
+        explore = [random.random() < self.exploration_rate for _ in data]
+        rewards = [0.1 if e else 0 for e in explore]
+        
+        outputs, losses = self.neural_core.learn_batch(input_batch, rewards)
+        
+        # Stocke les expériences d'exploration en mémoire
+        for item, output, explored in zip(data, outputs, explore):
+            if not explored:
+                continue
+            memory_data = {
+                'input': item if isinstance(item, str) else "exploration_data",
+                'exploration': True,
+                'output': output.tolist(),
+                'timestamp': datetime.now().isoformat()
+            }
+            self.memory_system.add_memory(json.dumps(memory_data),
+                                         metadata={'type': 'exploration'},
+                                         importance=0.3,  # Importance modérée
+                                         deduplicate=False,
+                                         fields=memory_data)
+        
+        # Mise à jour des métriques
+        self.total_experiences += len(data)
+        self.loss_history.extend(losses)
+        
+        return outputs, losses
+    
+    @synchronized
     def form_concept(self, name, examples):
         """
         Forme un nouveau concept à partir d'exemples
@@ -141,17 +240,11 @@ class LearningSystem:
         if not examples:
             return False
             
-        # Encodage des exemples
-        encoded_examples = []
-        for example in examples:
-            if isinstance(example, str):
-                # Encodage simple
-                vec = np.zeros(100)
-                for i, char in enumerate(example[:100]):
-                    vec[i % 100] = ord(char) / 255.0
-                encoded_examples.append(vec)
-            else:
-                encoded_examples.append(example)
+        # Encodage des exemples (textuels en un seul lot)
+        texts = [example for example in examples if isinstance(example, str)]
+        encoded_texts = iter(self.encode_texts(texts)) if texts else iter(())
+        encoded_examples = [next(encoded_texts) if isinstance(example, str) else example
+                            for example in examples]
                 
         # Représentation du concept comme moyenne des exemples
         concept_vector = np.mean(encoded_examples, axis=0)
@@ -161,6 +254,7 @@ class LearningSystem:
             concept_vector = concept_vector / np.linalg.norm(concept_vector)
             
         # Stockage du concept
+        self.concept_graph.concept_id(name)
         self.concepts[name] = {
             'vector': concept_vector,
             'examples': examples,
@@ -178,10 +272,12 @@ class LearningSystem:
         
         self.memory_system.add_memory(json.dumps(concept_data),
                                      metadata={'type': 'concept', 'name': name},
-                                     importance=0.8)  # Concepts sont importants
+                                     importance=0.8,  # Concepts sont importants
+                                     fields=concept_data)
         
         return True
         
+    @synchronized
     def associate_concepts(self, concept1, concept2, strength=0.5):
         """
         Crée une association entre deux concepts
@@ -189,11 +285,7 @@ class LearningSystem:
         if concept1 not in self.concepts or concept2 not in self.concepts:
             return False
             
-        key = f"{concept1}_{concept2}"
-        reverse_key = f"{concept2}_{concept1}"
-        
-        self.association_strengths[key] = strength
-        self.association_strengths[reverse_key] = strength
+        self.concept_graph.associate(concept1, concept2, strength)
         
         # Mémorisation de l'association
         association_data = {
@@ -205,33 +297,28 @@ class LearningSystem:
         
         self.memory_system.add_memory(json.dumps(association_data),
                                      metadata={'type': 'association'},
-                                     importance=0.6)
+                                     importance=0.6,
+                                     fields=association_data)
         
         return True
     
-    def get_related_concepts(self, concept_name, threshold=0.3):
+    def get_related_concepts(self, concept_name, threshold=0.3, max_hops=1):
         """
         Récupère les concepts liés à un concept donné
+        - max_hops: nombre d'associations successives suivies (1 = voisins directs);
+          la force d'un concept indirect est le produit des forces du meilleur chemin
+        Retourne une liste de {'name', 'strength', 'hops'} par force décroissante
         """
         if concept_name not in self.concepts:
             return []
-            
-        related = []
-        for other_concept in self.concepts:
-            if other_concept == concept_name:
-                continue
-                
-            key = f"{concept_name}_{other_concept}"
-            if key in self.association_strengths and self.association_strengths[key] >= threshold:
-                related.append({
-                    'name': other_concept,
-                    'strength': self.association_strengths[key]
-                })
-                
-        # Trie par force d'association
-        related.sort(key=lambda x: x['strength'], reverse=True)
-        return related
+        return self.concept_graph.related(concept_name, threshold=threshold, max_hops=max_hops)
     
+    @staticmethod
+    def _associations_path(path):
+        """Fichier binaire des associations, à côté de l'état d'apprentissage"""
+        return os.path.splitext(path)[0] + '_associations.npz'
+    
+    @synchronized
     def save_learning_state(self, path="learning_state.json"):
         """Sauvegarde l'état du système d'apprentissage"""
         # Ne sauvegarde pas les vecteurs numpy directement
@@ -249,16 +336,19 @@ class LearningSystem:
             'total_experiences': self.total_experiences,
             'exploration_rate': self.exploration_rate,
             'concepts': concepts_serializable,
-            'association_strengths': self.association_strengths,
             'reward_history': self.reward_history[-100:],  # Seulement les 100 derniers
             'loss_history': self.loss_history[-100:]  # Seulement les 100 derniers
         }
         
         with open(path, 'w') as f:
             json.dump(state, f, indent=2)
+        
+        # Associations au format binaire
+        self.concept_graph.save(self._associations_path(path))
             
         print(f"État d'apprentissage sauvegardé dans {path}")
     
+    @synchronized
     def load_learning_state(self, path="learning_state.json"):
         """Charge l'état du système d'apprentissage"""
         if os.path.exists(path):
@@ -267,7 +357,6 @@ class LearningSystem:
                 
             self.total_experiences = state['total_experiences']
             self.exploration_rate = state['exploration_rate']
-            self.association_strengths = state['association_strengths']
             self.reward_history = state['reward_history']
             self.loss_history = state['loss_history']
             
@@ -281,6 +370,18 @@ class LearningSystem:
                     'updated_at': data['updated_at'],
                     'usage_count': data['usage_count']
                 }
+            
+            # Associations: fichier binaire, ou ancien dictionnaire de l'état JSON
+            associations_path = self._associations_path(path)
+            if os.path.exists(associations_path):
+                self.concept_graph.load(associations_path)
+            else:
+                unresolved = self.concept_graph.load_legacy(state.get('association_strengths', {}),
+                                                            self.concepts)
+                if unresolved:
+                    print(f"{unresolved} associations n'ont pas pu être rattachées à des concepts connus")
+            for name in self.concepts:
+                self.concept_graph.concept_id(name)
                 
             print(f"État d'apprentissage chargé depuis {path}")
             return True
@@ -0,0 +1,204 @@
+import math
+from collections import Counter
+
+import numpy as np
+
+class LexicalIndex:
+    """
+    Index inversé des souvenirs (mot -> liste des souvenirs qui le contiennent)
+    avec un classement BM25.
+    - Les listes sont tenues à jour à chaque ajout ou retrait de souvenir; un
+      retrait ne fait que marquer le souvenir comme absent (longueur nulle) et
+      chaque entrée porte la génération du souvenir (incrémentée à chaque
+      réindexation): les entrées périmées sont ignorées, puis purgées quand
+      elles deviennent majoritaires
+    - Une recherche ne parcourt que les listes des mots de la requête, converties
+      en tableaux numpy (mis en cache jusqu'à la modification suivante)
+    """
+
+    def __init__(self, k1=1.2, b=0.75, initial_capacity=1024):
+        self.k1 = k1
+        self.b = b
+
+        self.postings = {}  # mot -> [ids, fréquences, générations, cache numpy ou None, entrées périmées]
+        self.document_frequency = Counter()  # mot -> nombre de souvenirs présents le contenant
+        self.terms = {}  # id du souvenir -> mots distincts (pour le retrait)
+        self.lengths = np.zeros(initial_capacity, dtype=np.float32)  # id -> nombre de mots (0: absent)
+        self.generations = np.zeros(initial_capacity, dtype=np.int32)  # id -> génération courante
+        self.total_length = 0
+
+    def __len__(self):
+        return len(self.terms)
+
+    def __contains__(self, memory_id):
+        return memory_id in self.terms
+
+    def add(self, memory_id, tokens):
+        """Indexe (ou réindexe) un souvenir à partir de ses mots"""
+        if memory_id in self.terms:
+            self.remove(memory_id)
+        if not tokens:
+            return
+        if memory_id >= len(self.lengths):
+            capacity = max(memory_id + 1, 2 * len(self.lengths))
+            lengths = np.zeros(capacity, dtype=np.float32)
+            lengths[:len(self.lengths)] = self.lengths
+            generations = np.zeros(capacity, dtype=np.int32)
+            generations[:len(self.generations)] = self.generations
+            self.lengths, self.generations = lengths, generations
+
+        self.generations[memory_id] += 1
+        generation = int(self.generations[memory_id])
+        counts = Counter(tokens)
+        for term, count in counts.items():
+            posting = self.postings.get(term)
+            if posting is None:
+                posting = self.postings[term] = [[], [], [], None, 0]
+            posting[0].append(memory_id)
+            posting[1].append(count)
+            posting[2].append(generation)
+            posting[3] = None
+        self.document_frequency.update(counts.keys())
+        self.terms[memory_id] = tuple(counts)
+        self.lengths[memory_id] = len(tokens)
+        self.total_length += len(tokens)
+
+    def remove(self, memory_id):
+        """Retire un souvenir de l'index"""
+        terms = self.terms.pop(memory_id, None)
+        if terms is None:
+            return
+        self.total_length -= int(self.lengths[memory_id])
+        self.lengths[memory_id] = 0
+        for term in terms:
+            self.document_frequency[term] -= 1
+            if self.document_frequency[term] == 0:
+                del self.document_frequency[term]
+                del self.postings[term]
+                continue
+            posting = self.postings[term]
+            posting[4] += 1
+            posting[3] = None
+
+    def _arrays(self, term):
+        """Ids et fréquences d'une liste, sans les entrées périmées"""
+        posting = self.postings[term]
+        if posting[3] is None:
+            ids = np.array(posting[0], dtype=np.int64)
+            frequencies = np.array(posting[1], dtype=np.float32)
+            if posting[4]:
+                generations = np.array(posting[2], dtype=np.int32)
+                live = (self.lengths[ids] > 0) & (self.generations[ids] == generations)
+                ids, frequencies = ids[live], frequencies[live]
+                if posting[4] > len(posting[0]) // 2:
+                    posting[0] = ids.tolist()
+                    posting[1] = frequencies.astype(np.int64).tolist()
+                    posting[2] = generations[live].tolist()
+                    posting[4] = 0
+            posting[3] = (ids, frequencies)
+        return posting[3]
+
+    def search(self, tokens, top_k=10, other=None):
+        """
+        Retourne les top_k couples (id du souvenir, score BM25) pour une requête
+        - tokens: mots de la requête (déjà normalisés par le tokenizer)
+        - other: index complémentaire (ex: niveau froid, voir ColdStorage) exposant
+          lexical_statistics et lexical_postings; ses souvenirs sont classés avec les
+          statistiques cumulées des deux index (un souvenir présent dans les deux
+          n'est compté qu'ici)
+        """
+        terms = set(tokens)
+        count, total_length, other_postings = len(self.terms), self.total_length, {}
+        if other is not None:
+            other_count, other_length = other.lexical_statistics()
+            count += other_count
+            total_length += other_length
+        if count == 0 or top_k <= 0:
+            return []
+        average_length = total_length / count
+        if other is not None:
+            other_postings = other.lexical_postings(terms)
+        other_frequency = {term: len(posting[0]) for term, posting in other_postings.items()}
+
+        ids_parts, score_parts = [], []
+        for term in terms:
+            frequency = self.document_frequency.get(term, 0) + other_frequency.get(term, 0)
+            if not frequency:
+                continue
+            idf = math.log(1 + (count - frequency + 0.5) / (frequency + 0.5))
+            if term in self.document_frequency:
+                ids, frequencies = self._arrays(term)
+                norms = self.k1 * (1 - self.b + self.b * self.lengths[ids] / average_length)
+                ids_parts.append(ids)
+                score_parts.append(idf * frequencies * (self.k1 + 1) / (frequencies + norms))
+            if term in other_postings:
+                ids, frequencies, lengths = other_postings[term]
+                known = ids < len(self.lengths)
+                known[known] = self.lengths[ids[known]] > 0
+                ids, frequencies, lengths = ids[~known], frequencies[~known], lengths[~known]
+                norms = self.k1 * (1 - self.b + self.b * lengths / average_length)
+                ids_parts.append(ids)
+                score_parts.append(idf * frequencies * (self.k1 + 1) / (frequencies + norms))
+        if not ids_parts:
+            return []
+
+        # Cumul des scores par souvenir: tableau dense indexé par id si les listes
+        # parcourues sont longues, tri des ids sinon
+        ids = np.concatenate(ids_parts)
+        weights = np.concatenate(score_parts)
+        if len(ids) == 0:
+            return []
+        if 8 * len(ids) >= len(self.lengths) and ids.max() < len(self.lengths):
+            scores = np.bincount(ids, weights=weights, minlength=len(self.lengths))
+            unique_ids = np.flatnonzero(scores)
+            scores = scores[unique_ids]
+        else:
+            unique_ids, inverse = np.unique(ids, return_inverse=True)
+            scores = np.bincount(inverse, weights=weights)
+        k = min(top_k, len(unique_ids))
+        best = np.argpartition(-scores, k - 1)[:k] if k < len(unique_ids) else np.arange(len(unique_ids))
+        best = best[np.argsort(-scores[best], kind='stable')]
+        return [(int(unique_ids[i]), float(scores[i])) for i in best]
+
+    def get_state(self):
+        """État sauvegardable de l'index (listes purgées des entrées périmées)"""
+        postings = {}
+        for term in self.postings:
+            ids, frequencies = self._arrays(term)
+            postings[term] = (ids, frequencies.astype(np.int32))
+        return {'postings': postings}
+
+    def set_state(self, state):
+        """Restaure un état produit par get_state"""
+        self.clear()
+        postings = state['postings']
+        size = max(max((int(ids.max()) + 1 for ids, _ in postings.values() if len(ids)), default=0),
+                   len(self.lengths))
+        self.lengths = np.zeros(size, dtype=np.float32)
+        self.generations = np.ones(size, dtype=np.int32)
+        for term, (ids, frequencies) in postings.items():
+            self.lengths[ids] += frequencies
+            self.postings[term] = [ids.tolist(), frequencies.tolist(), [1] * len(ids), None, 0]
+            self.document_frequency[term] = len(ids)
+        self.total_length = int(self.lengths.sum())
+
+        # Mots de chaque souvenir: entrées de toutes les listes regroupées par id
+        if postings:
+            names = np.empty(len(postings), dtype=object)
+            names[:] = list(postings)
+            ids = np.concatenate([ids for ids, _ in postings.values()])
+            term_of = np.repeat(np.arange(len(postings)), [len(ids) for ids, _ in postings.values()])
+            order = np.argsort(ids, kind='stable')
+            ids, term_of = ids[order], names[term_of[order]]
+            memory_ids, starts = np.unique(ids, return_index=True)
+            term_of, bounds = term_of.tolist(), starts.tolist() + [len(ids)]
+            self.terms = {memory_id: tuple(term_of[bounds[i]:bounds[i + 1]])
+                          for i, memory_id in enumerate(memory_ids.tolist())}
+
+    def clear(self):
+        self.postings = {}
+        self.document_frequency = Counter()
+        self.terms = {}
+        self.lengths[:] = 0
+        self.generations[:] = 0
+        self.total_length = 0
@@ -4,12 +4,20 @@ import numpy as np
 import torch
 from datetime import datetime
 import argparse
+from collections import OrderedDict
 
 from neural_network import NeuralCore
 from memory_system import MemorySystem
 from learning_system import LearningSystem
 from web_explorer import WebExplorer
 from dataset_importer import DatasetImporter
+from research_queue import ResearchQueue
+from status_monitor import StatusMonitor
+from memory_visualizer import MemoryVisualizer
+from vocabulary import Vocabulary
+from tokenizer import tokenize
+from metrics import REGISTRY, CACHE_REQUESTS, time_stage, timed
+from profiling import PROFILER, Profiler
 import web_interface
 
 class BabyBrain:
@@ -18,6 +26,12 @@ class BabyBrain:
     et coordonne leur fonctionnement.
     """
     
+    # Types de souvenirs dont le texte peut servir à composer une réponse
+    RESPONSE_MEMORY_TYPES = ('interaction', 'exploration', 'web_content', 'web_content_fallback',
+                             'paragraph', 'sentence', 'conversation', 'subtitle')
+    
+    RESEARCH_FAILED_MESSAGE = "Malheureusement, je n'ai pas pu trouver d'informations pertinentes."
+    
     def __init__(self):
         """Initialise le cerveau artificiel avec tous ses composants"""
         print("Initialisation du cerveau artificiel...")
@@ -60,43 +74,153 @@ class BabyBrain:
         # Historique des interactions
         self.interaction_history = []
         
-        # Vocabulaire pour l'encodage/décodage du texte
-        self.vocabulary = {}
-        self.reverse_vocabulary = {}
-        self.next_word_id = 1  # 0 est réservé pour les mots inconnus
+        # Vocabulaire (ids stables) et encodages des derniers textes: l'encodage
+        # d'un texte ne dépend pas du vocabulaire et peut donc être réutilisé
+        self.vocabulary = Vocabulary()
+        self.text_encodings = OrderedDict()
+        self.text_encodings_size = 1024
+        
+        # Nombre de souvenirs candidats examinés pour composer une réponse
+        self.response_pool_size = 20
+        
+        # Recherches sur internet exécutées en arrière-plan
+        self.research_queue = ResearchQueue()
+        
+        # Statistiques mises en cache pour l'interface (recollectées seulement si l'état change)
+        self.status_monitor = StatusMonitor(self.get_status_stats)
+        self.research_queue.on_change = self.status_monitor.notify
+        
+        # Images du réseau de mémoire rendues en arrière-plan
+        self.memory_visualizer = MemoryVisualizer(self.memory_system)
+        
+        # Jauges exportées sur /metrics
+        self._register_metrics()
         
         print("Cerveau artificiel initialisé et prêt à apprendre !")
     
+    def _register_metrics(self):
+        """Déclare les jauges lues à chaque export des métriques"""
+        gauges = [
+            ('baby_brain_ltm_size', "Souvenirs en mémoire à long terme",
+             lambda: len(self.memory_system.ltm_network)),
+            ('baby_brain_stm_size', "Souvenirs en mémoire à court terme",
+             lambda: len(self.memory_system.stm_buffer)),
+            ('baby_brain_ltm_edges', "Liens du réseau de mémoire à long terme",
+             lambda: self.memory_system.ltm_network.number_of_edges()),
+            ('baby_brain_cold_size', "Souvenirs du niveau froid (SQLite) de la mémoire à long terme",
+             lambda: len(self.memory_system.cold_storage) if self.memory_system.cold_storage else 0),
+            ('baby_brain_hidden_layer_size', "Taille de la couche cachée du réseau neuronal",
+             lambda: self.neural_core.hidden_layer.out_features),
+            ('baby_brain_url_queue_size', "URLs en attente d'exploration",
+             lambda: len(self.web_explorer.url_queue)),
+            ('baby_brain_research_queue_size', "Recherches web en attente ou en cours",
+             lambda: self.research_queue.counts['pending'] + self.research_queue.counts['running']),
+        ]
+        for name, documentation, function in gauges:
+            REGISTRY.gauge(name, documentation).set_function(function)
+    
+    def get_status_stats(self):
+        """Statistiques courantes du cerveau artificiel"""
+        stats = {
+            'neural_network': {
+                'experience_counter': self.neural_core.experience_counter,
+                'learning_rate': self.neural_core.learning_rate,
+                'curiosity_factor': self.neural_core.curiosity_factor
+            },
+            'memory': {
+                'stm_size': len(self.memory_system.stm_buffer),
+                'ltm_size': len(self.memory_system.ltm_network),
+                'ltm_capacity': self.memory_system.ltm_capacity,
+                'evicted_memories': self.memory_system.eviction_stats['evicted'],
+                'cold_size': len(self.memory_system.cold_storage) if self.memory_system.cold_storage else 0,
+                'total_memories': self.memory_system.memory_counter
+            },
+            'learning': {
+                'exploration_rate': self.learning_system.exploration_rate,
+                'total_experiences': self.learning_system.total_experiences,
+                'concepts_count': len(self.learning_system.concepts)
+            }
+        }
+        
+        if hasattr(self, 'web_explorer'):
+            stats['web_explorer'] = self.web_explorer.get_exploration_stats()
+        
+        stats['research'] = self.research_queue.stats()
+        
+        return stats
+    
     def _update_vocabulary(self, text):
-        """Met à jour le vocabulaire avec de nouveaux mots"""
-        words = text.lower().split()
-        for word in words:
-            if word not in self.vocabulary:
-                self.vocabulary[word] = self.next_word_id
-                self.reverse_vocabulary[self.next_word_id] = word
-                self.next_word_id += 1
+        """Met à jour le vocabulaire avec les mots d'un texte (chaîne ou TokenizedText)"""
+        tokenized = tokenize(text)
+        self.vocabulary.update(tokenized.tokens)
+        return tokenized
     
     def _encode_text(self, text):
-        """Encode un texte en vecteur pour le réseau neuronal"""
+        """
+        Encode un texte (chaîne ou TokenizedText) en vecteur pour le réseau neuronal
+        Chaque mot est représenté par une valeur de hachage stable: un même
+        texte a toujours le même encodage, quelle que soit la taille du vocabulaire
+        """
         # Mise à jour du vocabulaire
-        self._update_vocabulary(text)
+        tokenized = self._update_vocabulary(text)
+        text = tokenized.text
+        
+        encoding = self.text_encodings.get(text)
+        if encoding is not None:
+            self.text_encodings.move_to_end(text)
+            CACHE_REQUESTS.inc(cache='text_encoding', result='hit')
+            return encoding.copy()
+        CACHE_REQUESTS.inc(cache='text_encoding', result='miss')
         
         # Encodage très simple du texte
-        words = text.lower().split()
+        words = tokenized.tokens
         encoding = np.zeros(self.input_size)
         
         for i, word in enumerate(words[:self.input_size]):
-            word_id = self.vocabulary.get(word, 0)  # 0 pour les mots inconnus
             # Utilisation de positions dans le vecteur pour représenter les mots
             position = i % self.input_size
-            encoding[position] = word_id / self.next_word_id  # Normalisation
-            
-        return encoding
+            encoding[position] = Vocabulary.hash_value(word)
+        
+        self.text_encodings[text] = encoding
+        if len(self.text_encodings) > self.text_encodings_size:
+            self.text_encodings.popitem(last=False)
+        return encoding.copy()
     
-    def _create_response(self, output_vector, query=None):
-        """Crée une réponse textuelle à partir d'un vecteur de sortie"""
+    def _response_fragments(self, output_vector, max_fragments=5):
+        """
+        Sélectionne les fragments de texte utilisables pour une réponse
+        La recherche ne porte que sur les partitions de souvenirs textuels de
+        l'index et exploite les champs décodés à l'insertion
+        """
+        candidates = self.memory_system.retrieve_candidates(
+            output_vector,
+            top_k=self.response_pool_size,
+            types=self.RESPONSE_MEMORY_TYPES)
+        
+        fragments = []
+        for memory, _ in candidates:
+            text = memory.get('text')
+            if text is None:
+                continue
+            # Les contenus non structurés doivent être substantiels
+            if memory.get('fields') is None and len(text) <= 20:
+                continue
+            fragments.append(text)
+            if len(fragments) == max_fragments:
+                break
+        return fragments
+    
+    def _answers_from_memory(self):
+        """Les réponses ne s'appuient sur les souvenirs qu'après les premières expériences"""
+        return self.neural_core.experience_counter >= 10
+    
+    def _create_response(self, output_vector, query=None, response_fragments=None):
+        """
+        Crée une réponse textuelle à partir d'un vecteur de sortie
+        - response_fragments: fragments de souvenirs déjà sélectionnés (sinon recherchés)
+        """
         # Au début, les réponses seront aléatoires et simples
-        if self.neural_core.experience_counter < 10:
+        if not self._answers_from_memory():
             responses = [
                 "Je suis en train d'apprendre.",
                 "C'est nouveau pour moi.",
@@ -106,24 +230,9 @@ class BabyBrain:
             ]
             return np.random.choice(responses), False
         
-        # Recherche des souvenirs similaires
-        memories = self.memory_system.retrieve_memory(output_vector, top_k=5)
-        
-        # S'il y a des souvenirs pertinents avec des réponses, les utilise
-        response_fragments = []
-        
-        for memory in memories:
-            try:
-                # Tente de parser le contenu du souvenir
-                if isinstance(memory['content'], str) and memory['content'].startswith('{'):
-                    memory_data = json.loads(memory['content'])
-                    if 'input' in memory_data and isinstance(memory_data['input'], str):
-                        response_fragments.append(memory_data['input'])
-                elif isinstance(memory['content'], str) and len(memory['content']) > 20:
-                    # Ajoute aussi les contenus textuels substantiels
-                    response_fragments.append(memory['content'])
-            except:
-                pass
+        # Fragments de texte issus des souvenirs les plus proches
+        if response_fragments is None:
+            response_fragments = self._response_fragments(output_vector)
         
         # Si des fragments ont été extraits, crée une réponse basée sur eux
         if response_fragments:
@@ -163,80 +272,151 @@ class BabyBrain:
         Traite un message entrant, apprend de celui-ci et génère une réponse
         - message: texte du message
         - is_positive: indique si le message doit être considéré comme positif
+        La recherche sur internet éventuelle est attendue avant de répondre
+        """
+        response, _ = self._process_message(message, is_positive, background_research=False)
+        return response
+    
+    def process_message_async(self, message, is_positive=True):
         """
+        Comme process_message, mais sans attendre la recherche sur internet:
+        retourne (réponse, id de la recherche en arrière-plan ou None)
+        Le résultat de la recherche est ensuite disponible dans research_queue
+        """
+        return self._process_message(message, is_positive, background_research=True)
+    
+    def process_message_stages(self, message, is_positive=True):
+        """
+        Traite un message étape par étape, sans attendre la recherche sur internet
+        Générateur de couples (étape, données), dans l'ordre:
+        - 'learning': apprentissage terminé (perte)
+        - 'memories': fragments de souvenirs retenus pour la réponse
+        - 'response': réponse générée et id de la recherche en arrière-plan éventuelle
+        """
+        return self._message_stages(message, is_positive, background_research=True)
+    
+    def _process_message(self, message, is_positive, background_research):
+        """Traite un message et retourne (réponse, id de recherche ou None)"""
+        for stage, data in self._message_stages(message, is_positive, background_research):
+            if stage == 'response':
+                return data['response'], data['research_job']
+    
+    def _message_stages(self, message, is_positive, background_research):
+        """Étapes du traitement d'un message (voir process_message_stages)"""
+        research_job = None
         try:
-            # Encode le message
-            input_vector = self._encode_text(message)
+            # Encode le message (découpé une seule fois pour toutes les étapes)
+            with time_stage('encode'):
+                tokenized = tokenize(message)
+                input_vector = self._encode_text(tokenized)
             
             try:
                 # Apprentissage
-                output_vector, loss = self.learning_system.learn_from_interaction(
-                    input_vector, message, is_positive)
+                with time_stage('learn'):
+                    output_vector, loss = self.learning_system.learn_from_interaction(
+                        input_vector, message, is_positive)
             except Exception as e:
                 print(f"Erreur lors de l'apprentissage: {str(e)}")
                 # En cas d'erreur, utilise un vecteur aléatoire pour générer une réponse
                 output_vector = np.random.randn(self.output_size)
                 loss = 0
             
+            yield 'learning', {'loss': float(loss)}
+            
+            # Enregistrement de l'interaction (la réponse est complétée ci-dessous)
+            interaction = {
+                'input': message,
+                'output': None,
+                'is_positive': is_positive,
+                'timestamp': datetime.now().isoformat()
+            }
+            
             # Génération de réponse
             try:
-                response, needs_web_search = self._create_response(output_vector, query=message)
+                # Pas de recherche tant que la réponse n'utiliserait pas les souvenirs
+                # (None: _create_response recherche elle-même si cela change entre-temps)
+                response_fragments = self._response_fragments(output_vector) if self._answers_from_memory() else None
+                yield 'memories', {'fragments': response_fragments or []}
+                
+                with time_stage('respond'):
+                    response, needs_web_search = self._create_response(
+                        output_vector, query=message, response_fragments=response_fragments)
                 
                 # Si le cerveau ne connaît pas la réponse, recherche sur internet
                 if needs_web_search and hasattr(self, 'web_explorer'):
-                    print(f"Recherche sur internet pour: {message}")
-                    
-                    # Ajoute une URL spécifique à la recherche si le message semble être une question
-                    if message.endswith('?') or message.lower().startswith('comment') or \
-                       message.lower().startswith('qu') or message.lower().startswith('pourquoi'):
-                        search_url = f"https://fr.wikipedia.org/wiki/Special:Search?search={message.replace(' ', '+')}"
-                        self.web_explorer.add_url_to_explore(search_url)
-                    
-                    # Explorer quelques pages en passant la requête
-                    pages_explored = self.web_explorer.explore_web(max_pages=2, query=message)
-                    
-                    if pages_explored > 0:
-                        # Tente de générer une nouvelle réponse après exploration
-                        post_search_response, _ = self._create_response(output_vector)
-                        response = f"J'ai exploré {pages_explored} pages sur internet. Voici ce que j'ai trouvé : {post_search_response}"
+                    if background_research:
+                        # La réponse part tout de suite, la recherche continue en arrière-plan
+                        research_job = self.research_queue.submit(
+                            message,
+                            lambda: self._background_research(message, output_vector, interaction))
+                        interaction['research_job'] = research_job
                     else:
-                        response += " Malheureusement, je n'ai pas pu trouver d'informations pertinentes."
+                        result = self._web_research(message, output_vector)
+                        response = result['response'] or response + " " + self.RESEARCH_FAILED_MESSAGE
             except Exception as e:
                 print(f"Erreur lors de la génération de réponse: {str(e)}")
                 response = "Je suis désolé, j'ai du mal à formuler une réponse. Je continue à apprendre."
             
-            # Enregistrement de l'interaction
-            self.interaction_history.append({
-                'input': message,
-                'output': response,
-                'is_positive': is_positive,
-                'timestamp': datetime.now().isoformat()
-            })
-            
-            return response
+            interaction['output'] = response
+            self.interaction_history.append(interaction)
+            self.status_monitor.notify()
         except Exception as e:
             print(f"Erreur générale dans process_message: {str(e)}")
-            return "Désolé, une erreur s'est produite dans mon traitement. Je suis encore en apprentissage."
+            response = "Désolé, une erreur s'est produite dans mon traitement. Je suis encore en apprentissage."
+        
+        yield 'response', {'response': response, 'research_job': research_job}
+    
+    def _web_research(self, message, output_vector):
+        """
+        Recherche sur internet la réponse à un message inconnu
+        Retourne {'pages_explored', 'response'}; la réponse est None si rien n'a été trouvé
+        """
+        print(f"Recherche sur internet pour: {message}")
+        
+        # Ajoute une URL spécifique à la recherche si le message semble être une question
+        if message.endswith('?') or message.lower().startswith('comment') or \
+           message.lower().startswith('qu') or message.lower().startswith('pourquoi'):
+            search_url = f"https://fr.wikipedia.org/wiki/Special:Search?search={message.replace(' ', '+')}"
+            self.web_explorer.add_url_to_explore(search_url)
+        
+        # Explorer quelques pages en passant la requête
+        pages_explored = self.web_explorer.explore_web(max_pages=2, query=message)
+        
+        if pages_explored > 0:
+            # Tente de générer une nouvelle réponse après exploration
+            post_search_response, _ = self._create_response(output_vector)
+            response = f"J'ai exploré {pages_explored} pages sur internet. Voici ce que j'ai trouvé : {post_search_response}"
+        else:
+            response = None
+        
+        return {'pages_explored': pages_explored, 'response': response}
+    
+    def _background_research(self, message, output_vector, interaction):
+        """Recherche exécutée par research_queue; complète l'interaction d'origine"""
+        result = self._web_research(message, output_vector)
+        if result['response'] is None:
+            result['response'] = self.RESEARCH_FAILED_MESSAGE
+        interaction['research_response'] = result['response']
+        return result
     
+    @timed('save')
     def save(self):
         """Sauvegarde l'état complet du cerveau artificiel"""
         # Assure que le dossier existe
         os.makedirs('data', exist_ok=True)
         
-        # Sauvegarde de chaque composant
-        self.neural_core.save_brain('data/brain_state.pt')
-        self.memory_system.save_memory_system('data/memory_system.pkl')
-        self.learning_system.save_learning_state('data/learning_state.json')
+        # Sauvegarde de chaque composant (sans apprentissage en cours: le réseau
+        # neuronal et l'état d'apprentissage restent cohérents entre eux)
+        with self.learning_system.lock:
+            self.neural_core.save_brain('data/brain_state.pt')
+            self.memory_system.save_memory_system('data/memory_system.pkl')
+            self.learning_system.save_learning_state('data/learning_state.json')
         
         if hasattr(self, 'web_explorer'):
             self.web_explorer.save_explorer_state('data/explorer_state.json')
         
-        # Sauvegarde du vocabulaire
-        with open('data/vocabulary.json', 'w') as f:
-            json.dump({
-                'vocabulary': self.vocabulary,
-                'next_word_id': self.next_word_id
-            }, f, indent=2)
+        # Sauvegarde du vocabulaire (format binaire)
+        self.vocabulary.save('data/vocabulary.bin')
         
         # Sauvegarde de l'historique des interactions
         with open('data/interaction_history.json', 'w') as f:
@@ -248,38 +428,39 @@ class BabyBrain:
         """Charge l'état du cerveau artificiel depuis les fichiers sauvegardés"""
         success = True
         
-        # Charge le réseau neuronal
-        if os.path.exists('data/brain_state.pt'):
-            success &= self.neural_core.load_brain('data/brain_state.pt')
-        else:
-            success = False
-            
-        # Charge le système de mémoire
-        if os.path.exists('data/memory_system.pkl'):
-            success &= self.memory_system.load_memory_system('data/memory_system.pkl')
-        else:
-            success = False
-            
-        # Charge le système d'apprentissage
-        if os.path.exists('data/learning_state.json'):
-            success &= self.learning_system.load_learning_state('data/learning_state.json')
-        else:
-            success = False
+        with self.learning_system.lock:
+            # Charge le réseau neuronal
+            if os.path.exists('data/brain_state.pt'):
+                success &= self.neural_core.load_brain('data/brain_state.pt')
+            else:
+                success = False
+                
+            # Charge le système de mémoire
+            if os.path.exists('data/memory_system.pkl'):
+                success &= self.memory_system.load_memory_system('data/memory_system.pkl')
+            else:
+                success = False
+                
+            # Charge le système d'apprentissage
+            if os.path.exists('data/learning_state.json'):
+                success &= self.learning_system.load_learning_state('data/learning_state.json')
+            else:
+                success = False
             
         # Charge l'explorateur web
         if hasattr(self, 'web_explorer') and os.path.exists('data/explorer_state.json'):
             success &= self.web_explorer.load_explorer_state('data/explorer_state.json')
             
-        # Charge le vocabulaire
-        if os.path.exists('data/vocabulary.json'):
-            with open('data/vocabulary.json', 'r') as f:
-                vocab_data = json.load(f)
-                self.vocabulary = vocab_data['vocabulary']
-                self.next_word_id = vocab_data['next_word_id']
-                
-                # Reconstitue le vocabulaire inverse
-                self.reverse_vocabulary = {v: k for k, v in self.vocabulary.items()}
-        else:
+        # Charge le vocabulaire (ou l'ancien format JSON, converti à la prochaine sauvegarde)
+        try:
+            if os.path.exists('data/vocabulary.bin'):
+                self.vocabulary.load('data/vocabulary.bin')
+            elif os.path.exists('data/vocabulary.json'):
+                self.vocabulary.load_json('data/vocabulary.json')
+            else:
+                success = False
+        except Exception as e:
+            print(f"Erreur lors du chargement du vocabulaire: {str(e)}")
             success = False
             
         # Charge l'historique des interactions
@@ -296,19 +477,26 @@ class BabyBrain:
             
         return success
     
-    def import_datasets(self, max_entries=300):
-        """Importe des jeux de données de conversations pour pré-alimenter la mémoire"""
+    def import_datasets(self, max_entries=300, workers=1):
+        """
+        Importe des jeux de données de conversations pour pré-alimenter la mémoire
+        - workers: nombre de processus utilisés pour découper et encoder les textes
+        """
         print("\nDémarrage de l'importation des jeux de données...")
         
         # Initialise l'importateur de données
         importer = DatasetImporter(self.memory_system, self.learning_system)
         
+        # Sauvegarde du cerveau à chaque point de reprise de l'import
+        importer.checkpoint_callback = self.save
+        
         # Affiche les datasets disponibles
         importer.list_available_datasets()
         
         # Importe plusieurs jeux de données
         try:
-            total_imported = importer.import_multiple_datasets(max_entries_per_dataset=max_entries)
+            total_imported = importer.import_multiple_datasets(max_entries_per_dataset=max_entries,
+                                                              workers=workers)
             print(f"\nImportation terminée avec succès: {total_imported} éléments ajoutés à la mémoire")
             return total_imported
         except Exception as e:
@@ -325,11 +513,41 @@ if __name__ == "__main__":
                       help='Importer des jeux de données pour pré-alimenter la mémoire')
     parser.add_argument('--max-entries', type=int, default=200,
                       help='Nombre maximum d\'entrées à importer par dataset')
+    parser.add_argument('--workers', type=int, default=1,
+                      help='Nombre de processus pour l\'importation parallèle des datasets')
+    parser.add_argument('--profile', choices=Profiler.MODES,
+                      help='Profile tout l\'import (--import) avec cProfile ou par échantillonnage, dans data/profiles/')
+    parser.add_argument('--profile-requests', type=int, default=0,
+                      help='Profile les N premières interactions de l\'interface web')
+    parser.add_argument('--time-methods', action='store_true',
+                      help='Mesure la durée des principales méthodes des composants (exportée sur /metrics)')
+    parser.add_argument('--ltm-capacity', type=int, default=0,
+                      help='Nombre maximum de souvenirs à long terme (0: illimité); les moins utiles sont oubliés')
+    parser.add_argument('--no-ltm-archive', action='store_true',
+                      help='N\'archive pas les souvenirs oubliés dans data/ltm_archive.jsonl')
+    parser.add_argument('--cold-storage', action='store_true',
+                      help='Range les souvenirs évincés (--ltm-capacity) dans data/cold_memories.db, '
+                           'où la recherche les retrouve, au lieu de les archiver')
+    parser.add_argument('--retrieval-cache-size', type=int, default=256,
+                      help='Nombre de recherches de souvenirs gardées en cache (0: désactivé)')
     args = parser.parse_args()
     
+    # Profilage
+    PROFILER.method_timing = args.time_methods
+    if args.profile_requests:
+        PROFILER.arm(args.profile_requests, mode=args.profile or 'cprofile')
+    
     # Création du cerveau
     brain = BabyBrain()
     
+    # Capacité de la mémoire à long terme et niveau froid
+    if args.ltm_capacity > 0:
+        brain.memory_system.ltm_capacity = args.ltm_capacity
+        brain.memory_system.archive_path = None if args.no_ltm_archive else 'data/ltm_archive.jsonl'
+    if args.cold_storage:
+        brain.memory_system.enable_cold_storage('data/cold_memories.db')
+    brain.memory_system.retrieval_cache_size = args.retrieval_cache_size
+    
     # Tente de charger un cerveau existant
     if os.path.exists('data/brain_state.pt'):
         print("Cerveau existant détecté, chargement en cours...")
@@ -337,10 +555,19 @@ if __name__ == "__main__":
     else:
         print("Aucun cerveau existant trouvé, création d'un nouveau cerveau...")
     
+    if args.ltm_capacity > 0:
+        evicted = brain.memory_system.enforce_ltm_capacity()
+        if evicted:
+            print(f"{evicted} souvenirs oubliés pour respecter la capacité de la mémoire à long terme")
+    
     # Import des datasets si demandé
     if args.import_datasets:
         print("Pré-alimentation du cerveau avec des datasets...") 
-        imported_count = brain.import_datasets(max_entries=args.max_entries)
+        if args.profile:
+            with PROFILER.session('import', mode=args.profile):
+                imported_count = brain.import_datasets(max_entries=args.max_entries, workers=args.workers)
+        else:
+            imported_count = brain.import_datasets(max_entries=args.max_entries, workers=args.workers)
         
         # Force la consolidation des mémoires à court terme vers la mémoire à long terme
         if imported_count > 0:
@@ -351,6 +578,9 @@ if __name__ == "__main__":
         # Sauvegarde après importation
         brain.save()
     
+    # Chargement, oubli et import ont modifié les statistiques
+    brain.status_monitor.notify()
+    
     # Affichage de l'adresse d'accès
     print(f"\nDémarrage de l'interface web sur http://{args.host}:{args.port}")
     print("Utilisez Ctrl+C pour arrêter le serveur\n")
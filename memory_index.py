@@ -0,0 +1,148 @@
+import numpy as np
+
+class MemoryIndex:
+    """
+    Index vectoriel des souvenirs (court et long terme).
+    Les encodages sont rangés dans une matrice contiguë pour qu'une recherche
+    se résume à un produit matrice-vecteur, et les lignes sont réparties par
+    type de souvenir (partitions précalculées) pour filtrer sans parcourir
+    toute la mémoire.
+    """
+
+    def __init__(self, encoding_size, initial_capacity=1024):
+        self.encoding_size = encoding_size
+        self.matrix = np.zeros((initial_capacity, encoding_size))
+        self.ids = np.zeros(initial_capacity, dtype=np.int64)
+        self.valid = np.zeros(initial_capacity, dtype=bool)
+        self.size = 0  # Nombre de lignes utilisées (y compris supprimées)
+        self.removed = 0
+
+        self.row_of = {}  # id du souvenir -> ligne
+        self.memories = {}  # id du souvenir -> objet mémoire
+        self.partitions = {}  # type -> lignes
+        self._partition_arrays = {}  # Cache numpy des partitions
+
+    @staticmethod
+    def memory_type(memory):
+        """Type d'un souvenir, utilisé pour le partitionnement"""
+        return (memory.get('metadata') or {}).get('type', 'unknown')
+
+    def __len__(self):
+        return len(self.row_of)
+
+    def __contains__(self, memory_id):
+        return memory_id in self.row_of
+
+    def _grow(self):
+        """Double la capacité de la matrice"""
+        capacity = max(1, 2 * len(self.ids))
+        matrix = np.zeros((capacity, self.encoding_size))
+        matrix[:self.size] = self.matrix[:self.size]
+        ids = np.zeros(capacity, dtype=np.int64)
+        ids[:self.size] = self.ids[:self.size]
+        valid = np.zeros(capacity, dtype=bool)
+        valid[:self.size] = self.valid[:self.size]
+        self.matrix, self.ids, self.valid = matrix, ids, valid
+
+    def add(self, memory):
+        """Ajoute (ou remplace) un souvenir dans l'index"""
+        memory_id = memory['id']
+        if memory_id in self.row_of:
+            self.remove(memory_id)
+        if self.size == len(self.ids):
+            self._grow()
+
+        row = self.size
+        self.size += 1
+        self.matrix[row] = memory['encoding']
+        self.ids[row] = memory_id
+        self.valid[row] = True
+        self.row_of[memory_id] = row
+        self.memories[memory_id] = memory
+
+        memory_type = self.memory_type(memory)
+        self.partitions.setdefault(memory_type, []).append(row)
+        self._partition_arrays.pop(memory_type, None)
+
+    def update_reference(self, memory):
+        """Fait pointer l'index vers un autre objet pour le même souvenir (ex: nœud LTM)"""
+        if memory['id'] in self.memories:
+            self.memories[memory['id']] = memory
+
+    def get(self, memory_id):
+        return self.memories.get(memory_id)
+
+    def remove(self, memory_id):
+        """Retire un souvenir de l'index (la ligne est libérée au compactage)"""
+        row = self.row_of.pop(memory_id, None)
+        if row is None:
+            return
+        del self.memories[memory_id]
+        self.valid[row] = False
+        self.removed += 1
+        if self.removed > 1024 and self.removed > self.size // 2:
+            self._compact()
+
+    def _compact(self):
+        """Reconstruit l'index sans les lignes supprimées"""
+        memories = [self.memories[int(self.ids[row])] for row in range(self.size) if self.valid[row]]
+        self.clear()
+        for memory in memories:
+            self.add(memory)
+
+    def clear(self):
+        """Vide l'index"""
+        self.size = 0
+        self.removed = 0
+        self.valid[:] = False
+        self.row_of = {}
+        self.memories = {}
+        self.partitions = {}
+        self._partition_arrays = {}
+
+    def _partition_rows(self, memory_type):
+        rows = self._partition_arrays.get(memory_type)
+        if rows is None:
+            rows = np.array(self.partitions.get(memory_type, []), dtype=np.int64)
+            self._partition_arrays[memory_type] = rows
+        return rows
+
+    def _candidate_rows(self, types=None):
+        """Lignes valides, éventuellement restreintes à certains types"""
+        if types is None:
+            return np.nonzero(self.valid[:self.size])[0]
+        rows = [self._partition_rows(t) for t in types if t in self.partitions]
+        if not rows:
+            return np.zeros(0, dtype=np.int64)
+        rows = np.concatenate(rows)
+        return rows[self.valid[rows]]
+
+    def search(self, query_encoding, top_k=3, types=None):
+        """
+        Retourne les top_k couples (souvenir, similarité) les plus proches
+        - types: ne chercher que parmi ces types de souvenirs
+        """
+        if types is None:
+            # Produit sur une vue de la matrice (sans copie), lignes supprimées écartées ensuite
+            if len(self.row_of) == 0 or top_k <= 0:
+                return []
+            size = self.size  # Lue une seule fois: la matrice et le masque doivent avoir la même taille
+            similarities = self.matrix[:size] @ query_encoding
+            rows = np.arange(size)
+            if self.removed:
+                valid = self.valid[:size]
+                rows, similarities = rows[valid], similarities[valid]
+        else:
+            rows = self._candidate_rows(types)
+            if rows.size == 0 or top_k <= 0:
+                return []
+            similarities = self.matrix[rows] @ query_encoding
+
+        k = min(top_k, rows.size)
+        if k < rows.size:
+            best = np.argpartition(-similarities, k - 1)[:k]
+        else:
+            best = np.arange(rows.size)
+        best = best[np.argsort(-similarities[best], kind='stable')]
+
+        return [(self.memories[int(self.ids[rows[i]])], float(similarities[i])) for i in best]
@@ -4,13 +4,39 @@ import networkx as nx
 import json
 import os
 import pickle
+import heapq
+import hashlib
+import threading
+import functools
 from datetime import datetime
 # Configurer Matplotlib pour utiliser un backend non-interactif
 import matplotlib
 matplotlib.use('Agg')  # Agg est un backend non-GUI
 import matplotlib.pyplot as plt
-from collections import defaultdict, deque
+from collections import Counter, defaultdict, deque, OrderedDict
 
+from cold_storage import ColdStorage
+from dedup_index import SimHashIndex
+from graph_layout import GraphLayout
+from lexical_index import LexicalIndex
+from memory_index import MemoryIndex
+from metrics import (timed, MEMORIES_ADDED, MEMORIES_MERGED, MEMORIES_CONSOLIDATED,
+                     MEMORIES_EVICTED, MEMORY_EDGES_CREATED, CACHE_REQUESTS)
+from profiling import timed_methods
+from spreading_activation import SpreadingActivation
+from tokenizer import tokenize, TokenizedText
+
+def synchronized(method):
+    """Exécute la méthode en tenant le verrou de l'objet (self.lock)"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
+@timed_methods('add_memory', 'add_memories', 'consolidate_memories', 'evict_memories',
+               'enforce_ltm_capacity', 'retrieve_memory', 'retrieve_candidates', 'graph_snapshot',
+               'graph_data', 'visualize_memory_network', 'save_memory_system', 'load_memory_system')
 class MemorySystem:
     """
     Système de mémoire pour stocker et récupérer des informations.
@@ -21,6 +47,10 @@ class MemorySystem:
     """
     
     def __init__(self, stm_capacity=50, encoding_size=100):
+        # Verrou des souvenirs et des index: les requêtes web et les recherches en
+        # arrière-plan lisent et modifient la mémoire depuis des threads différents
+        self.lock = threading.RLock()
+        
         # Mémoire à court terme (Short-Term Memory)
         self.stm_capacity = stm_capacity
         self.stm_buffer = deque(maxlen=stm_capacity)
@@ -37,10 +67,60 @@ class MemorySystem:
         # Cache pour les encodages de mots
         self.word_encodings = {}
         
+        # Détection des quasi-doublons avant insertion
+        self.deduplicate = True
+        self.dedup_index = SimHashIndex(max_distance=3)
+        self.dedup_importance_boost = 0.05  # Gain d'importance d'un souvenir revu
+        self.dedup_stats = {'checked': 0, 'duplicates': 0}
+        
+        # Index vectoriel (matrice d'encodages partitionnée par type)
+        self.memory_index = MemoryIndex(encoding_size)
+        
+        # Index inversé des mots (BM25), tenu à jour avec l'index vectoriel
+        self.lexical_index = LexicalIndex()
+        self.hybrid_rank_constant = 60  # Constante de la fusion des rangs (mode 'hybrid')
+        
+        # Version du réseau à long terme (incrémentée à chaque modification
+        # visible: nœud, lien ou importance) et positions des nœuds visualisés.
+        # edge_version ne suit que les nœuds et les liens (matrice de propagation)
+        self.graph_version = 0
+        self.edge_version = 0
+        self.graph_layout = GraphLayout()
+        
+        # Capacité de la mémoire à long terme (None: illimitée). Au-delà, les
+        # souvenirs au score le plus faible sont oubliés par lots et, si
+        # archive_path est défini, ajoutés à un fichier d'archive (JSON Lines)
+        self.ltm_capacity = None
+        self.eviction_batch = 0.1  # Part de la capacité libérée à chaque éviction
+        self.eviction_weights = {'importance': 0.4, 'access': 0.2, 'recency': 0.3, 'degree': 0.1}
+        self.recency_half_life = 30.0  # Jours au bout desquels le score de récence est divisé par 2
+        self.archive_path = None
+        self.eviction_stats = {'evicted': 0, 'archived': 0, 'demoted': 0, 'promoted': 0}
+        
+        # Niveau froid (base SQLite, voir enable_cold_storage): quand il est actif,
+        # les souvenirs évincés y sont rangés au lieu d'être archivés et restent
+        # accessibles à la recherche, qui les remet en mémoire vive
+        self.cold_storage = None
+        
+        # Recherche par propagation d'activation dans le réseau à long terme
+        self.spreading_activation = SpreadingActivation()
+        self.activation_seeds = 10  # Nombre de souvenirs (cosinus) servant de graines
+        
+        # Résultats des dernières recherches (LRU, 0: désactivé). Une entrée n'est
+        # valable que pour la version du stock de souvenirs qui l'a produite: la
+        # version est incrémentée à chaque ajout, consolidation, oubli ou promotion.
+        # Consultation, recherche et mise en cache se font sous le verrou de la mémoire
+        self.store_version = 0
+        self.retrieval_cache = OrderedDict()  # clé de la requête -> (version, résultats)
+        self.retrieval_cache_size = 256
+        self.retrieval_cache_stats = {'hits': 0, 'misses': 0}
+        
     def _generate_word_encoding(self, word):
         """Génère un encodage vectoriel simple pour un mot"""
         if word in self.word_encodings:
+            CACHE_REQUESTS.inc(cache='word_encoding', result='hit')
             return self.word_encodings[word]
+        CACHE_REQUESTS.inc(cache='word_encoding', result='miss')
         
         # Une méthode naïve d'encodage basée sur les caractères
         # Dans un système plus avancé, on utiliserait des embeddings
@@ -56,8 +136,11 @@ class MemorySystem:
         self.word_encodings[word] = encoding
         return encoding
     
-    def _encode_memory(self, memory_data):
-        """Encode un souvenir en vecteur"""
+    def _encode_memory(self, memory_data, tokens=None):
+        """
+        Encode un souvenir en vecteur
+        - tokens: mots du texte déjà extraits par le tokenizer partagé
+        """
         # Si c'est déjà un vecteur compatible
         if isinstance(memory_data, np.ndarray) and memory_data.shape[0] == self.encoding_size:
             return memory_data
@@ -65,28 +148,174 @@ class MemorySystem:
         # Si c'est du texte
         if isinstance(memory_data, str):
             # Encodage très simplifié du texte
-            words = memory_data.lower().split()
+            words = tokens if tokens is not None else tokenize(memory_data).tokens
             if not words:
                 return np.zeros(self.encoding_size)
                 
-            encodings = [self._generate_word_encoding(word) for word in words]
-            return np.mean(encodings, axis=0)
+            # Chaque mot distinct n'est cherché qu'une fois, pondéré par son nombre
+            # d'occurrences; les succès du cache sont comptés en un seul incrément
+            # (les échecs par _generate_word_encoding, les répétitions sont des succès)
+            counts = Counter(words)
+            encodings = []
+            hits = len(words)
+            for word in counts:
+                encoding = self.word_encodings.get(word)
+                if encoding is None:
+                    encoding = self._generate_word_encoding(word)
+                    hits -= 1
+                encodings.append(encoding)
+            if hits:
+                CACHE_REQUESTS.inc(hits, cache='word_encoding', result='hit')
+            weights = np.fromiter(counts.values(), dtype=np.float64, count=len(counts))
+            return weights @ np.array(encodings) / len(words)
         
         # Pour d'autres types de données, retourne un vecteur zéro
         return np.zeros(self.encoding_size)
     
-    def add_memory(self, content, metadata=None, importance=0.5):
+    @staticmethod
+    def _extract_fields(content):
+        """
+        Décode une seule fois le contenu structuré (JSON) d'un souvenir
+        Retourne (texte, champs): le texte exploitable pour les réponses et
+        les champs du souvenir (None pour un contenu non structuré)
+        """
+        if not isinstance(content, str):
+            return None, None
+        if not content.startswith('{'):
+            return content, None
+        try:
+            data = json.loads(content)
+        except json.JSONDecodeError:
+            return None, None
+        if not isinstance(data, dict):
+            return None, None
+        return MemorySystem._fields_text(data), data
+    
+    @staticmethod
+    def _fields_text(fields):
+        """Texte d'un souvenir structuré (son entrée textuelle)"""
+        text = fields.get('input')
+        return text if isinstance(text, str) else None
+    
+    def _set_memory_fields(self, memory, fields=None):
+        """Range dans le souvenir ses champs structurés et son texte"""
+        if fields is None:
+            memory['text'], fields = self._extract_fields(memory.get('content'))
+        else:
+            memory['text'] = self._fields_text(fields)
+        # La sortie du réseau n'est pas utile à la génération des réponses
+        memory['fields'] = {k: v for k, v in fields.items() if k != 'output'} if fields is not None else None
+    
+    def _find_memory(self, memory_id):
+        """Retrouve les objets mémoire (court et long terme) associés à un id"""
+        found = []
+        if memory_id in self.ltm_network:
+            found.append(self.ltm_network.nodes[memory_id])
+        for memory in self.stm_buffer:
+            if memory['id'] == memory_id:
+                found.append(memory)
+                break
+        return found
+    
+    def _merge_duplicate(self, memory_id, importance):
+        """
+        Fusionne un doublon dans un souvenir existant en augmentant son importance
+        Retourne False si le souvenir n'existe plus
+        """
+        memories = self._find_memory(memory_id)
+        if not memories:
+            # Souvenir oublié entre-temps: l'index était périmé
+            self.dedup_index.remove(memory_id)
+            return False
+        
+        new_importance = min(1.0, max(memories[0]['importance'], importance) + self.dedup_importance_boost)
+        for memory in memories:
+            memory['importance'] = new_importance
+            memory['duplicate_count'] = memory.get('duplicate_count', 0) + 1
+        if memory_id in self.ltm_network:
+            self.graph_version += 1
+        
+        # Un souvenir devenu important est consolidé comme à l'insertion
+        if new_importance > 0.7 and memory_id not in self.ltm_network:
+            self._consolidate_memory(memories[0])
+        return True
+    
+    def _forget_stm_memory(self, memory):
+        """Retire des index un souvenir quittant la mémoire à court terme"""
+        if memory['id'] not in self.ltm_network:
+            self.dedup_index.remove(memory['id'])
+            self.memory_index.remove(memory['id'])
+            self.lexical_index.remove(memory['id'])
+            self.store_version += 1
+    
+    @staticmethod
+    def _memory_tokens(memory):
+        """Mots indexés d'un souvenir: ceux de son texte (l'entrée d'un souvenir structuré)"""
+        text = memory.get('text')
+        return tokenize(text).tokens if isinstance(text, str) else []
+    
+    @synchronized
+    def add_memory(self, content, metadata=None, importance=0.5, deduplicate=True, fields=None, tokens=None):
         """
         Ajoute un nouveau souvenir à la mémoire à court terme
         - content: le contenu du souvenir (texte, vecteur, etc.)
         - metadata: informations additionnelles (source, contexte, etc.)
         - importance: valeur entre 0 et 1 indiquant l'importance du souvenir
+        - deduplicate: si un souvenir quasi identique existe, augmente son
+          importance au lieu d'en créer un nouveau (retourne alors son id)
+        - fields: champs structurés déjà connus de l'appelant (évite de
+          redécoder un contenu JSON)
+        - tokens: mots du contenu déjà extraits par le tokenizer partagé
+          (évite de redécouper le texte pour l'encodage et les doublons)
+        """
+        memory_id, _ = self._add_memory(content, metadata, importance, deduplicate, fields=fields, tokens=tokens)
+        return memory_id
+    
+    @synchronized
+    def add_memories(self, records, deduplicate=True):
         """
+        Ajoute un lot de souvenirs préparés (par exemple par les processus d'import)
+        - records: dictionnaires avec 'content', et optionnellement 'metadata',
+          'importance', 'encoding', 'signature', 'fields' et 'tokens' déjà calculés
+        Retourne la liste des couples (id, est_nouveau)
+        """
+        return [
+            self._add_memory(record['content'],
+                             record.get('metadata'),
+                             record.get('importance', 0.5),
+                             deduplicate,
+                             encoding=record.get('encoding'),
+                             signature=record.get('signature'),
+                             fields=record.get('fields'),
+                             tokens=record.get('tokens'))
+            for record in records
+        ]
+    
+    def _add_memory(self, content, metadata, importance, deduplicate, encoding=None, signature=None, fields=None,
+                    tokens=None):
+        """Insère un souvenir et retourne (id, est_nouveau)"""
+        # Le texte n'est découpé qu'une fois pour la détection des doublons, l'encodage et l'index des mots
+        if tokens is None and isinstance(content, str):
+            tokens = tokenize(content).tokens
+        
+        if self.deduplicate and deduplicate and isinstance(content, str):
+            if signature is None:
+                signature = self.dedup_index.compute_signature(content, tokens)
+            self.dedup_stats['checked'] += 1
+            duplicate_id = self.dedup_index.find_duplicate(signature)
+            if duplicate_id is not None and self._merge_duplicate(duplicate_id, importance):
+                self.dedup_stats['duplicates'] += 1
+                MEMORIES_MERGED.inc()
+                return duplicate_id, False
+        else:
+            signature = None
+        
         memory_id = self.memory_counter
         self.memory_counter += 1
         
         # Encode le contenu
-        encoding = self._encode_memory(content)
+        if encoding is None:
+            encoding = self._encode_memory(content, tokens)
         
         # Crée l'objet mémoire
         memory = {
@@ -99,22 +328,45 @@ class MemorySystem:
             'access_count': 0,
             'last_accessed': None
         }
+        self._set_memory_fields(memory, fields)
         
-        # Ajoute à la mémoire à court terme
+        # Ajoute à la mémoire à court terme (le plus ancien souvenir est oublié si elle est pleine)
+        if len(self.stm_buffer) == self.stm_buffer.maxlen:
+            self._forget_stm_memory(self.stm_buffer[0])
         self.stm_buffer.append(memory)
+        self.dedup_index.add(memory_id, signature)
+        self.memory_index.add(memory)
+        # Les mots du contenu ne sont réutilisables que s'il n'est pas structuré (texte = contenu)
+        self.lexical_index.add(memory_id, tokens if tokens is not None and memory['fields'] is None
+                               else self._memory_tokens(memory))
+        self.store_version += 1
+        MEMORIES_ADDED.inc()
         
         # Si le souvenir est important, le consolide immédiatement
         if importance > 0.7:
             self._consolidate_memory(memory)
             
-        return memory_id
+        return memory_id, True
     
+    @timed('consolidate')
     def _consolidate_memory(self, memory):
         """Transfère un souvenir de la mémoire à court terme vers la mémoire à long terme"""
-        # Ajoute le nœud au réseau
+        # Ajoute le nœud au réseau (un souvenir déjà oublié vers le niveau froid n'y reste pas)
         self.ltm_network.add_node(memory['id'], **memory)
+        if self.cold_storage is not None and memory['id'] in self.cold_storage:
+            self.cold_storage.remove([memory['id']])
+        
+        # L'index pointe désormais vers le nœud du réseau
+        node = self.ltm_network.nodes[memory['id']]
+        if memory['id'] in self.memory_index:
+            self.memory_index.update_reference(node)
+        else:
+            self.memory_index.add(node)
+        if memory['id'] not in self.lexical_index:
+            self.lexical_index.add(memory['id'], self._memory_tokens(node))
         
         # Trouve les souvenirs similaires pour créer des liens
+        edges = []
         for node_id in self.ltm_network.nodes():
             if node_id == memory['id']:
                 continue
@@ -127,7 +379,20 @@ class MemorySystem:
             if sim > 0.3:
                 self.ltm_network.add_edge(memory['id'], node_id, weight=sim)
                 self.ltm_network.add_edge(node_id, memory['id'], weight=sim)
+                edges.append((memory['id'], node_id, sim))
+                edges.append((node_id, memory['id'], sim))
+        
+        self.graph_version += 1
+        self.store_version += 1
+        self._append_edges([memory['id']], edges)
+        MEMORIES_CONSOLIDATED.inc()
+        MEMORY_EDGES_CREATED.inc(len(edges))
+        
+        if self.ltm_capacity is not None and len(self.ltm_network) > self.ltm_capacity:
+            self.evict_memories(protected={memory['id']})
+            self._check_ltm_capacity()
     
+    @synchronized
     def consolidate_memories(self):
         """Processus périodique de consolidation des souvenirs"""
         # Trie les souvenirs par importance
@@ -143,52 +408,568 @@ class MemorySystem:
                 self._consolidate_memory(memory)
                 
         # Vide la mémoire à court terme
+        for memory in memories_to_consolidate[num_to_consolidate:]:
+            self._forget_stm_memory(memory)
         self.stm_buffer.clear()
         
         return num_to_consolidate
     
-    def retrieve_memory(self, query, top_k=3):
+    def eviction_scores(self, node_ids=None, now=None):
+        """
+        Score de conservation des souvenirs à long terme (les plus faibles sont oubliés)
+        Somme pondérée (eviction_weights) de l'importance, de la fréquence d'accès
+        (log, relative au maximum), de la récence du dernier accès (demi-vie en jours)
+        et du degré dans le réseau (relatif au maximum)
+        Retourne (ids, scores) sous forme de tableaux numpy
+        """
+        if node_ids is None:
+            node_ids = list(self.ltm_network.nodes())
+        nodes = self.ltm_network.nodes
+        count = len(node_ids)
+        
+        importance = np.fromiter((nodes[n].get('importance', 0.0) for n in node_ids), dtype=np.float64, count=count)
+        access = np.fromiter((nodes[n].get('access_count', 0) for n in node_ids), dtype=np.float64, count=count)
+        degree = np.fromiter((d for _, d in self.ltm_network.degree(node_ids)), dtype=np.float64, count=count)
+        last_seen = np.array([nodes[n].get('last_accessed') or nodes[n].get('created_at') for n in node_ids],
+                             dtype='datetime64[s]')
+        
+        now = np.datetime64(now or datetime.now(), 's')
+        age = now - last_seen
+        age_days = age.astype(np.float64) / 86400.0
+        age_days[np.isnat(age)] = np.inf  # Date inconnue: le souvenir est considéré comme ancien
+        recency = 0.5 ** (np.maximum(age_days, 0.0) / self.recency_half_life)
+        access = np.log1p(access)
+        if access.max(initial=0.0) > 0:
+            access /= access.max()
+        if degree.max(initial=0.0) > 0:
+            degree /= degree.max()
+        
+        weights = self.eviction_weights
+        scores = (weights['importance'] * importance + weights['access'] * access
+                  + weights['recency'] * recency + weights['degree'] * degree)
+        return np.array(node_ids, dtype=np.int64), scores
+    
+    @synchronized
+    @timed('evict')
+    def evict_memories(self, count=None, protected=()):
+        """
+        Oublie les souvenirs à long terme au score de conservation le plus faible
+        - count: nombre de souvenirs à oublier (par défaut, de quoi revenir sous la
+          capacité en libérant `eviction_batch` de celle-ci)
+        - protected: ids à ne pas oublier (ex: souvenir en cours de consolidation)
+        Un souvenir oublié encore en mémoire à court terme quitte le réseau mais
+        reste trouvable par les index, qui pointent alors vers sa copie à court terme.
+        Retourne le nombre de souvenirs oubliés
+        """
+        if count is None:
+            if self.ltm_capacity is None:
+                return 0
+            target = int(self.ltm_capacity * (1 - self.eviction_batch))
+            count = len(self.ltm_network) - target
+        
+        protected = set(protected)
+        candidates = [n for n in self.ltm_network.nodes() if n not in protected]
+        count = min(count, len(candidates))
+        if count <= 0:
+            return 0
+        
+        ids, scores = self.eviction_scores(candidates)
+        if count < len(ids):
+            ids = ids[np.argpartition(scores, count - 1)[:count]]
+        evicted = [int(memory_id) for memory_id in ids]
+        
+        if self.cold_storage is not None:
+            self._demote_memories(evicted)
+        elif self.archive_path:
+            self._archive_memories(evicted)
+        
+        # Les liens des souvenirs oubliés disparaissent avec leurs nœuds
+        self.ltm_network.remove_nodes_from(evicted)
+        self.graph_layout.forget(evicted)
+        in_stm = {memory['id']: memory for memory in self.stm_buffer}
+        for memory_id in evicted:
+            if memory_id in in_stm:
+                self.memory_index.update_reference(in_stm[memory_id])
+                continue
+            self.memory_index.remove(memory_id)
+            self.lexical_index.remove(memory_id)
+            self.dedup_index.remove(memory_id)
+        
+        self.graph_version += 1
+        self.edge_version += 1
+        self.store_version += 1
+        self.eviction_stats['evicted'] += len(evicted)
+        MEMORIES_EVICTED.inc(len(evicted))
+        return len(evicted)
+    
+    @synchronized
+    def enforce_ltm_capacity(self):
+        """Oublie des souvenirs si la mémoire à long terme dépasse sa capacité (ex: après un chargement)"""
+        if self.ltm_capacity is not None and len(self.ltm_network) > self.ltm_capacity:
+            return self.evict_memories()
+        return 0
+    
+    @synchronized
+    def enable_cold_storage(self, path):
+        """Active le niveau froid de la mémoire à long terme (base SQLite à `path`)"""
+        if self.cold_storage is not None:
+            self.cold_storage.close()
+        self.cold_storage = ColdStorage(path, self.encoding_size, tokens_of=self._memory_tokens)
+        self._reconcile_cold_storage()
+    
+    def _reconcile_cold_storage(self):
+        """Retire du niveau froid les souvenirs présents en mémoire vive (ex: promus avant la sauvegarde)"""
+        overlap = [node_id for node_id in self.ltm_network.nodes() if node_id in self.cold_storage]
+        if overlap:
+            self.cold_storage.remove(overlap)
+    
+    def _demote_memories(self, memory_ids):
+        """Range des souvenirs à long terme et leurs liens dans le niveau froid"""
+        memories = [self.ltm_network.nodes[memory_id] for memory_id in memory_ids]
+        edges = list(self.ltm_network.out_edges(memory_ids, data='weight', default=1.0))
+        edges.extend(self.ltm_network.in_edges(memory_ids, data='weight', default=1.0))
+        self.cold_storage.demote(memories, edges)
+        self.eviction_stats['demoted'] += len(memories)
+    
+    @synchronized
+    def _promote_memories(self, memory_ids, protected=()):
+        """
+        Remet des souvenirs froids en mémoire vive, avec leurs liens vers les
+        souvenirs déjà présents, puis fait respecter la capacité
+        - protected: autres ids à ne pas oublier (ex: résultats de la recherche en cours)
+        Retourne {id: nœud du réseau}
+        """
+        memories, edges = self.cold_storage.promote(memory_ids)
+        # Un souvenir déjà présent (incohérence) changerait des liens existants:
+        # la matrice de propagation est alors reconstruite au lieu d'être complétée
+        incremental = not any(memory['id'] in self.ltm_network for memory in memories)
+        nodes = {}
+        for memory in memories:
+            memory_id = memory['id']
+            self.ltm_network.add_node(memory_id, **memory)
+            nodes[memory_id] = self.ltm_network.nodes[memory_id]
+            if memory_id in self.memory_index:
+                self.memory_index.update_reference(nodes[memory_id])
+            else:
+                self.memory_index.add(nodes[memory_id])
+            if memory_id not in self.lexical_index:
+                self.lexical_index.add(memory_id, self._memory_tokens(memory))
+            if isinstance(memory.get('content'), str) and memory_id not in self.dedup_index:
+                self.dedup_index.add(memory_id, self.dedup_index.compute_signature(memory['content']))
+        self.ltm_network.add_weighted_edges_from(
+            (source, target, weight) for source, target, weight in edges
+            if source in self.ltm_network and target in self.ltm_network)
+        
+        self.graph_version += 1
+        self.store_version += 1
+        if incremental:
+            # Liens touchant les souvenirs promus, chacun une fois
+            added = list(self.ltm_network.out_edges(list(nodes), data='weight', default=1.0))
+            added.extend(edge for edge in self.ltm_network.in_edges(list(nodes), data='weight', default=1.0)
+                         if edge[0] not in nodes)
+            self._append_edges(list(nodes), added)
+        else:
+            self.edge_version += 1
+        self.eviction_stats['promoted'] += len(nodes)
+        if self.ltm_capacity is not None and len(self.ltm_network) > self.ltm_capacity:
+            self.evict_memories(protected=set(nodes) | set(protected))
+            self._check_ltm_capacity()
+        return nodes
+    
+    def _check_ltm_capacity(self):
+        """Signale une mémoire à long terme restée au-dessus de sa capacité après une éviction"""
+        # Seuls les souvenirs protégés (consolidation ou résultats de la recherche en
+        # cours) peuvent la maintenir au-dessus: le dépassement est borné par leur nombre
+        if len(self.ltm_network) > self.ltm_capacity:
+            print(f"Mémoire à long terme au-dessus de sa capacité: {len(self.ltm_network)} souvenirs "
+                  f"pour {self.ltm_capacity} (souvenirs protégés)")
+    
+    def _append_edges(self, node_ids, edges):
+        """Nouveaux nœuds et liens du réseau: nouvelle version des liens, matrice de propagation complétée"""
+        self.edge_version += 1
+        self.spreading_activation.append_edges(self.edge_version - 1, self.edge_version, node_ids, edges)
+    
+    def _archive_memories(self, memory_ids):
+        """Ajoute des souvenirs au fichier d'archive (une ligne JSON par souvenir, sans l'encodage)"""
+        evicted_at = datetime.now().isoformat()
+        try:
+            directory = os.path.dirname(self.archive_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self.archive_path, 'a', encoding='utf-8') as f:
+                for memory_id in memory_ids:
+                    node = self.ltm_network.nodes[memory_id]
+                    record = {key: value for key, value in node.items() if key != 'encoding'}
+                    record['evicted_at'] = evicted_at
+                    f.write(json.dumps(record, ensure_ascii=False, default=str) + '\n')
+            self.eviction_stats['archived'] += len(memory_ids)
+        except Exception as e:
+            print(f"Erreur lors de l'archivage des souvenirs oubliés: {str(e)}")
+    
+    def dedup_report(self, since=None):
+        """
+        Statistiques de déduplication, éventuellement depuis un instantané
+        de `dedup_stats` pris au début d'un import ou d'une exploration
+        """
+        since = since or {'checked': 0, 'duplicates': 0}
+        checked = self.dedup_stats['checked'] - since['checked']
+        duplicates = self.dedup_stats['duplicates'] - since['duplicates']
+        return {
+            'checked': checked,
+            'duplicates': duplicates,
+            'ratio': duplicates / checked if checked else 0.0
+        }
+    
+    def _rebuild_dedup_index(self):
+        """Reconstruit l'index des doublons à partir des souvenirs stockés"""
+        self.dedup_index.clear()
+        memories = [self.ltm_network.nodes[n] for n in self.ltm_network.nodes()]
+        memories.extend(self.stm_buffer)
+        for memory in memories:
+            if isinstance(memory.get('content'), str) and memory['id'] not in self.dedup_index:
+                self.dedup_index.add(memory['id'], self.dedup_index.compute_signature(memory['content']))
+    
+    RETRIEVAL_MODES = ('cosine', 'activation', 'lexical', 'hybrid')
+    
+    # Version du découpage des textes utilisé par les encodages (1: lower().split(),
+    # 2: tokenizer partagé). Une sauvegarde d'une autre version est réencodée au chargement
+    ENCODING_VERSION = 2
+    
+    def retrieve_memory(self, query, top_k=3, mode='cosine'):
         """
         Récupère les souvenirs les plus pertinents en fonction d'une requête
         - query: texte ou vecteur de requête
         - top_k: nombre de souvenirs à récupérer
+        - mode: 'cosine' (similarité seule), 'activation' (propagation dans le réseau),
+          'lexical' (mots communs, BM25) ou 'hybrid' (fusion des classements cosinus et BM25)
+        """
+        return [memory for memory, _ in self.retrieve_candidates(query, top_k, mode=mode)]
+    
+    @synchronized
+    @timed('retrieve')
+    def retrieve_candidates(self, query, top_k=3, types=None, mode='cosine'):
+        """
+        Récupère les couples (souvenir, score) les plus proches d'une requête
+        - types: ne chercher que parmi ces types de souvenirs (partitions de l'index)
+        - mode: 'cosine' (score = similarité), 'activation' (score = activation après
+          propagation depuis les souvenirs les plus similaires), 'lexical' (score BM25,
+          requête textuelle) ou 'hybrid' (score = fusion des rangs cosinus et BM25)
+        Seuls les souvenirs à long terme retournés voient leur compteur d'accès mis à jour
+        (y compris quand les résultats proviennent du cache des recherches)
+        Consultation du cache, recherche, promotions et compteurs d'accès se font
+        sous le verrou de la mémoire (appels concurrents sûrs)
+        """
+        if mode not in self.RETRIEVAL_MODES:
+            raise ValueError(f"Mode de recherche inconnu: {mode}")
+        
+        query_tokens = self._query_tokens(query) if mode in ('lexical', 'hybrid') else None
+        query_encoding = self._encode_memory(query) if mode != 'lexical' else None
+        key = self._retrieval_key(query_encoding, query_tokens, top_k, types, mode)
+        version = self.store_version
+        results = self._cached_results(key, version)
+        if results is None:
+            if mode == 'lexical':
+                results = self._promote_results(self._search_lexical(query_tokens, top_k, types))
+            elif mode == 'activation':
+                results = self._retrieve_by_activation(query_encoding, top_k, types)
+            elif mode == 'hybrid':
+                results = self._retrieve_hybrid(query_encoding, query_tokens, top_k, types)
+            else:
+                results = self._search(query_encoding, top_k, types)
+            # Une recherche qui a promu des souvenirs froids a changé le stock: rien à mettre en cache
+            if self.store_version == version:
+                self._cache_results(key, version, results)
+        
+        now = datetime.now().isoformat()
+        for memory, _ in results:
+            if memory['id'] in self.ltm_network:
+                node = self.ltm_network.nodes[memory['id']]
+                node['access_count'] += 1
+                node['last_accessed'] = now
+        
+        return results
+    
+    @staticmethod
+    def _retrieval_key(query_encoding, query_tokens, top_k, types, mode):
+        """Clé d'une recherche: empreinte de l'encodage (et des mots) de la requête et paramètres"""
+        digest = hashlib.blake2b(digest_size=16)
+        if query_encoding is not None:
+            digest.update(np.ascontiguousarray(query_encoding, dtype=np.float64).tobytes())
+        if query_tokens is not None:
+            digest.update('\x00'.join(query_tokens).encode('utf-8'))
+        return (mode, top_k, frozenset(types) if types is not None else None, digest.digest())
+    
+    def _cached_results(self, key, version):
+        """Résultats en cache d'une recherche (None si absents ou périmés)"""
+        if self.retrieval_cache_size <= 0:
+            return None
+        with self.lock:
+            entry = self.retrieval_cache.get(key)
+            if entry is not None and entry[0] != version:
+                del self.retrieval_cache[key]
+                entry = None
+            if entry is not None:
+                self.retrieval_cache.move_to_end(key)
+            self.retrieval_cache_stats['hits' if entry is not None else 'misses'] += 1
+        CACHE_REQUESTS.inc(cache='retrieval', result='hit' if entry is not None else 'miss')
+        return list(entry[1]) if entry is not None else None
+    
+    def _cache_results(self, key, version, results):
+        """Met en cache les résultats d'une recherche (les plus anciennes entrées sont oubliées)"""
+        if self.retrieval_cache_size <= 0:
+            return
+        with self.lock:
+            self.retrieval_cache[key] = (version, list(results))
+            self.retrieval_cache.move_to_end(key)
+            while len(self.retrieval_cache) > self.retrieval_cache_size:
+                self.retrieval_cache.popitem(last=False)
+    
+    def retrieval_cache_report(self):
+        """Taille et taux de succès du cache des recherches"""
+        with self.lock:
+            hits, misses = self.retrieval_cache_stats['hits'], self.retrieval_cache_stats['misses']
+            return {
+                'size': len(self.retrieval_cache),
+                'capacity': self.retrieval_cache_size,
+                'hits': hits,
+                'misses': misses,
+                'hit_rate': hits / (hits + misses) if hits + misses else 0.0
+            }
+    
+    def _search(self, query_encoding, top_k, types=None, promote=True):
         """
-        # Encode la requête
-        query_encoding = self._encode_memory(query)
+        Recherche cosinus dans la mémoire vive et dans le niveau froid
+        Les souvenirs froids retenus sont promus en mémoire vive (sauf promote=False)
+        """
+        results = self.memory_index.search(query_encoding, top_k, types)
+        if self.cold_storage is None or len(self.cold_storage) == 0:
+            return results
         
-        # Cherche dans la mémoire à court terme
-        stm_memories = list(self.stm_buffer)
-        similarities_stm = []
+        accept = None if types is None else (lambda memory: self.memory_index.memory_type(memory) in types)
+        # Un souvenir oublié encore en mémoire à court terme a aussi une copie froide:
+        # la copie en mémoire vive, déjà dans les résultats, prime
+        results = results + [(memory, similarity) for memory, similarity
+                             in self.cold_storage.search(query_encoding, top_k, accept)
+                             if memory['id'] not in self.memory_index]
+        results.sort(key=lambda item: item[1], reverse=True)
+        results = results[:top_k]
+        return self._promote_results(results) if promote else results
+    
+    def _promote_results(self, results):
+        """
+        Promeut les souvenirs froids d'une liste de résultats et pointe vers leurs nœuds
+        L'éviction qui peut suivre la promotion épargne tous les résultats: aucun
+        souvenir retourné ne repart dans le niveau froid pendant la recherche
+        """
+        if self.cold_storage is None:
+            return results
+        # Un résultat en mémoire vive (ex: oublié mais encore à court terme) n'est pas promu
+        cold_ids = [memory['id'] for memory, _ in results
+                    if memory['id'] in self.cold_storage and memory['id'] not in self.memory_index]
+        if not cold_ids:
+            return results
+        nodes = self._promote_memories(cold_ids, protected=[memory['id'] for memory, _ in results])
+        return [(nodes.get(memory['id'], memory), score) for memory, score in results]
+    
+    @staticmethod
+    def _query_tokens(query):
+        """Mots d'une requête textuelle (aucun pour une requête vectorielle)"""
+        if isinstance(query, (str, TokenizedText)):
+            return tokenize(query).tokens
+        return []
+    
+    def _search_lexical(self, query_tokens, top_k, types=None):
+        """
+        Souvenirs partageant des mots avec la requête, classés par BM25 dans la
+        mémoire vive et le niveau froid (les souvenirs froids sont relus dans la
+        base, l'appelant les promeut)
+        """
+        # Avec un filtre de type, une partie des souvenirs trouvés est écartée
+        limit = top_k if types is None else max(4 * top_k, 50)
+        cold = self.cold_storage if self.cold_storage is not None and len(self.cold_storage) else None
+        ranking = self.lexical_index.search(query_tokens, limit, other=cold)
+        cold_memories = {}
+        if cold is not None:
+            cold_memories = cold.fetch([memory_id for memory_id, _ in ranking if memory_id not in self.memory_index])
+        results = []
+        for memory_id, score in ranking:
+            memory = self.memory_index.get(memory_id) or cold_memories.get(memory_id)
+            if memory is None or (types is not None and self.memory_index.memory_type(memory) not in types):
+                continue
+            results.append((memory, score))
+            if len(results) == top_k:
+                break
+        return results
+    
+    def _retrieve_hybrid(self, query_encoding, query_tokens, top_k, types=None):
+        """
+        Fusion des classements cosinus et BM25 (reciprocal rank fusion): chaque
+        souvenir reçoit la somme des 1 / (constante + rang) de ses deux classements
+        """
+        pool = max(4 * top_k, 20)
+        rankings = [self._search(query_encoding, pool, types, promote=False),
+                    self._search_lexical(query_tokens, pool, types)]
         
-        for memory in stm_memories:
-            sim = np.dot(query_encoding, memory['encoding'])
-            similarities_stm.append((memory, sim))
+        fused = {}
+        memories = {}
+        for ranking in rankings:
+            for rank, (memory, _) in enumerate(ranking, start=1):
+                fused[memory['id']] = fused.get(memory['id'], 0.0) + 1.0 / (self.hybrid_rank_constant + rank)
+                memories.setdefault(memory['id'], memory)
         
-        # Cherche dans la mémoire à long terme
-        ltm_memories = []
-        similarities_ltm = []
+        best = heapq.nlargest(top_k, fused.items(), key=lambda item: item[1])
+        return self._promote_results([(memories[memory_id], score) for memory_id, score in best])
+    
+    def _retrieve_by_activation(self, query_encoding, top_k, types=None):
+        """Graines cosinus (y compris froides, promues) puis propagation le long des liens du réseau à long terme"""
+        seeds = self._search(query_encoding, max(top_k, self.activation_seeds), types)
+        activations = self.spreading_activation.propagate(
+            self.ltm_network, self.edge_version,
+            {memory['id']: similarity for memory, similarity in seeds},
+            # Avec un filtre de type, l'activation peut atteindre des souvenirs d'autres types
+            top_k=top_k if types is None else len(self.memory_index))
         
+        results = []
+        for memory_id, activation in activations:
+            memory = self.memory_index.get(memory_id)
+            if memory is None or (types is not None and self.memory_index.memory_type(memory) not in types):
+                continue
+            results.append((memory, activation))
+            if len(results) == top_k:
+                break
+        return results
+    
+    def _rebuild_memory_index(self, lexical_state=None):
+        """
+        Reconstruit les index vectoriel et lexical (les souvenirs à long terme priment)
+        - lexical_state: index lexical sauvegardé, repris s'il couvre les mêmes souvenirs
+        """
+        if self.memory_index.encoding_size != self.encoding_size:
+            self.memory_index = MemoryIndex(self.encoding_size)
+        self.memory_index.clear()
         for node_id in self.ltm_network.nodes():
-            memory = self.ltm_network.nodes[node_id]
-            sim = np.dot(query_encoding, memory['encoding'])
-            similarities_ltm.append((memory, sim))
-            
-            # Met à jour le compteur d'accès
-            self.ltm_network.nodes[node_id]['access_count'] += 1
-            self.ltm_network.nodes[node_id]['last_accessed'] = datetime.now().isoformat()
+            self.memory_index.add(self.ltm_network.nodes[node_id])
+        for memory in self.stm_buffer:
+            if memory['id'] not in self.memory_index:
+                self.memory_index.add(memory)
+        
+        if lexical_state is not None:
+            self.lexical_index.set_state(lexical_state)
+            if not set(self.lexical_index.terms) <= set(self.memory_index.row_of):
+                lexical_state = None  # Index sauvegardé incohérent avec les souvenirs
+        if lexical_state is None:
+            self.lexical_index.clear()
+            for memory in self.memory_index.memories.values():
+                self.lexical_index.add(memory['id'], self._memory_tokens(memory))
+    
+    @staticmethod
+    def _node_group(node_data):
+        """Groupe d'un nœud (type, source ou premier mot du contenu) pour sa couleur"""
+        metadata = node_data.get('metadata', {})
+        content = node_data.get('content', '')
+        if 'type' in metadata:
+            return metadata['type']
+        if 'source' in metadata:
+            return metadata['source']
+        if isinstance(content, str) and len(content) > 10:
+            # Tente de classifier par premier mot significatif
+            words = content.lower().split()
+            return words[0] if words else 'unknown'
+        return 'unknown'
+    
+    @staticmethod
+    def _node_label(node_id, node_data):
+        """Étiquette concise d'un nœud (deux premiers mots du contenu)"""
+        content = node_data.get('content')
+        if not isinstance(content, str):
+            return f"ID:{node_id}"
+        words = content.split()
+        if len(words) >= 2:
+            label = ' '.join(words[:2])
+            if len(label) > 15:
+                label = label[:15] + '...'
+            return f"[{label}]"
+        return f"[{content[:15]}]" if len(content) > 15 else f"[{content}]"
+    
+    @synchronized
+    def graph_snapshot(self, max_nodes=50):
+        """
+        Copie des nœuds les plus importants du réseau à long terme et de leurs liens
+        (lue d'un trait pour que le rendu puisse se faire dans un autre thread)
+        """
+        version = self.graph_version
+        selected = heapq.nlargest(max_nodes, self.ltm_network.nodes(data='importance', default=0.0),
+                                  key=lambda item: item[1])
+        selected_ids = {node_id for node_id, _ in selected}
+        
+        nodes = []
+        for node_id, importance in selected:
+            node_data = self.ltm_network.nodes[node_id]
+            nodes.append({
+                'id': node_id,
+                'importance': importance,
+                'group': self._node_group(node_data),
+                'label': self._node_label(node_id, node_data)
+            })
+        edges = []
+        for u in selected_ids:
+            for v, edge_data in self.ltm_network[u].items():
+                # Les liens sont symétriques: chaque paire n'est copiée qu'une fois
+                if v in selected_ids and (u < v or not self.ltm_network.has_edge(v, u)):
+                    edges.append((u, v, float(edge_data.get('weight', 0.25))))
+        
+        return {
+            'version': version,
+            'total_nodes': len(self.ltm_network),
+            'total_edges': self.ltm_network.number_of_edges(),
+            'nodes': nodes,
+            'edges': edges
+        }
+    
+    def graph_data(self, max_nodes=500, offset=0):
+        """
+        Sous-graphe du réseau à long terme au format compact, pour un rendu côté client
+        Les nœuds sont classés par importance décroissante: une page contient les
+        rangs [offset, offset + max_nodes) et leurs liens vers les pages précédentes.
+        Les positions sont celles du cache de disposition (les mêmes que les images).
+        """
+        snapshot = self.graph_snapshot(offset + max_nodes)
+        positions = self.graph_layout.update([node['id'] for node in snapshot['nodes']], snapshot['edges'])
         
-        # Combine et trie les résultats
-        all_similarities = similarities_stm + similarities_ltm
-        all_similarities.sort(key=lambda x: x[1], reverse=True)
+        page = snapshot['nodes'][offset:]
+        page_ids = {node['id'] for node in page}
+        groups = {}
+        nodes = []
+        for node in page:
+            x, y = positions[node['id']]
+            nodes.append([node['id'], round(float(x), 4), round(float(y), 4), round(float(node['importance']), 3),
+                          groups.setdefault(node['group'], len(groups)), node['label']])
+        edges = [[u, v, round(weight, 3)] for u, v, weight in snapshot['edges']
+                 if u in page_ids or v in page_ids]
         
-        # Retourne les top_k résultats
-        return [item[0] for item in all_similarities[:top_k]]
+        return {
+            'version': snapshot['version'],
+            'total_nodes': snapshot['total_nodes'],
+            'total_edges': snapshot['total_edges'],
+            'offset': offset,
+            'has_more': offset + len(page) < snapshot['total_nodes'],
+            'node_fields': ['id', 'x', 'y', 'importance', 'group', 'label'],
+            'groups': list(groups),
+            'nodes': nodes,
+            'edges': edges
+        }
     
-    def visualize_memory_network(self, filename='memory_network.png', max_nodes_to_show=50):
-        """Visualise le réseau de mémoire à long terme"""
+    def visualize_memory_network(self, filename='memory_network.png', max_nodes_to_show=50, snapshot=None):
+        """
+        Visualise le réseau de mémoire à long terme
+        - snapshot: copie déjà prise par graph_snapshot (sinon prise ici)
+        Les positions des nœuds sont conservées d'un rendu à l'autre (graph_layout)
+        """
+        if snapshot is None:
+            snapshot = self.graph_snapshot(max_nodes_to_show)
         plt.figure(figsize=(15, 12), dpi=100)
         
-        if len(self.ltm_network) == 0:
+        if not snapshot['nodes']:
             # Si le réseau est vide, crée une image avec un message
             print("Le réseau de mémoire est vide. Création d'une image par défaut.")
             plt.text(0.5, 0.5, "Le réseau de mémoire est vide\nLe cerveau commence à apprendre...",
@@ -209,98 +990,49 @@ class MemorySystem:
                 plt.plot([0.5, x], [0.25, y], '--', color='#bdc3c7', alpha=0.4, linewidth=1)
         else:
             # Information sur la taille du réseau
-            total_nodes = len(self.ltm_network)
-            total_edges = len(self.ltm_network.edges())
-            print(f"Réseau de mémoire: {total_nodes} nœuds, {total_edges} connexions")
+            total_nodes = snapshot['total_nodes']
+            print(f"Réseau de mémoire: {total_nodes} nœuds, {snapshot['total_edges']} connexions")
+            if total_nodes > len(snapshot['nodes']):
+                print(f"Affichage des {len(snapshot['nodes'])} nœuds les plus importants sur {total_nodes} total")
             
-            # Sélectionne un sous-ensemble de nœuds si nécessaire
-            if total_nodes > max_nodes_to_show:
-                # Sélectionner les nœuds par importance
-                nodes_with_importance = [(node, self.ltm_network.nodes[node]['importance']) 
-                                        for node in self.ltm_network.nodes()]
-                nodes_with_importance.sort(key=lambda x: x[1], reverse=True)
-                selected_nodes = [n[0] for n in nodes_with_importance[:max_nodes_to_show]]
-                
-                # Créer un sous-graphe
-                subgraph = self.ltm_network.subgraph(selected_nodes)
-                print(f"Affichage des {len(subgraph)} nœuds les plus importants sur {total_nodes} total")
-                graph_to_display = subgraph
-            else:
-                graph_to_display = self.ltm_network
+            # Les liens sont symétriques: un graphe non orienté se dessine sans flèches (bien plus rapide)
+            graph_to_display = nx.Graph()
+            for node in snapshot['nodes']:
+                graph_to_display.add_node(node['id'], **node)
+            graph_to_display.add_weighted_edges_from(snapshot['edges'])
             
-            # Utilisation d'un algorithme de disposition plus adapté aux grands graphes
-            try:
-                # Kamada-Kawai fonctionne bien pour les graphes de taille moyenne
-                pos = nx.kamada_kawai_layout(graph_to_display) 
-            except:
-                # Spring layout si KK échoue
-                pos = nx.spring_layout(graph_to_display, k=0.3, iterations=50)
+            # Positions mises en cache: seuls les nouveaux nœuds sont placés
+            pos = self.graph_layout.update(list(graph_to_display.nodes()), snapshot['edges'])
             
             # Classification des nœuds par type/thème pour les couleurs
             node_colors = []
             node_sizes = []
             node_groups = {}
+            colormap = plt.cm.tab10
             
             for node in graph_to_display.nodes():
                 # Importances pour la taille des nœuds (normalisées)
-                importance = graph_to_display.nodes[node]['importance']
-                node_sizes.append(100 + importance * 500)  # Plus petit pour les grands graphes
-                
-                # Groupes/couleurs basés sur les métadonnées ou le contenu
-                metadata = graph_to_display.nodes[node].get('metadata', {})
-                content = graph_to_display.nodes[node].get('content', '')
-                
-                # Déterminer un groupe pour le nœud
-                if 'type' in metadata:
-                    group = metadata['type']
-                elif 'source' in metadata:
-                    group = metadata['source']
-                elif isinstance(content, str) and len(content) > 10:
-                    # Tente de classifier par premier mot significatif
-                    words = content.lower().split()
-                    group = words[0] if words else 'unknown'
-                else:
-                    group = 'unknown'
+                node_sizes.append(100 + graph_to_display.nodes[node]['importance'] * 500)
                 
+                group = graph_to_display.nodes[node]['group']
                 if group not in node_groups:
                     node_groups[group] = len(node_groups)
                 
-                # Assigner une couleur basée sur le groupe
-                color_idx = node_groups[group] % 10  # Cycle parmi 10 couleurs
-                colormap = plt.cm.tab10
-                node_colors.append(colormap(color_idx))
+                # Assigner une couleur basée sur le groupe (cycle parmi 10 couleurs)
+                node_colors.append(colormap(node_groups[group] % 10))
             
             # Détermination du poids des arêtes
-            edge_weights = []
-            for u, v in graph_to_display.edges():
-                try:
-                    weight = graph_to_display[u][v]['weight'] * 2
-                    edge_weights.append(max(0.5, min(4.0, weight)))  # Limiter la plage
-                except KeyError:
-                    edge_weights.append(0.5)  # Valeur par défaut
+            edge_weights = [max(0.5, min(4.0, graph_to_display[u][v]['weight'] * 2))  # Limiter la plage
+                            for u, v in graph_to_display.edges()]
             
             # Dessin du graphe
             nx.draw_networkx_nodes(graph_to_display, pos, node_size=node_sizes, 
                                    node_color=node_colors, alpha=0.7)
             nx.draw_networkx_edges(graph_to_display, pos, width=edge_weights,
-                                   alpha=0.3, edge_color='gray', arrowsize=5)
+                                   alpha=0.3, edge_color='gray')
             
-            # Étiquettes des nœuds (plus informatives)
-            labels = {}
-            for node in graph_to_display.nodes():
-                content = graph_to_display.nodes[node]['content']
-                if isinstance(content, str):
-                    # Récupérer les premiers mots pour une étiquette concise
-                    words = content.split()
-                    if len(words) >= 2:
-                        label = ' '.join(words[:2])
-                        if len(label) > 15:
-                            label = label[:15] + '...'
-                        labels[node] = f"[{label}]"
-                    else:
-                        labels[node] = f"[{content[:15]}]" if len(content) > 15 else f"[{content}]"
-                else:
-                    labels[node] = f"ID:{node}"
+            # Étiquettes des nœuds
+            labels = {node: graph_to_display.nodes[node]['label'] for node in graph_to_display.nodes()}
             
             # Ajuster la taille de police en fonction du nombre de nœuds
             font_size = max(4, min(9, 12 - len(graph_to_display) // 20))
@@ -318,7 +1050,7 @@ class MemorySystem:
             plt.legend(handles=legend_elements, loc='upper right', fontsize=9)
             
             # Ajouter un texte d'information sur le nombre total de nœuds
-            if total_nodes > max_nodes_to_show:
+            if total_nodes > len(graph_to_display):
                 plt.text(0.02, 0.02, 
                          f"Affichage des {len(graph_to_display)} nœuds les plus importants sur {total_nodes} nœuds au total",
                          fontsize=8, transform=plt.gca().transAxes, 
@@ -332,15 +1064,23 @@ class MemorySystem:
         
         print(f"Visualisation sauvegardée dans {filename}")
     
+    @synchronized
     def save_memory_system(self, path="memory_system.pkl"):
         """Sauvegarde le système de mémoire"""
+        # Le niveau froid doit être à jour pour que la sauvegarde et la base concordent
+        if self.cold_storage is not None:
+            self.cold_storage.flush()
+        
         state = {
             'stm_buffer': list(self.stm_buffer),
             'ltm_network': nx.node_link_data(self.ltm_network),
             'memory_counter': self.memory_counter,
             'word_encodings': self.word_encodings,
             'stm_capacity': self.stm_capacity,
-            'encoding_size': self.encoding_size
+            'encoding_size': self.encoding_size,
+            'dedup_signatures': self.dedup_index.signatures,
+            'lexical_index': self.lexical_index.get_state(),
+            'encoding_version': self.ENCODING_VERSION
         }
         
         with open(path, 'wb') as f:
@@ -348,6 +1088,21 @@ class MemorySystem:
             
         print(f"Système de mémoire sauvegardé dans {path}")
     
+    def _reencode_memories(self):
+        """
+        Réencode les souvenirs textuels avec le découpage courant (sauvegarde d'une
+        autre ENCODING_VERSION); les index sont reconstruits ensuite par l'appelant.
+        Les poids des liens existants, calculés avec les anciens encodages, sont conservés.
+        """
+        memories = list(self.stm_buffer) + [self.ltm_network.nodes[n] for n in self.ltm_network.nodes()]
+        count = 0
+        for memory in memories:
+            if isinstance(memory.get('content'), str):
+                memory['encoding'] = self._encode_memory(memory['content'])
+                count += 1
+        print(f"{count} souvenirs réencodés (nouvelle version de l'encodage)")
+    
+    @synchronized
     def load_memory_system(self, path="memory_system.pkl"):
         """Charge le système de mémoire"""
         if os.path.exists(path):
@@ -361,6 +1116,36 @@ class MemorySystem:
             self.stm_capacity = state['stm_capacity']
             self.encoding_size = state['encoding_size']
             
+            # Le format node-link stocke l'id comme clé du nœud et non comme attribut
+            for node_id in self.ltm_network.nodes():
+                self.ltm_network.nodes[node_id].setdefault('id', node_id)
+            
+            # Encodages et signatures d'un autre découpage des textes: recalculés
+            reencode = state.get('encoding_version', 1) != self.ENCODING_VERSION
+            if reencode:
+                self._reencode_memories()
+            
+            # Index des doublons (reconstruit pour les anciennes sauvegardes)
+            self.dedup_index.clear()
+            if 'dedup_signatures' in state and not reencode:
+                for memory_id, signature in state['dedup_signatures'].items():
+                    self.dedup_index.add(memory_id, signature)
+            else:
+                self._rebuild_dedup_index()
+            
+            # Champs structurés (absents des anciennes sauvegardes) et index vectoriel
+            for memory in list(self.stm_buffer) + [self.ltm_network.nodes[n] for n in self.ltm_network.nodes()]:
+                if 'text' not in memory:
+                    self._set_memory_fields(memory)
+            self._rebuild_memory_index(state.get('lexical_index'))
+            self.graph_version += 1
+            self.edge_version += 1
+            self.store_version += 1
+            self.graph_layout.clear()
+            self.spreading_activation.clear()
+            if self.cold_storage is not None:
+                self._reconcile_cold_storage()
+            
             print(f"Système de mémoire chargé depuis {path}")
             return True
         else:
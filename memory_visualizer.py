@@ -0,0 +1,127 @@
+import os
+import glob
+import time
+import threading
+from datetime import datetime
+
+from metrics import CACHE_REQUESTS, time_stage
+
+class MemoryVisualizer:
+    """
+    Rendu en arrière-plan des images du réseau de mémoire.
+    - Une image n'est recalculée que si la version du réseau a changé depuis
+      le dernier rendu (sinon la dernière image est renvoyée telle quelle)
+    - Le rendu (disposition et matplotlib) se fait dans un thread dédié, les
+      requêtes ne font qu'attendre son résultat pendant un délai borné
+    - Seules les `keep` dernières images sont conservées sur le disque
+    """
+
+    def __init__(self, memory_system, output_dir='static/visualizations', url_prefix='/static/visualizations',
+                 max_nodes=50, keep=5):
+        self.memory_system = memory_system
+        self.output_dir = output_dir
+        self.url_prefix = url_prefix
+        self.max_nodes = max_nodes
+        self.keep = keep
+
+        self.latest = None  # Dernière image rendue (url, version, date, durée)
+        self.requested_version = None
+        self.rendering = False
+        self.condition = threading.Condition()
+        self.worker = None
+
+    def request(self, timeout=0.0):
+        """
+        Demande une image à jour du réseau et attend au plus `timeout` secondes
+        Retourne la dernière image disponible (éventuellement ancienne) et son état:
+        {'url', 'version', 'rendered_at', 'render_time', 'up_to_date', 'rendering'}
+        """
+        version = self.memory_system.graph_version
+        deadline = time.time() + timeout
+
+        with self.condition:
+            if self._up_to_date(version):
+                CACHE_REQUESTS.inc(cache='visualization', result='hit')
+            else:
+                CACHE_REQUESTS.inc(cache='visualization', result='miss')
+                if self.requested_version is None or self.requested_version < version:
+                    self.requested_version = version
+                    self._ensure_worker()
+                    self.condition.notify_all()
+
+                # Attend le rendu (sauf s'il a échoué: requested_version est alors effacé)
+                while not self._up_to_date(version) and self.requested_version is not None:
+                    remaining = deadline - time.time()
+                    if remaining <= 0:
+                        break
+                    self.condition.wait(remaining)
+
+            image = dict(self.latest) if self.latest else {
+                'url': None, 'version': None, 'rendered_at': None, 'render_time': None}
+            image['up_to_date'] = self._up_to_date(version)
+            image['rendering'] = self.rendering or self._pending()
+            return image
+
+    def _up_to_date(self, version):
+        return self.latest is not None and self.latest['version'] >= version
+
+    def _pending(self):
+        """Une version demandée n'a pas encore été rendue"""
+        return self.requested_version is not None and not self._up_to_date(self.requested_version)
+
+    def _ensure_worker(self):
+        """Démarre le thread de rendu s'il n'est pas déjà actif"""
+        if self.worker is None or not self.worker.is_alive():
+            self.worker = threading.Thread(target=self._run, name='memory-visualizer', daemon=True)
+            self.worker.start()
+
+    def _run(self):
+        """Boucle du thread de rendu: rend la dernière version demandée"""
+        while True:
+            with self.condition:
+                while not self._pending():
+                    self.condition.wait()
+                self.rendering = True
+
+            try:
+                image = self._render()
+            except Exception as e:
+                print(f"Erreur lors du rendu du réseau de mémoire: {str(e)}")
+                image = None
+
+            with self.condition:
+                self.rendering = False
+                if image is not None:
+                    self.latest = image
+                else:
+                    # Abandonne la version demandée: la prochaine demande relancera le rendu
+                    self.requested_version = None
+                self.condition.notify_all()
+
+    def _render(self):
+        """Rend la version courante du réseau et supprime les anciennes images"""
+        start = time.perf_counter()
+        with time_stage('visualize'):
+            snapshot = self.memory_system.graph_snapshot(self.max_nodes)
+            os.makedirs(self.output_dir, exist_ok=True)
+            filename = f"memory_network_{snapshot['version']}_{int(time.time())}.png"
+            self.memory_system.visualize_memory_network(os.path.join(self.output_dir, filename),
+                                                        snapshot=snapshot)
+        self._collect_garbage()
+
+        return {
+            'url': f"{self.url_prefix}/{filename}",
+            'version': snapshot['version'],
+            'rendered_at': datetime.now().isoformat(),
+            'render_time': time.perf_counter() - start
+        }
+
+    def _collect_garbage(self):
+        """Ne conserve que les `keep` images les plus récentes"""
+        images = sorted(glob.glob(os.path.join(self.output_dir, 'memory_network_*.png')),
+                        key=os.path.getmtime, reverse=True)
+        for path in images[self.keep:]:
+            try:
+                os.remove(path)
+            except OSError as e:
+                print(f"Erreur lors de la suppression de {path}: {str(e)}")
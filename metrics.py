@@ -0,0 +1,212 @@
+import bisect
+import functools
+import threading
+import time
+from contextlib import contextmanager
+
+# Bornes par défaut des histogrammes de latence (secondes)
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+def _format_labels(labels, extra=None):
+    """Formate des étiquettes au format d'exposition texte de Prometheus"""
+    items = list(labels)
+    if extra:
+        items.extend(extra)
+    if not items:
+        return ''
+    escaped = []
+    for name, value in items:
+        value = str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+        escaped.append(f'{name}="{value}"')
+    return '{' + ','.join(escaped) + '}'
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value))
+
+class _Metric:
+    """Base commune: une métrique est une famille de séries indexées par leurs étiquettes"""
+
+    metric_type = None
+
+    def __init__(self, name, documentation, label_names=()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self.lock = threading.Lock()
+        self.series = {}  # valeurs des étiquettes -> état de la série
+
+    def _key(self, labels):
+        if set(labels) != set(self.label_names):
+            raise ValueError(f"Étiquettes attendues pour {self.name}: {self.label_names}")
+        return tuple(str(labels[name]) for name in self.label_names)
+
+    def _labels(self, key):
+        return zip(self.label_names, key)
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.metric_type}']
+        with self.lock:
+            lines.extend(self._render_series())
+        return lines
+
+class Counter(_Metric):
+    """Compteur monotone"""
+
+    metric_type = 'counter'
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self.lock:
+            self.series[key] = self.series.get(key, 0) + amount
+
+    def value(self, **labels):
+        return self.series.get(self._key(labels), 0)
+
+    def _render_series(self):
+        series = self.series
+        if not series and not self.label_names:
+            series = {(): 0}
+        return [f'{self.name}{_format_labels(self._labels(key))} {_format_value(value)}'
+                for key, value in sorted(series.items())]
+
+class Gauge(_Metric):
+    """
+    Jauge: valeur instantanée, fixée par set() ou lue au moment de l'export
+    par une fonction (set_function)
+    """
+
+    metric_type = 'gauge'
+
+    def __init__(self, name, documentation, label_names=()):
+        super().__init__(name, documentation, label_names)
+        self.functions = {}
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self.lock:
+            self.series[key] = value
+
+    def set_function(self, function, **labels):
+        """La valeur est calculée par `function()` à chaque export"""
+        key = self._key(labels)
+        with self.lock:
+            self.functions[key] = function
+
+    def _render_series(self):
+        values = dict(self.series)
+        for key, function in self.functions.items():
+            try:
+                values[key] = function()
+            except Exception as e:
+                print(f"Erreur lors de la lecture de la jauge {self.name}: {str(e)}")
+        return [f'{self.name}{_format_labels(self._labels(key))} {_format_value(value)}'
+                for key, value in sorted(values.items())]
+
+class Histogram(_Metric):
+    """Histogramme à intervalles cumulés (latences en secondes)"""
+
+    metric_type = 'histogram'
+
+    def __init__(self, name, documentation, label_names=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, label_names)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self.lock:
+            series = self.series.get(key)
+            if series is None:
+                series = self.series[key] = {'counts': [0] * (len(self.buckets) + 1), 'sum': 0.0, 'count': 0}
+            series['counts'][bisect.bisect_left(self.buckets, value)] += 1
+            series['sum'] += value
+            series['count'] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        """Mesure la durée du bloc"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def _render_series(self):
+        lines = []
+        for key, series in sorted(self.series.items()):
+            labels = list(self._labels(key))
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), series['counts']):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{_format_labels(labels, [("le", _format_value(bound))])} {cumulative}')
+            lines.append(f'{self.name}_sum{_format_labels(labels)} {_format_value(series["sum"])}')
+            lines.append(f'{self.name}_count{_format_labels(labels)} {series["count"]}')
+        return lines
+
+class MetricsRegistry:
+    """Ensemble des métriques exportées sur /metrics"""
+
+    def __init__(self):
+        self.metrics = {}
+        self.lock = threading.Lock()
+
+    def _register(self, metric_class, name, documentation, label_names, **kwargs):
+        with self.lock:
+            metric = self.metrics.get(name)
+            if metric is None:
+                metric = self.metrics[name] = metric_class(name, documentation, label_names, **kwargs)
+            elif not isinstance(metric, metric_class):
+                raise ValueError(f"La métrique {name} existe déjà avec un autre type")
+            return metric
+
+    def counter(self, name, documentation, label_names=()):
+        return self._register(Counter, name, documentation, label_names)
+
+    def gauge(self, name, documentation, label_names=()):
+        return self._register(Gauge, name, documentation, label_names)
+
+    def histogram(self, name, documentation, label_names=(), buckets=DEFAULT_BUCKETS):
+        return self._register(Histogram, name, documentation, label_names, buckets=buckets)
+
+    def render(self):
+        """Export au format texte de Prometheus (version 0.0.4)"""
+        lines = []
+        for name in sorted(self.metrics):
+            lines.extend(self.metrics[name].render())
+        return '\n'.join(lines) + '\n'
+
+# Registre global et métriques du cerveau
+REGISTRY = MetricsRegistry()
+
+STAGE_SECONDS = REGISTRY.histogram(
+    'baby_brain_stage_seconds', "Durée des étapes de traitement", ('stage',))
+
+MEMORIES_ADDED = REGISTRY.counter(
+    'baby_brain_memories_added_total', "Souvenirs ajoutés à la mémoire à court terme")
+MEMORIES_MERGED = REGISTRY.counter(
+    'baby_brain_memories_merged_total', "Quasi-doublons fusionnés dans un souvenir existant")
+MEMORIES_CONSOLIDATED = REGISTRY.counter(
+    'baby_brain_memories_consolidated_total', "Souvenirs transférés vers la mémoire à long terme")
+MEMORIES_EVICTED = REGISTRY.counter(
+    'baby_brain_memories_evicted_total', "Souvenirs oubliés par la mémoire à long terme (capacité atteinte)")
+MEMORY_EDGES_CREATED = REGISTRY.counter(
+    'baby_brain_memory_edges_created_total', "Liens créés dans le réseau de mémoire à long terme")
+PAGES_FETCHED = REGISTRY.counter(
+    'baby_brain_pages_fetched_total', "Pages web téléchargées", ('outcome',))
+CACHE_REQUESTS = REGISTRY.counter(
+    'baby_brain_cache_requests_total', "Accès aux caches internes", ('cache', 'result'))
+
+def time_stage(stage):
+    """Mesure la durée d'une étape: `with time_stage('learn'): ...`"""
+    return STAGE_SECONDS.time(stage=stage)
+
+def timed(stage):
+    """Décorateur mesurant la durée de chaque appel de la fonction comme une étape"""
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with time_stage(stage):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
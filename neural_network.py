@@ -8,6 +8,9 @@ import json
 import os
 from datetime import datetime
 
+from profiling import timed_methods
+
+@timed_methods('learn', 'learn_batch', 'evolve_architecture', 'save_brain', 'load_brain')
 class NeuralCore(nn.Module):
     def __init__(self, input_size=100, hidden_size=128, output_size=100):
         """
@@ -74,6 +77,33 @@ class NeuralCore(nn.Module):
         
         return output.detach().numpy(), loss.item()
     
+    def learn_batch(self, input_batch, rewards):
+        """
+        Apprentissage par renforcement sur un lot d'entrées en une seule étape
+        - input_batch: matrice (n, input_size)
+        - rewards: récompense associée à chaque entrée
+        Retourne les sorties (n, output_size) et la perte de chaque élément
+        """
+        self.experience_counter += len(input_batch)
+        
+        x = torch.as_tensor(np.asarray(input_batch), dtype=torch.float32)
+        r = torch.as_tensor(np.asarray(rewards), dtype=torch.float32)
+        
+        # Propagation avant sur tout le lot
+        output = self(x)
+        
+        # Même perte que learn(), calculée par élément puis moyennée
+        novelty = torch.mean(torch.abs(output), dim=1)
+        losses = -r - self.curiosity_factor * novelty
+        loss = losses.mean()
+        
+        # Rétropropagation
+        self.optimizer.zero_grad()
+        loss.backward()
+        self.optimizer.step()
+        
+        return output.detach().numpy(), losses.detach().tolist()
+    
     def evolve_architecture(self):
         """
         Fait évoluer l'architecture du réseau au fil du temps
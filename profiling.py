@@ -0,0 +1,210 @@
+import os
+import sys
+import cProfile
+import functools
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+
+from metrics import REGISTRY
+
+METHOD_SECONDS = REGISTRY.histogram(
+    'baby_brain_method_seconds', "Durée des principales méthodes des composants (si activée)", ('method',))
+
+class SamplingProfiler:
+    """
+    Profileur par échantillonnage: un thread relève périodiquement la pile
+    d'appels du thread observé. Le résultat est écrit au format « collapsed
+    stacks » lu par flamegraph.pl, speedscope, etc.
+    """
+
+    def __init__(self, thread_id=None, interval=0.005):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.samples = Counter()
+        self._stop = threading.Event()
+        self._thread = None
+
+    @staticmethod
+    def _frame_name(frame):
+        code = frame.f_code
+        return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                stack.append(self._frame_name(frame))
+                frame = frame.f_back
+            if stack:
+                self.samples[';'.join(reversed(stack))] += 1
+
+    def start(self):
+        if self.thread_id is None:
+            self.thread_id = threading.get_ident()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._sample, name='sampling-profiler', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def write_collapsed(self, path):
+        with open(path, 'w') as f:
+            for stack, count in self.samples.most_common():
+                f.write(f"{stack} {count}\n")
+
+class Profiler:
+    """
+    Profilage activable à chaud:
+    - arm(): profile les N prochaines interactions (cProfile ou échantillonnage)
+    - session(): profile tout un bloc (par exemple un import complet)
+    - method_timing: mesure la durée des méthodes des composants listées par
+      timed_methods (histogramme baby_brain_method_seconds)
+    Les profils sont écrits dans profile_dir (.pstats pour cProfile,
+    .collapsed pour l'échantillonnage).
+    """
+
+    MODES = ('cprofile', 'sampling')
+
+    def __init__(self, profile_dir='data/profiles'):
+        self.profile_dir = profile_dir
+        self.method_timing = False
+        self.sampling_interval = 0.005
+
+        self.mode = 'cprofile'
+        self.remaining = 0  # Nombre d'interactions restant à profiler
+        self.active = False  # Un seul profil à la fois (cProfile n'est pas réentrant)
+        self.written = []  # Derniers fichiers écrits
+        self.lock = threading.Lock()
+
+    def arm(self, count, mode='cprofile'):
+        """Profile les `count` prochaines interactions"""
+        if mode not in self.MODES:
+            raise ValueError(f"Mode de profilage inconnu: {mode}")
+        with self.lock:
+            self.mode = mode
+            self.remaining = max(0, int(count))
+
+    def state(self):
+        """État du profilage (pour l'interface d'administration)"""
+        with self.lock:
+            return {
+                'mode': self.mode,
+                'remaining': self.remaining,
+                'active': self.active,
+                'method_timing': self.method_timing,
+                'profile_dir': self.profile_dir,
+                'recent_profiles': self.written[-20:]
+            }
+
+    @contextmanager
+    def profile(self, label):
+        """Profile le bloc si une interaction profilée reste à consommer"""
+        with self.lock:
+            armed = self.remaining > 0 and not self.active
+            if armed:
+                self.remaining -= 1
+                self.active = True
+                mode = self.mode
+        if not armed:
+            yield
+            return
+
+        try:
+            with self._run(label, mode):
+                yield
+        finally:
+            with self.lock:
+                self.active = False
+
+    @contextmanager
+    def session(self, label, mode='cprofile'):
+        """Profile tout le bloc, indépendamment des interactions armées"""
+        if mode not in self.MODES:
+            raise ValueError(f"Mode de profilage inconnu: {mode}")
+        with self.lock:
+            busy = self.active
+            self.active = True
+        if busy:
+            print("Un profilage est déjà en cours, la session n'est pas profilée")
+            yield
+            return
+
+        try:
+            with self._run(label, mode):
+                yield
+        finally:
+            with self.lock:
+                self.active = False
+
+    @contextmanager
+    def _run(self, label, mode):
+        os.makedirs(self.profile_dir, exist_ok=True)
+        base = os.path.join(self.profile_dir, f"{label}_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}")
+        start = time.perf_counter()
+
+        if mode == 'cprofile':
+            profiler = cProfile.Profile()
+            profiler.enable()
+            try:
+                yield
+            finally:
+                profiler.disable()
+                path = base + '.pstats'
+                self._write(lambda: profiler.dump_stats(path), path, start)
+        else:
+            profiler = SamplingProfiler(interval=self.sampling_interval)
+            profiler.start()
+            try:
+                yield
+            finally:
+                profiler.stop()
+                path = base + '.collapsed'
+                self._write(lambda: profiler.write_collapsed(path), path, start)
+
+    def _write(self, dump, path, start):
+        try:
+            dump()
+            with self.lock:
+                self.written.append(path)
+            print(f"Profil écrit dans {path} ({time.perf_counter() - start:.3f}s profilées)")
+        except Exception as e:
+            print(f"Erreur lors de l'écriture du profil {path}: {str(e)}")
+
+# Profileur partagé par le cerveau, l'interface web et la ligne de commande
+PROFILER = Profiler()
+
+def timed_methods(*names):
+    """
+    Décorateur de classe: les méthodes nommées sont mesurées dans
+    baby_brain_method_seconds lorsque PROFILER.method_timing est activé
+    (sinon le surcoût se limite à un test booléen). Les méthodes appelées en
+    boucle serrée (NeuralCore.forward, encodeurs statiques) ne sont pas listées
+    """
+    def decorator(cls):
+        for name in names:
+            attribute = vars(cls)[name]  # KeyError: méthode inconnue de la classe
+            if isinstance(attribute, staticmethod):
+                setattr(cls, name, staticmethod(_timed_method(attribute.__func__, f"{cls.__name__}.{name}")))
+            else:
+                setattr(cls, name, _timed_method(attribute, f"{cls.__name__}.{name}"))
+        return cls
+    return decorator
+
+def _timed_method(function, method_name):
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        if not PROFILER.method_timing:
+            return function(*args, **kwargs)
+        start = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            METHOD_SECONDS.observe(time.perf_counter() - start, method=method_name)
+    return wrapper
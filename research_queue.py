@@ -0,0 +1,142 @@
+import threading
+import uuid
+from collections import OrderedDict, deque
+from datetime import datetime
+
+class ResearchQueue:
+    """
+    File de recherches web exécutées en arrière-plan.
+    Une réponse de chat n'attend plus la fin d'une exploration: la recherche
+    est confiée à un thread de travail et son résultat est récupéré ensuite
+    (interrogation périodique ou flux d'événements).
+    Les recherches sont exécutées une par une pour ne pas explorer le web
+    en parallèle avec le même explorateur.
+    """
+
+    def __init__(self, max_jobs=200, on_change=None):
+        """
+        - max_jobs: nombre de recherches conservées
+        - on_change: fonction appelée (sans argument) à chaque changement d'état
+        """
+        self.max_jobs = max_jobs
+        self.on_change = on_change
+        self.jobs = OrderedDict()  # id -> description de la recherche
+        self.pending = deque()
+        self.counts = {'pending': 0, 'running': 0, 'done': 0, 'error': 0}  # Tenus à jour à chaque transition
+
+        self.condition = threading.Condition()
+        self.worker = None
+
+    def submit(self, query, task):
+        """
+        Ajoute une recherche à la file et retourne son identifiant
+        - query: question à l'origine de la recherche
+        - task: fonction sans argument exécutée en arrière-plan, dont le
+          résultat (dictionnaire) est stocké dans la recherche
+        """
+        job_id = uuid.uuid4().hex
+        job = {
+            'id': job_id,
+            'query': query,
+            'status': 'pending',
+            'result': None,
+            'error': None,
+            'created_at': datetime.now().isoformat(),
+            'finished_at': None
+        }
+
+        with self.condition:
+            self.jobs[job_id] = job
+            self.counts['pending'] += 1
+            self.pending.append((job_id, task))
+            self._prune()
+            self._ensure_worker()
+            self.condition.notify_all()
+        self._changed()
+
+        return job_id
+
+    def _changed(self):
+        """Prévient l'observateur d'un changement d'état (hors verrou)"""
+        if self.on_change is not None:
+            try:
+                self.on_change()
+            except Exception as e:
+                print(f"Erreur lors de la notification d'une recherche: {str(e)}")
+
+    def _ensure_worker(self):
+        """Démarre le thread de travail s'il n'est pas déjà actif"""
+        if self.worker is None or not self.worker.is_alive():
+            self.worker = threading.Thread(target=self._run, name='research-queue', daemon=True)
+            self.worker.start()
+
+    def _prune(self):
+        """Oublie les plus anciennes recherches terminées au-delà de max_jobs"""
+        finished = [job_id for job_id, job in self.jobs.items() if job['status'] in ('done', 'error')]
+        for job_id in finished[:max(0, len(self.jobs) - self.max_jobs)]:
+            self.counts[self.jobs.pop(job_id)['status']] -= 1
+
+    def _run(self):
+        """Boucle du thread de travail"""
+        while True:
+            with self.condition:
+                while not self.pending:
+                    self.condition.wait()
+                job_id, task = self.pending.popleft()
+                job = self.jobs.get(job_id)
+                if job is None:
+                    continue
+                self._set_status(job, 'running')
+                self.condition.notify_all()
+            self._changed()
+
+            try:
+                result = task()
+                status, error = 'done', None
+            except Exception as e:
+                print(f"Erreur lors de la recherche en arrière-plan: {str(e)}")
+                result, status, error = None, 'error', str(e)
+
+            with self.condition:
+                job['result'] = result
+                job['error'] = error
+                job['finished_at'] = datetime.now().isoformat()
+                self._set_status(job, status)
+                self.condition.notify_all()
+            self._changed()
+
+    def _set_status(self, job, status):
+        """Change l'état d'une recherche en tenant les compteurs à jour"""
+        self.counts[job['status']] -= 1
+        self.counts[status] += 1
+        job['status'] = status
+
+    def get(self, job_id):
+        """Retourne une copie de la recherche, ou None si elle est inconnue"""
+        with self.condition:
+            job = self.jobs.get(job_id)
+            return dict(job) if job is not None else None
+
+    def wait(self, job_id, timeout=None, known_status=None):
+        """
+        Attend qu'une recherche change d'état (ou se termine) puis la retourne
+        - known_status: dernier état connu par l'appelant; None pour attendre la fin
+        Retourne la recherche dans son état courant à l'expiration du délai
+        """
+        def changed():
+            job = self.jobs.get(job_id)
+            if job is None:
+                return True
+            if known_status is None:
+                return job['status'] in ('done', 'error')
+            return job['status'] != known_status
+
+        with self.condition:
+            self.condition.wait_for(changed, timeout)
+            job = self.jobs.get(job_id)
+            return dict(job) if job is not None else None
+
+    def stats(self):
+        """Nombre de recherches par état"""
+        with self.condition:
+            return dict(self.counts)
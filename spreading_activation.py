@@ -0,0 +1,192 @@
+import threading
+
+import numpy as np
+from scipy import sparse
+
+class SpreadingActivation:
+    """
+    Propagation d'activation dans le réseau de mémoire à long terme.
+    Les souvenirs les plus proches de la requête (cosinus) reçoivent une
+    activation initiale qui se propage ensuite le long des liens pondérés
+    pendant quelques pas, façon PageRank personnalisé:
+        a <- (1 - damping) * graine + damping * Pᵀ a
+    où P est la matrice des liens normalisée par ligne. Les poids bruts sont
+    gardés dans une matrice creuse (CSR) et le poids sortant de chaque nœud
+    à part: Pᵀ a = Aᵀ (a / poids sortant). Les liens ajoutés au réseau
+    (consolidation, promotion) sont notifiés par append_edges et gardés en
+    attente à côté de la matrice, fusionnés quand ils deviennent nombreux;
+    la matrice n'est reconstruite depuis le réseau qu'après une suppression
+    ou un changement non notifié. Tant que peu de souvenirs sont actifs,
+    seules leurs lignes sont parcourues: le coût d'un pas dépend du
+    voisinage atteint et non de la taille du réseau.
+    """
+
+    def __init__(self, damping=0.5, steps=3, merge_ratio=0.1):
+        """
+        - damping: part de l'activation transmise aux voisins à chaque pas
+        - steps: nombre de pas de propagation
+        - merge_ratio: part des liens de la matrice au-delà de laquelle les liens
+          en attente y sont fusionnés
+        """
+        self.damping = damping
+        self.steps = steps
+        self.merge_ratio = merge_ratio
+
+        self.version = None  # Version des liens du réseau représentée par la matrice
+        self.node_ids = np.zeros(0, dtype=np.int64)  # index -> id du souvenir
+        self.index_of = {}  # id du souvenir -> index
+        self.adjacency = None  # A (CSR): adjacency[i, j] = poids(i -> j), liens positifs
+        self.out_weight = np.zeros(0)  # Poids sortant de chaque nœud (matrice et liens en attente)
+        self.pending = (np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0))
+        self.lock = threading.Lock()
+        self.stats = {'builds': 0, 'appends': 0, 'merges': 0}
+
+    @staticmethod
+    def _snapshot(graph):
+        """
+        Copie des nœuds et des liens du réseau lue d'un seul passage (l'appelant
+        tient le verrou de la mémoire: le réseau ne change pas pendant la lecture)
+        Retourne (ids des nœuds, id -> index, degrés sortants, index des cibles, poids)
+        """
+        node_ids = list(graph.nodes())
+        index_of = {node_id: i for i, node_id in enumerate(node_ids)}
+        degrees, targets, weights = [], [], []
+        for _, neighbours in graph.adjacency():
+            degrees.append(len(neighbours))
+            targets.extend(map(index_of.__getitem__, neighbours))
+            weights.extend(data.get('weight', 1.0) for data in neighbours.values())
+        return node_ids, index_of, degrees, targets, weights
+
+    def _build(self, graph, version):
+        """Construit la matrice des liens à partir d'une copie du réseau"""
+        node_ids, index_of, degrees, targets, weights = self._snapshot(graph)
+        sources = np.repeat(np.arange(len(node_ids)), degrees)
+        targets = np.array(targets, dtype=np.int64)
+        weights = np.array(weights, dtype=np.float64)
+
+        # Seuls les liens positifs transmettent de l'activation
+        positive = weights > 0
+        sources, targets, weights = sources[positive], targets[positive], weights[positive]
+
+        self.adjacency = sparse.csr_matrix((weights, (sources, targets)),
+                                           shape=(len(node_ids), len(node_ids)))
+        self.out_weight = np.bincount(sources, weights=weights, minlength=len(node_ids))
+        self.pending = (np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0))
+        self.node_ids = np.array(node_ids, dtype=np.int64)
+        self.index_of = index_of
+        self.version = version
+        self.stats['builds'] += 1
+
+    def _merge_pending(self):
+        """Fusionne les liens en attente dans la matrice"""
+        sources, targets, weights = self.pending
+        size = len(self.node_ids)
+        added = sparse.csr_matrix((weights, (sources, targets)), shape=(size, size))
+        adjacency = self.adjacency.copy()
+        adjacency.resize((size, size))
+        self.adjacency = (adjacency + added).tocsr()
+        self.pending = (np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0))
+        self.stats['merges'] += 1
+
+    def append_edges(self, previous_version, version, node_ids, edges):
+        """
+        Ajoute à la matrice des nœuds et des liens nouveaux sans la reconstruire
+        - previous_version: version des liens avant l'ajout (si la matrice ne la
+          représente pas, rien n'est fait: elle sera reconstruite à la prochaine requête)
+        - version: version des liens après l'ajout
+        - node_ids: ids des nœuds ajoutés au réseau
+        - edges: liens (source, cible, poids) ajoutés, chacun une seule fois et
+          jamais un lien déjà présent (son poids serait compté deux fois)
+        L'appelant tient le verrou de la mémoire, comme pour propagate.
+        """
+        with self.lock:
+            if self.version is None or self.version != previous_version:
+                return
+            new_ids = [node_id for node_id in node_ids if node_id not in self.index_of]
+            for node_id in new_ids:
+                self.index_of[node_id] = len(self.index_of)
+            if new_ids:
+                self.node_ids = np.concatenate([self.node_ids, np.array(new_ids, dtype=np.int64)])
+
+            edges = [(source, target, weight) for source, target, weight in edges if weight > 0]
+            sources = np.fromiter((self.index_of[source] for source, _, _ in edges), dtype=np.int64, count=len(edges))
+            targets = np.fromiter((self.index_of[target] for _, target, _ in edges), dtype=np.int64, count=len(edges))
+            weights = np.fromiter((weight for _, _, weight in edges), dtype=np.float64, count=len(edges))
+
+            out_weight = np.zeros(len(self.node_ids))
+            out_weight[:self.out_weight.size] = self.out_weight
+            out_weight += np.bincount(sources, weights=weights, minlength=len(self.node_ids))
+            self.out_weight = out_weight
+            self.pending = tuple(np.concatenate([old, new]) for old, new in zip(self.pending, (sources, targets, weights)))
+            if self.pending[0].size > self.merge_ratio * max(self.adjacency.nnz, 1000):
+                self._merge_pending()
+            self.version = version
+            self.stats['appends'] += 1
+
+    def propagate(self, graph, version, seeds, top_k=3, steps=None):
+        """
+        Retourne les top_k couples (id du souvenir, activation) après propagation
+        - seeds: {id du souvenir: activation initiale} (normalisée pour sommer à 1)
+        - version: version des liens du réseau, la matrice est reconstruite si elle a
+          changé (l'appelant tient alors le verrou qui protège le réseau, voir MemorySystem.lock)
+        Les graines absentes du réseau (mémoire à court terme) gardent leur part
+        initiale sans la propager.
+        """
+        steps = self.steps if steps is None else steps
+        total = sum(value for value in seeds.values() if value > 0)
+        if total <= 0 or top_k <= 0:
+            return []
+
+        with self.lock:
+            if self.version != version:
+                self._build(graph, version)
+            adjacency, out_weight, pending = self.adjacency, self.out_weight, self.pending
+            node_ids, index_of = self.node_ids, self.index_of
+            seed_vector = np.zeros(len(node_ids))
+            outside = {}
+            for memory_id, value in seeds.items():
+                if value <= 0:
+                    continue
+                if memory_id in index_of:
+                    seed_vector[index_of[memory_id]] = value / total
+                else:
+                    outside[memory_id] = (1 - self.damping) * value / total
+
+        # Activation transmise par unité de poids sortant (nœuds sans lien: rien)
+        scale = np.divide(1.0, out_weight, out=np.zeros_like(out_weight), where=out_weight > 0)
+        rows = adjacency.shape[0]
+        pending_sources, pending_targets, pending_weights = pending
+
+        activation = seed_vector
+        for _ in range(steps):
+            sent = activation * scale
+            active = np.flatnonzero(sent[:rows])
+            if active.size < rows // 10:
+                # Propagation limitée aux lignes des souvenirs actifs
+                spread = adjacency[active].T @ sent[active]
+            else:
+                spread = adjacency.T @ sent[:rows]
+            if spread.size < len(node_ids):
+                spread = np.concatenate([spread, np.zeros(len(node_ids) - spread.size)])
+            if pending_sources.size:
+                spread += np.bincount(pending_targets, weights=pending_weights * sent[pending_sources],
+                                      minlength=len(node_ids))
+            activation = (1 - self.damping) * seed_vector + self.damping * spread
+
+        candidates = np.nonzero(activation)[0]
+        k = min(top_k, candidates.size)
+        if k < candidates.size:
+            candidates = candidates[np.argpartition(-activation[candidates], k - 1)[:k]]
+        results = [(int(node_ids[i]), float(activation[i])) for i in candidates]
+        results.extend(outside.items())
+        results.sort(key=lambda item: item[1], reverse=True)
+        return results[:top_k]
+
+    def clear(self):
+        with self.lock:
+            self.version = None
+            self.node_ids = np.zeros(0, dtype=np.int64)
+            self.index_of = {}
+            self.adjacency = None
+            self.out_weight = np.zeros(0)
+            self.pending = (np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0))
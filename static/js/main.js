@@ -21,29 +21,37 @@ document.addEventListener('DOMContentLoaded', function() {
     const closeModal = document.getElementById('close-modal-btn');
     const closeVisualizationBtn = document.getElementById('close-visualization-btn');
     const memoryVisualization = document.getElementById('memory-visualization');
+    const memoryGraphCanvas = document.getElementById('memory-graph-canvas');
+    const memoryGraphInfo = document.getElementById('memory-graph-info');
+    const loadMoreNodesBtn = document.getElementById('load-more-nodes-btn');
+    const staticVisualizationBtn = document.getElementById('static-visualization-btn');
 
     // État
     let messageHistory = {}; // Historique des messages
 
+    // Affichage des statistiques
+    function applyStats(stats) {
+        document.getElementById('experience-counter').textContent = 
+            stats.neural_network.experience_counter;
+        document.getElementById('curiosity-factor').textContent = 
+            stats.neural_network.curiosity_factor.toFixed(2);
+        document.getElementById('stm-size').textContent = 
+            stats.memory.stm_size;
+        document.getElementById('ltm-size').textContent = 
+            stats.memory.ltm_size;
+        document.getElementById('exploration-rate').textContent = 
+            stats.learning.exploration_rate.toFixed(2);
+        document.getElementById('concepts-count').textContent = 
+            stats.learning.concepts_count;
+    }
+
     // Mise à jour des statistiques
     function updateStats() {
         fetch('/api/status')
             .then(response => response.json())
             .then(data => {
                 if (data.status === 'active') {
-                    // Mise à jour des valeurs
-                    document.getElementById('experience-counter').textContent = 
-                        data.stats.neural_network.experience_counter;
-                    document.getElementById('curiosity-factor').textContent = 
-                        data.stats.neural_network.curiosity_factor.toFixed(2);
-                    document.getElementById('stm-size').textContent = 
-                        data.stats.memory.stm_size;
-                    document.getElementById('ltm-size').textContent = 
-                        data.stats.memory.ltm_size;
-                    document.getElementById('exploration-rate').textContent = 
-                        data.stats.learning.exploration_rate.toFixed(2);
-                    document.getElementById('concepts-count').textContent = 
-                        data.stats.learning.concepts_count;
+                    applyStats(data.stats);
                 }
             })
             .catch(error => {
@@ -156,6 +164,22 @@ document.addEventListener('DOMContentLoaded', function() {
         });
     }
     
+    // Affiche la réponse du cerveau à un message
+    function showResponse(data) {
+        // Générer un ID unique pour le message
+        const messageId = Date.now().toString();
+        
+        // Stocker les détails du message pour le feedback futur
+        messageHistory[messageId] = {
+            input: data.input,
+            output: data.response,
+            timestamp: data.timestamp
+        };
+        
+        // Ajouter le message avec les boutons de feedback
+        addMessage(data.response, 'ai', messageId);
+    }
+
     // Envoi d'un message au cerveau
     function sendMessage() {
         const message = userInput.value.trim();
@@ -172,6 +196,12 @@ document.addEventListener('DOMContentLoaded', function() {
         // Réinitialise l'entrée
         userInput.value = '';
         
+        // Réponse diffusée étape par étape si le navigateur sait lire un flux
+        if (window.ReadableStream && window.TextDecoder) {
+            sendMessageStream(data);
+            return;
+        }
+        
         // Envoie la requête
         fetch('/api/interact', {
             method: 'POST',
@@ -183,18 +213,12 @@ document.addEventListener('DOMContentLoaded', function() {
         .then(response => response.json())
         .then(data => {
             if (data.status === 'success') {
-                // Générer un ID unique pour le message
-                const messageId = Date.now().toString();
-                
-                // Stocker les détails du message pour le feedback futur
-                messageHistory[messageId] = {
-                    input: data.input,
-                    output: data.response,
-                    timestamp: data.timestamp
-                };
+                showResponse(data);
                 
-                // Ajouter le message avec les boutons de feedback
-                addMessage(data.response, 'ai', messageId);
+                // Une recherche sur internet continue en arrière-plan
+                if (data.research) {
+                    followResearch(data.research, data.input);
+                }
                 
                 // Met à jour les statistiques
                 updateStats();
@@ -208,6 +232,142 @@ document.addEventListener('DOMContentLoaded', function() {
         });
     }
 
+    // Envoi d'un message avec réponse diffusée (server-sent events sur POST)
+    function sendMessageStream(data) {
+        const handlers = {
+            response: function(event) {
+                showResponse(event);
+            },
+            status: function(stats) {
+                applyStats(stats);
+            },
+            research: function(research) {
+                if (research.status === 'done' || research.status === 'error' || research.status === 'unknown') {
+                    showResearchResult(research, data.message);
+                }
+            },
+            error: function(event) {
+                addSystemMessage(event.message);
+            }
+        };
+        
+        fetch('/api/interact/stream', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json'
+            },
+            body: JSON.stringify(data)
+        })
+        .then(response => {
+            if (!response.ok) {
+                return response.json().then(data => {
+                    addSystemMessage(`Erreur: ${data.message}`);
+                });
+            }
+            return readEventStream(response, handlers);
+        })
+        .catch(error => {
+            console.error('Erreur lors de l\'interaction:', error);
+            addSystemMessage('Erreur de communication avec le cerveau.');
+        });
+    }
+
+    // Lit un flux server-sent events et appelle le gestionnaire de chaque événement
+    function readEventStream(response, handlers) {
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+        
+        function dispatch(block) {
+            let event = 'message';
+            const dataLines = [];
+            block.split('\n').forEach(line => {
+                if (line.startsWith('event:')) {
+                    event = line.slice(6).trim();
+                } else if (line.startsWith('data:')) {
+                    dataLines.push(line.slice(5).trim());
+                }
+            });
+            if (dataLines.length && handlers[event]) {
+                handlers[event](JSON.parse(dataLines.join('\n')));
+            }
+        }
+        
+        function pump() {
+            return reader.read().then(({ done, value }) => {
+                if (done) {
+                    if (buffer.trim()) {
+                        dispatch(buffer);
+                    }
+                    return;
+                }
+                buffer += decoder.decode(value, { stream: true });
+                let boundary;
+                while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+                    dispatch(buffer.slice(0, boundary));
+                    buffer = buffer.slice(boundary + 2);
+                }
+                return pump();
+            });
+        }
+        
+        return pump();
+    }
+
+    // Affiche le résultat d'une recherche web en arrière-plan
+    function showResearchResult(research, input) {
+        if (research.status === 'done' && research.response) {
+            const messageId = Date.now().toString();
+            messageHistory[messageId] = {
+                input: input,
+                output: research.response,
+                timestamp: research.finished_at
+            };
+            addMessage(research.response, 'ai', messageId);
+            updateStats();
+        } else {
+            addSystemMessage('La recherche sur internet a échoué.');
+        }
+    }
+
+    // Suit une recherche web en arrière-plan (flux d'événements, sinon interrogation)
+    function followResearch(research, input) {
+        if (window.EventSource) {
+            const source = new EventSource(research.events_url);
+            source.addEventListener('research', function(event) {
+                const data = JSON.parse(event.data);
+                if (data.status === 'done' || data.status === 'error' || data.status === 'unknown') {
+                    source.close();
+                    showResearchResult(data, input);
+                }
+            });
+            source.onerror = function() {
+                source.close();
+                pollResearch(research.poll_url, input);
+            };
+        } else {
+            pollResearch(research.poll_url, input);
+        }
+    }
+
+    function pollResearch(pollUrl, input) {
+        fetch(pollUrl + '?wait=25')
+            .then(response => response.json())
+            .then(data => {
+                if (data.status !== 'success') {
+                    addSystemMessage('La recherche sur internet a échoué.');
+                } else if (data.research.status === 'done' || data.research.status === 'error') {
+                    showResearchResult(data.research, input);
+                } else {
+                    pollResearch(pollUrl, input);
+                }
+            })
+            .catch(error => {
+                console.error('Erreur lors du suivi de la recherche:', error);
+                addSystemMessage('Erreur de communication avec le cerveau.');
+            });
+    }
+
     // Exploration web
     function exploreWeb() {
         const pages = parseInt(maxPages.value) || 3;
@@ -319,17 +479,23 @@ document.addEventListener('DOMContentLoaded', function() {
         });
     }
 
-    // Visualisation de la mémoire
+    // Visualisation de la mémoire sous forme d'image (rendue en arrière-plan: une
+    // image plus ancienne peut être affichée puis remplacée quand le rendu est terminé)
     function visualizeMemory() {
-        fetch('/api/visualize_memory')
+        fetch('/api/visualize_memory?wait=5')
             .then(response => response.json())
             .then(data => {
-                if (data.status === 'success') {
-                    // Affiche l'image
-                    memoryVisualization.src = data.visualization_url;
+                if (data.status === 'success' || data.status === 'pending') {
+                    if (data.visualization_url) {
+                        memoryVisualization.src = data.visualization_url;
+                    }
+                    memoryGraphCanvas.style.display = 'none';
+                    memoryVisualization.style.display = '';
                     // Montre explicitement la modal
                     visualizationModal.style.display = 'flex';
-                    console.log('Modal affichée');
+                    if (data.rendering) {
+                        refreshVisualization();
+                    }
                 } else {
                     addSystemMessage('Erreur: ' + data.message);
                 }
@@ -340,6 +506,204 @@ document.addEventListener('DOMContentLoaded', function() {
             });
     }
 
+    // Attend la fin du rendu en cours tant que la modal est ouverte
+    function refreshVisualization() {
+        if (visualizationModal.style.display === 'none') {
+            return;
+        }
+        fetch('/api/visualize_memory?wait=20')
+            .then(response => response.json())
+            .then(data => {
+                if (data.visualization_url && !memoryVisualization.src.endsWith(data.visualization_url)) {
+                    memoryVisualization.src = data.visualization_url;
+                }
+                if (data.rendering) {
+                    setTimeout(refreshVisualization, 1000);
+                }
+            })
+            .catch(error => console.error('Erreur lors du rafraîchissement de la visualisation:', error));
+    }
+
+    // Rendu du réseau de mémoire dans le navigateur: les nœuds (classés par
+    // importance) arrivent par pages avec leurs positions précalculées
+    const GRAPH_PAGE_SIZE = 300;
+    const GRAPH_COLORS = ['#1f77b4', '#ff7f0e', '#2ca02c', '#d62728', '#9467bd',
+                          '#8c564b', '#e377c2', '#7f7f7f', '#bcbd22', '#17becf'];
+    let memoryGraph = null;
+    let graphView = { scale: 1, x: 0, y: 0 };
+
+    function openMemoryGraph() {
+        memoryGraph = { nodes: new Map(), edges: [], groups: new Map(), total: 0, loaded: 0, hasMore: false };
+        memoryVisualization.style.display = 'none';
+        memoryGraphCanvas.style.display = '';
+        visualizationModal.style.display = 'flex';
+        resizeGraphCanvas();
+        loadGraphPage(0);
+    }
+
+    function loadGraphPage(offset) {
+        loadMoreNodesBtn.disabled = true;
+        fetch(`/api/memory_graph?max_nodes=${GRAPH_PAGE_SIZE}&offset=${offset}`)
+            .then(response => response.json())
+            .then(data => {
+                if (data.status !== 'success') {
+                    addSystemMessage('Erreur: ' + data.message);
+                    return;
+                }
+                data.nodes.forEach(([id, x, y, importance, group, label]) => {
+                    const groupName = data.groups[group];
+                    if (!memoryGraph.groups.has(groupName)) {
+                        memoryGraph.groups.set(groupName, memoryGraph.groups.size);
+                    }
+                    memoryGraph.nodes.set(id, {
+                        x: x, y: y, importance: importance, label: label,
+                        color: GRAPH_COLORS[memoryGraph.groups.get(groupName) % GRAPH_COLORS.length]
+                    });
+                });
+                memoryGraph.edges.push(...data.edges);
+                memoryGraph.loaded = offset + data.nodes.length;
+                memoryGraph.total = data.total_nodes;
+                memoryGraph.hasMore = data.has_more;
+                if (offset === 0) {
+                    fitGraphView();
+                }
+                drawMemoryGraph();
+            })
+            .catch(error => {
+                console.error('Erreur lors du chargement du réseau de mémoire:', error);
+                addSystemMessage('Erreur de communication avec le système de mémoire.');
+            })
+            .finally(() => {
+                loadMoreNodesBtn.disabled = !memoryGraph.hasMore;
+            });
+    }
+
+    function resizeGraphCanvas() {
+        const ratio = window.devicePixelRatio || 1;
+        memoryGraphCanvas.width = memoryGraphCanvas.clientWidth * ratio;
+        memoryGraphCanvas.height = memoryGraphCanvas.clientHeight * ratio;
+    }
+
+    // Cadre la vue sur l'ensemble des nœuds chargés
+    function fitGraphView() {
+        const nodes = Array.from(memoryGraph.nodes.values());
+        if (nodes.length === 0) {
+            graphView = { scale: 1, x: memoryGraphCanvas.width / 2, y: memoryGraphCanvas.height / 2 };
+            return;
+        }
+        const xs = nodes.map(node => node.x);
+        const ys = nodes.map(node => node.y);
+        const minX = Math.min(...xs), maxX = Math.max(...xs);
+        const minY = Math.min(...ys), maxY = Math.max(...ys);
+        const margin = 40 * (window.devicePixelRatio || 1);
+        const scale = Math.min((memoryGraphCanvas.width - 2 * margin) / Math.max(maxX - minX, 1e-6),
+                               (memoryGraphCanvas.height - 2 * margin) / Math.max(maxY - minY, 1e-6));
+        graphView = {
+            scale: scale,
+            x: memoryGraphCanvas.width / 2 - scale * (minX + maxX) / 2,
+            y: memoryGraphCanvas.height / 2 + scale * (minY + maxY) / 2
+        };
+    }
+
+    function graphToScreen(node) {
+        return [graphView.x + node.x * graphView.scale, graphView.y - node.y * graphView.scale];
+    }
+
+    function drawMemoryGraph() {
+        const context = memoryGraphCanvas.getContext('2d');
+        const ratio = window.devicePixelRatio || 1;
+        context.clearRect(0, 0, memoryGraphCanvas.width, memoryGraphCanvas.height);
+
+        if (memoryGraph.nodes.size === 0) {
+            context.fillStyle = '#3498db';
+            context.font = `${16 * ratio}px sans-serif`;
+            context.textAlign = 'center';
+            context.fillText('Le réseau de mémoire est vide. Le cerveau commence à apprendre...',
+                             memoryGraphCanvas.width / 2, memoryGraphCanvas.height / 2);
+            memoryGraphInfo.textContent = '';
+            return;
+        }
+
+        // Liens: un seul tracé pour tous les segments
+        context.strokeStyle = 'rgba(128, 128, 128, 0.25)';
+        context.lineWidth = ratio;
+        context.beginPath();
+        memoryGraph.edges.forEach(([source, target]) => {
+            const a = memoryGraph.nodes.get(source);
+            const b = memoryGraph.nodes.get(target);
+            if (a && b) {
+                const [ax, ay] = graphToScreen(a);
+                const [bx, by] = graphToScreen(b);
+                context.moveTo(ax, ay);
+                context.lineTo(bx, by);
+            }
+        });
+        context.stroke();
+
+        // Nœuds: taille selon l'importance, couleur selon le groupe
+        const width = memoryGraphCanvas.width, height = memoryGraphCanvas.height;
+        const labels = [];
+        memoryGraph.nodes.forEach(node => {
+            const [x, y] = graphToScreen(node);
+            if (x < -20 || y < -20 || x > width + 20 || y > height + 20) {
+                return;
+            }
+            const radius = (3 + node.importance * 7) * ratio;
+            context.globalAlpha = 0.75;
+            context.fillStyle = node.color;
+            context.beginPath();
+            context.arc(x, y, radius, 0, 2 * Math.PI);
+            context.fill();
+            labels.push([x, y + radius, node]);
+        });
+        context.globalAlpha = 1;
+
+        // Étiquettes seulement quand le zoom laisse assez de place entre les nœuds visibles
+        if (labels.length <= 150) {
+            context.fillStyle = '#2c3e50';
+            context.font = `${10 * ratio}px sans-serif`;
+            context.textAlign = 'center';
+            context.textBaseline = 'top';
+            labels.forEach(([x, y, node]) => context.fillText(node.label, x, y + 2 * ratio));
+        }
+
+        memoryGraphInfo.textContent = `${memoryGraph.nodes.size} nœuds affichés sur ${memoryGraph.total}, ` +
+            `${memoryGraph.edges.length} liens (molette: zoom, glisser: déplacer)`;
+    }
+
+    // Zoom autour du curseur
+    memoryGraphCanvas.addEventListener('wheel', function(event) {
+        event.preventDefault();
+        const ratio = window.devicePixelRatio || 1;
+        const factor = event.deltaY < 0 ? 1.2 : 1 / 1.2;
+        const mouseX = event.offsetX * ratio, mouseY = event.offsetY * ratio;
+        graphView.x = mouseX - (mouseX - graphView.x) * factor;
+        graphView.y = mouseY - (mouseY - graphView.y) * factor;
+        graphView.scale *= factor;
+        drawMemoryGraph();
+    });
+
+    // Déplacement de la vue par glisser-déposer
+    let graphDrag = null;
+    memoryGraphCanvas.addEventListener('mousedown', function(event) {
+        graphDrag = { x: event.clientX, y: event.clientY };
+        memoryGraphCanvas.style.cursor = 'grabbing';
+    });
+    window.addEventListener('mousemove', function(event) {
+        if (!graphDrag) {
+            return;
+        }
+        const ratio = window.devicePixelRatio || 1;
+        graphView.x += (event.clientX - graphDrag.x) * ratio;
+        graphView.y += (event.clientY - graphDrag.y) * ratio;
+        graphDrag = { x: event.clientX, y: event.clientY };
+        drawMemoryGraph();
+    });
+    window.addEventListener('mouseup', function() {
+        graphDrag = null;
+        memoryGraphCanvas.style.cursor = 'grab';
+    });
+
     // Sauvegarde du cerveau
     function saveBrain() {
         fetch('/api/save_brain', { method: 'POST' })
@@ -368,7 +732,13 @@ document.addEventListener('DOMContentLoaded', function() {
     exploreBtn.addEventListener('click', exploreWeb);
     addUrlBtn.addEventListener('click', addUrl);
     searchMemoryBtn.addEventListener('click', searchMemory);
-    visualizeMemoryBtn.addEventListener('click', visualizeMemory);
+    visualizeMemoryBtn.addEventListener('click', openMemoryGraph);
+    staticVisualizationBtn.addEventListener('click', visualizeMemory);
+    loadMoreNodesBtn.addEventListener('click', function() {
+        if (memoryGraph && memoryGraph.hasMore) {
+            loadGraphPage(memoryGraph.loaded);
+        }
+    });
     saveBrainBtn.addEventListener('click', saveBrain);
     
     closeMemoryBtn.addEventListener('click', function() {
@@ -409,9 +779,33 @@ document.addEventListener('DOMContentLoaded', function() {
         }
     });
     
-    // Mise à jour initiale des statistiques
-    updateStats();
-    
-    // Mise à jour périodique des statistiques (toutes les 10 secondes)
-    setInterval(updateStats, 10000);
+    // Suivi des statistiques: le serveur ne répond que lorsque le statut change
+    // (long-poll avec ETag), au lieu d'une interrogation toutes les 10 secondes
+    let statusEtag = null;
+    function watchStats() {
+        const headers = statusEtag ? { 'If-None-Match': statusEtag } : {};
+        fetch('/api/status?wait=30', { headers: headers, cache: 'no-store' })
+            .then(response => {
+                if (response.status === 304) {
+                    return null;
+                }
+                if (!response.ok) {
+                    throw new Error(`Statut HTTP ${response.status}`);
+                }
+                statusEtag = response.headers.get('ETag');
+                return response.json();
+            })
+            .then(data => {
+                if (data && data.status === 'active') {
+                    applyStats(data.stats);
+                }
+                watchStats();
+            })
+            .catch(error => {
+                console.error('Erreur lors de la récupération du statut:', error);
+                // Nouvel essai plus tard si le serveur est indisponible
+                setTimeout(watchStats, 10000);
+            });
+    }
+    watchStats();
 });
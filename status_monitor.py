@@ -0,0 +1,82 @@
+import json
+import hashlib
+import threading
+import time
+from datetime import datetime
+
+from metrics import CACHE_REQUESTS
+
+class StatusMonitor:
+    """
+    Instantané versionné des statistiques du cerveau.
+    Les points de modification de l'état appellent notify(), qui incrémente
+    un compteur de changements; les statistiques ne sont recollectées (et le
+    JSON regénéré) que lorsque ce compteur a avancé. Chaque version a un ETag
+    stable pour que les clients puissent recevoir un 304 ou attendre un
+    changement. Le champ `timestamp` du corps est la date de création de la
+    version: il est figé avec l'ETag et ne reflète pas l'heure de la requête.
+    """
+
+    def __init__(self, collect):
+        """
+        - collect: fonction retournant le dictionnaire des statistiques
+        """
+        self.collect = collect
+
+        self.condition = threading.Condition()
+        self.changes = 0
+        self.version = 0
+        self.etag = None
+        self.body = None
+        self.stats = None
+        self._collected_changes = None
+
+    def snapshot(self):
+        """Retourne (version, etag, corps JSON, statistiques) à jour"""
+        with self.condition:
+            if self._collected_changes != self.changes:
+                CACHE_REQUESTS.inc(cache='status', result='miss')
+                self._collected_changes = self.changes
+                self._refresh()
+            else:
+                CACHE_REQUESTS.inc(cache='status', result='hit')
+            return self.version, self.etag, self.body, self.stats
+
+    def _refresh(self):
+        """Recollecte les statistiques; la version n'avance que si elles ont changé"""
+        stats = self.collect()
+        stats_json = json.dumps(stats, sort_keys=True)
+        etag = '"' + hashlib.blake2b(stats_json.encode('utf-8'), digest_size=8).hexdigest() + '"'
+        if etag == self.etag:
+            return
+
+        self.version += 1
+        self.etag = etag
+        self.stats = stats
+        self.body = json.dumps({
+            'status': 'active',
+            'version': self.version,
+            'timestamp': datetime.now().isoformat(),
+            'stats': stats
+        })
+        self.condition.notify_all()
+
+    def notify(self):
+        """Signale une modification de l'état (réveille les clients en attente)"""
+        with self.condition:
+            self.changes += 1
+            self.snapshot()
+
+    def wait_for_change(self, etag, timeout):
+        """
+        Attend que l'ETag diffère de celui connu du client, au plus `timeout`
+        secondes, puis retourne l'instantané courant
+        """
+        deadline = time.monotonic() + timeout
+        with self.condition:
+            while True:
+                snapshot = self.snapshot()
+                remaining = deadline - time.monotonic()
+                if snapshot[1] != etag or remaining <= 0:
+                    return snapshot
+                self.condition.wait(remaining)
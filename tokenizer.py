@@ -0,0 +1,58 @@
+import re
+import unicodedata
+
+# Mots: suites de lettres et de chiffres; les élisions sont séparées (« l'homme » -> l, homme)
+TOKEN_PATTERN = re.compile(r'\w+')
+
+# Apostrophes typographiques ramenées à l'apostrophe simple
+APOSTROPHES = ('’', '‘', 'ʼ')
+
+def normalize(text):
+    """
+    Forme normalisée d'un texte: composition Unicode (NFC, pour que les
+    accents décomposés restent dans le mot), apostrophes simples et casse
+    repliée (casefold)
+    """
+    if not text.isascii():
+        text = unicodedata.normalize('NFC', text)
+        for apostrophe in APOSTROPHES:
+            text = text.replace(apostrophe, "'")
+    return text.casefold()
+
+class TokenizedText:
+    """
+    Texte découpé une seule fois et partagé entre les composants (encodage,
+    vocabulaire, doublons, évaluation de l'intérêt).
+    La forme normalisée et les mots ne sont calculés qu'au premier accès.
+    """
+
+    __slots__ = ('text', '_normalized', '_tokens')
+
+    def __init__(self, text):
+        self.text = text
+        self._normalized = None
+        self._tokens = None
+
+    @property
+    def normalized(self):
+        if self._normalized is None:
+            self._normalized = normalize(self.text)
+        return self._normalized
+
+    @property
+    def tokens(self):
+        if self._tokens is None:
+            self._tokens = TOKEN_PATTERN.findall(self.normalized)
+        return self._tokens
+
+    def __len__(self):
+        return len(self.tokens)
+
+    def __str__(self):
+        return self.text
+
+def tokenize(text):
+    """Retourne le TokenizedText d'un texte (inchangé s'il est déjà découpé)"""
+    if isinstance(text, TokenizedText):
+        return text
+    return TokenizedText(text)
@@ -0,0 +1,89 @@
+import os
+import json
+import struct
+import zlib
+
+class Vocabulary:
+    """
+    Table des mots rencontrés, avec des ids stables: un mot garde l'id reçu
+    à sa première apparition (0 est réservé aux mots inconnus).
+    - words: liste des mots, l'id d'un mot est sa position
+    - ids: dictionnaire mot -> id pour les recherches
+    La sauvegarde est binaire (en-tête puis mots UTF-8 séparés par '\n', les
+    mots ne contenant pas d'espace): le chargement se résume à un découpage
+    et reste rapide avec des millions de mots.
+    """
+
+    MAGIC = b'BBVOCAB1'
+    HASH_RANGE = 2 ** 32 + 1
+
+    def __init__(self):
+        self.words = [None]
+        self.ids = {}
+
+    def __len__(self):
+        return len(self.words) - 1
+
+    def __contains__(self, word):
+        return word in self.ids
+
+    def add(self, word):
+        """Ajoute un mot s'il est nouveau et retourne son id"""
+        word_id = self.ids.get(word)
+        if word_id is None:
+            word_id = len(self.words)
+            self.ids[word] = word_id
+            self.words.append(word)
+        return word_id
+
+    def update(self, words):
+        """Ajoute une suite de mots et retourne leurs ids"""
+        return [self.add(word) for word in words]
+
+    def get(self, word, default=0):
+        return self.ids.get(word, default)
+
+    def word(self, word_id):
+        """Mot associé à un id (None si l'id est inconnu)"""
+        return self.words[word_id] if 0 < word_id < len(self.words) else None
+
+    @classmethod
+    def hash_value(cls, word):
+        """
+        Valeur stable dans ]0, 1] représentant un mot dans un encodage
+        (crc32 ne dépend ni de PYTHONHASHSEED ni de la taille du vocabulaire)
+        """
+        return (zlib.crc32(word.encode('utf-8')) + 1) / cls.HASH_RANGE
+
+    def save(self, path):
+        """Sauvegarde binaire du vocabulaire"""
+        blob = '\n'.join(self.words[1:]).encode('utf-8')
+        temp_path = path + '.tmp'
+        with open(temp_path, 'wb') as f:
+            f.write(self.MAGIC)
+            f.write(struct.pack('<I', len(self)))
+            f.write(blob)
+        os.replace(temp_path, path)
+
+    def load(self, path):
+        """Charge une sauvegarde binaire"""
+        with open(path, 'rb') as f:
+            if f.read(len(self.MAGIC)) != self.MAGIC:
+                raise ValueError(f"Format de vocabulaire inconnu: {path}")
+            count, = struct.unpack('<I', f.read(4))
+            blob = f.read()
+
+        words = blob.decode('utf-8').split('\n') if count else []
+        if len(words) != count:
+            raise ValueError(f"Vocabulaire incomplet: {len(words)} mots lus sur {count}")
+        self.words = [None] + words
+        self.ids = dict(zip(words, range(1, count + 1)))
+
+    def load_json(self, path):
+        """Charge l'ancien format JSON ({'vocabulary': {mot: id}, 'next_word_id': n})"""
+        with open(path, 'r') as f:
+            vocab_data = json.load(f)
+        self.words = [None]
+        self.ids = {}
+        for word, _ in sorted(vocab_data['vocabulary'].items(), key=lambda item: item[1]):
+            self.add(word)
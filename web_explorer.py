@@ -5,10 +5,17 @@ import time
 import re
 import json
 import os
+import threading
 from datetime import datetime
 import numpy as np
 from urllib.parse import urljoin, urlparse
 
+from interest_scorer import InterestScorer
+from metrics import time_stage, PAGES_FETCHED
+from profiling import timed_methods
+from tokenizer import tokenize
+
+@timed_methods('explore_web', 'save_explorer_state', 'load_explorer_state')
 class WebExplorer:
     """
     Système d'exploration web simplifié qui permet au cerveau artificiel
@@ -27,6 +34,10 @@ class WebExplorer:
         # Historique d'exploration
         self.exploration_history = []
         
+        # Verrou de la queue et des URLs visitées (explorations en arrière-plan
+        # et requêtes de l'interface peuvent tourner en même temps)
+        self.lock = threading.RLock()
+        
         # Paramètres
         self.max_pages_per_session = 5
         self.min_delay_between_requests = 2  # En secondes
@@ -39,6 +50,11 @@ class WebExplorer:
             "language", "communication", "understanding"
         ]
         
+        # Évaluateur d'intérêt ('compat' reproduit exactement l'ancien calcul)
+        self.interest_mode = 'compat'
+        self.tfidf_weight = 0.0  # Poids du terme TF-IDF basé sur la mémoire (0 = désactivé)
+        self.interest_scorer = self._create_interest_scorer()
+        
         # User-Agent pour ne pas être bloqué
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
@@ -115,40 +131,22 @@ class WebExplorer:
         # Limite le nombre de liens pour éviter une explosion
         return links[:20]
     
+    def _create_interest_scorer(self):
+        """Crée l'évaluateur d'intérêt à partir des paramètres courants"""
+        return InterestScorer(
+            self.interest_keywords,
+            mode=self.interest_mode,
+            memory_system=self.learning_system.memory_system,
+            tfidf_weight=self.tfidf_weight
+        )
+    
     def _evaluate_interest(self, text, query=None):
         """Évalue l'intérêt potentiel d'un texte pour l'apprentissage"""
-        interest_score = 0.5  # Score de base
-        
-        # Bonus pour les textes de longueur moyenne (ni trop courts, ni trop longs)
-        text_length = len(text)
-        if 100 < text_length < 1000:
-            interest_score += 0.2
-        elif text_length >= 1000:
-            interest_score += 0.1
-            
-        # Bonus pour les mots-clés intéressants
-        for keyword in self.interest_keywords:
-            if keyword in text.lower():
-                interest_score += 0.05
-        
-        # Si une requête spécifique est fournie, évalue la pertinence par rapport à cette requête
-        if query:
-            query_words = query.lower().split()
-            matched_words = 0
-            
-            # Compte combien de mots de la requête se trouvent dans le texte
-            for word in query_words:
-                if len(word) > 3 and word in text.lower():  # Ignore les mots très courts
-                    matched_words += 1
-            
-            # Calcul du ratio de correspondance
-            if query_words:
-                match_ratio = matched_words / len(query_words)
-                # Bonus substantiel pour les textes pertinents à la requête
-                interest_score += match_ratio * 0.5
-                
-        # Plafonne à 1.0
-        return min(interest_score, 1.0)
+        return self.interest_scorer.score(text, query)
+    
+    def _evaluate_interest_batch(self, paragraphs, query=None):
+        """Évalue l'intérêt de tous les paragraphes d'une page en un seul appel"""
+        return self.interest_scorer.score_batch(paragraphs, query)
     
     def explore_web(self, max_pages=None, query=None):
         """
@@ -160,65 +158,83 @@ class WebExplorer:
             max_pages = self.max_pages_per_session
             
         pages_explored = 0
+        memory_system = self.learning_system.memory_system
+        crawl_dedup_start = dict(memory_system.dedup_stats)
         
-        while pages_explored < max_pages and self.url_queue:
-            # Sélectionne une URL dans la queue (privilégie les URLs spéciales pour les recherches)
-            if query and any("search" in url.lower() for url in self.url_queue):
-                # Pour une recherche spécifique, priorise les URLs contenant "search"
-                url_indices = [i for i, u in enumerate(self.url_queue) if "search" in u.lower()]
-                url_idx = url_indices[0] if url_indices else random.randint(0, len(self.url_queue) - 1)
-            else:
-                # Sélection aléatoire standard
-                url_idx = random.randint(0, len(self.url_queue) - 1)
+        while pages_explored < max_pages:
+            with self.lock:
+                if not self.url_queue:
+                    break
+                # Sélectionne une URL dans la queue (privilégie les URLs spéciales pour les recherches)
+                if query and any("search" in url.lower() for url in self.url_queue):
+                    # Pour une recherche spécifique, priorise les URLs contenant "search"
+                    url_indices = [i for i, u in enumerate(self.url_queue) if "search" in u.lower()]
+                    url_idx = url_indices[0] if url_indices else random.randint(0, len(self.url_queue) - 1)
+                else:
+                    # Sélection aléatoire standard
+                    url_idx = random.randint(0, len(self.url_queue) - 1)
+                    
+                url = self.url_queue.pop(url_idx)
                 
-            url = self.url_queue.pop(url_idx)
-            
-            try:
                 # Marque l'URL comme visitée
                 self.visited_urls.add(url)
-                
+            
+            try:
                 # Télécharge la page
                 print(f"Exploration de {url}")
-                response = requests.get(url, headers=self.headers, timeout=10)
+                try:
+                    with time_stage('web_fetch'):
+                        response = requests.get(url, headers=self.headers, timeout=10)
+                except Exception:
+                    PAGES_FETCHED.inc(outcome='error')
+                    raise
                 
                 # Vérifie si la requête a réussi
                 if response.status_code != 200:
+                    PAGES_FETCHED.inc(outcome='http_error')
                     print(f"Échec: statut HTTP {response.status_code}")
                     continue
-                    
-                # Parse la page
-                soup = BeautifulSoup(response.text, 'html.parser')
-                
-                # Titre de la page (pour le contexte de mémorisation)
-                page_title = soup.title.text if soup.title else url
+                PAGES_FETCHED.inc(outcome='ok')
                 
-                # Extrait le texte
-                paragraphs = self._extract_text_from_page(soup)
+                with time_stage('parse'):
+                    # Parse la page
+                    soup = BeautifulSoup(response.text, 'html.parser')
+                    
+                    # Titre de la page (pour le contexte de mémorisation)
+                    page_title = soup.title.text if soup.title else url
+                    
+                    # Extrait le texte
+                    paragraphs = self._extract_text_from_page(soup)
+                    
+                    # Extrait les liens pour l'exploration future
+                    new_links = self._extract_links_from_page(soup, url)
                 
-                # Extrait les liens pour l'exploration future
-                new_links = self._extract_links_from_page(soup, url)
-                
-                # Ajoute les nouveaux liens à la queue
-                for link in new_links:
-                    if link not in self.visited_urls and link not in self.url_queue:
-                        self.url_queue.append(link)
-                        
-                # Limite la taille de la queue
-                if len(self.url_queue) > self.max_url_queue_size:
-                    self.url_queue = self.url_queue[:self.max_url_queue_size]
+                with self.lock:
+                    # Ajoute les nouveaux liens à la queue
+                    for link in new_links:
+                        if link not in self.visited_urls and link not in self.url_queue:
+                            self.url_queue.append(link)
+                            
+                    # Limite la taille de la queue
+                    if len(self.url_queue) > self.max_url_queue_size:
+                        self.url_queue = self.url_queue[:self.max_url_queue_size]
                 
                 # Apprend à partir des paragraphes intéressants
+                page_dedup_start = dict(memory_system.dedup_stats)
                 learned_count = 0
                 highest_interest = 0
                 most_interesting_paragraph = ""
                 
-                for paragraph in paragraphs:
-                    # Ignore les paragraphes trop courts
-                    if len(paragraph) < 50:
-                        continue
-                        
-                    # Évalue l'intérêt en tenant compte de la requête le cas échéant
-                    interest = self._evaluate_interest(paragraph, query)
+                # Ignore les paragraphes trop courts; chaque paragraphe n'est découpé
+                # qu'une fois pour l'évaluation, l'encodage et la détection des doublons
+                candidates = [tokenize(p) for p in paragraphs if len(p) >= 50]
+                
+                # Évalue l'intérêt de toute la page en tenant compte de la requête le cas échéant
+                interests = self._evaluate_interest_batch(candidates, query)
+                
+                for tokenized, interest in zip(candidates, interests):
+                    paragraph = tokenized.text
+                    interest = float(interest)
                     
                     # Garde trace du paragraphe le plus intéressant
                     if interest > highest_interest:
@@ -244,7 +260,8 @@ class WebExplorer:
                         self.learning_system.memory_system.add_memory(
                             content=paragraph,
                             metadata=metadata,
-                            importance=importance
+                            importance=importance,
+                            tokens=tokenized.tokens
                         )
                         
                         learned_count += 1
@@ -277,6 +294,7 @@ class WebExplorer:
                     'paragraphs_count': len(paragraphs),
                     'learned_paragraphs': learned_count,
                     'new_links_found': len(new_links),
+                    'duplicates_skipped': memory_system.dedup_report(page_dedup_start)['duplicates'],
                     'query': query if query else None
                 })
                 
@@ -288,21 +306,29 @@ class WebExplorer:
             except Exception as e:
                 print(f"Erreur lors de l'exploration de {url}: {str(e)}")
                 continue
+        
+        # Rapport de déduplication pour cette session d'exploration
+        dedup = memory_system.dedup_report(crawl_dedup_start)
+        if dedup['checked']:
+            print(f"Doublons ignorés: {dedup['duplicates']}/{dedup['checked']} ({dedup['ratio']:.1%})")
                 
         return pages_explored
     
     def add_url_to_explore(self, url):
         """Ajoute une URL à la queue d'exploration"""
-        if self._is_valid_url(url) and url not in self.url_queue:
-            self.url_queue.append(url)
-            return True
-        return False
+        with self.lock:
+            if self._is_valid_url(url) and url not in self.url_queue:
+                self.url_queue.append(url)
+                return True
+            return False
     
     def get_exploration_stats(self):
         """Retourne des statistiques sur l'exploration web"""
+        with self.lock:
+            urls_visited, urls_in_queue = len(self.visited_urls), len(self.url_queue)
         stats = {
-            'urls_visited': len(self.visited_urls),
-            'urls_in_queue': len(self.url_queue),
+            'urls_visited': urls_visited,
+            'urls_in_queue': urls_in_queue,
             'exploration_history': len(self.exploration_history)
         }
         
@@ -314,14 +340,18 @@ class WebExplorer:
     
     def save_explorer_state(self, path="explorer_state.json"):
         """Sauvegarde l'état de l'explorateur web"""
+        with self.lock:
+            visited_urls, url_queue = list(self.visited_urls), list(self.url_queue)
         state = {
-            'visited_urls': list(self.visited_urls),
-            'url_queue': self.url_queue,
+            'visited_urls': visited_urls,
+            'url_queue': url_queue,
             'exploration_history': self.exploration_history[-100:],  # Seulement les 100 derniers
             'max_pages_per_session': self.max_pages_per_session,
             'min_delay_between_requests': self.min_delay_between_requests,
             'max_url_queue_size': self.max_url_queue_size,
-            'interest_keywords': self.interest_keywords
+            'interest_keywords': self.interest_keywords,
+            'interest_mode': self.interest_mode,
+            'tfidf_weight': self.tfidf_weight
         }
         
         with open(path, 'w') as f:
@@ -335,13 +365,17 @@ class WebExplorer:
             with open(path, 'r') as f:
                 state = json.load(f)
                 
-            self.visited_urls = set(state['visited_urls'])
-            self.url_queue = state['url_queue']
+            with self.lock:
+                self.visited_urls = set(state['visited_urls'])
+                self.url_queue = state['url_queue']
             self.exploration_history = state['exploration_history']
             self.max_pages_per_session = state['max_pages_per_session']
             self.min_delay_between_requests = state['min_delay_between_requests']
             self.max_url_queue_size = state['max_url_queue_size']
             self.interest_keywords = state['interest_keywords']
+            self.interest_mode = state.get('interest_mode', 'compat')
+            self.tfidf_weight = state.get('tfidf_weight', 0.0)
+            self.interest_scorer = self._create_interest_scorer()
             
             print(f"État de l'explorateur web chargé depuis {path}")
             return True
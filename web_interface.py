@@ -1,9 +1,12 @@
-from flask import Flask, render_template, request, jsonify, send_from_directory
+from flask import Flask, Response, render_template, request, jsonify, send_from_directory, stream_with_context
 import json
 import os
 import time
 from datetime import datetime
 
+from metrics import REGISTRY
+from profiling import PROFILER, Profiler
+
 app = Flask(__name__)
 
 # Référence globale au cerveau artificiel
@@ -21,41 +24,83 @@ def send_static(path):
 
 @app.route('/api/status', methods=['GET'])
 def get_status():
-    """Retourne le statut actuel du cerveau artificiel"""
+    """
+    Retourne le statut actuel du cerveau artificiel
+    L'en-tête If-None-Match permet de recevoir un 304 si rien n'a changé; avec
+    le paramètre `wait` (secondes, 60 au plus) la réponse n'est envoyée que
+    lorsque le statut change ou à l'expiration du délai
+    """
     if not brain:
         return jsonify({
             'status': 'error',
             'message': 'Le cerveau n\'est pas initialisé'
         }), 500
     
-    # Récupération des statistiques
-    stats = {
-        'neural_network': {
-            'experience_counter': brain.neural_core.experience_counter,
-            'learning_rate': brain.neural_core.learning_rate,
-            'curiosity_factor': brain.neural_core.curiosity_factor
-        },
-        'memory': {
-            'stm_size': len(brain.memory_system.stm_buffer),
-            'ltm_size': len(brain.memory_system.ltm_network),
-            'total_memories': brain.memory_system.memory_counter
-        },
-        'learning': {
-            'exploration_rate': brain.learning_system.exploration_rate,
-            'total_experiences': brain.learning_system.total_experiences,
-            'concepts_count': len(brain.learning_system.concepts)
-        }
-    }
+    client_etags = [tag.strip() for tag in request.headers.get('If-None-Match', '').split(',') if tag.strip()]
+    wait = min(max(request.args.get('wait', 0, type=float), 0), 60)
+    
+    monitor = brain.status_monitor
+    if wait and client_etags:
+        _, etag, body, _ = monitor.wait_for_change(client_etags[0], wait)
+    else:
+        _, etag, body, _ = monitor.snapshot()
     
-    if hasattr(brain, 'web_explorer'):
-        stats['web_explorer'] = brain.web_explorer.get_exploration_stats()
+    headers = {'ETag': etag, 'Cache-Control': 'no-cache'}
+    if etag in client_etags or '*' in client_etags:
+        return Response(status=304, headers=headers)
+    return Response(body, mimetype='application/json', headers=headers)
+
+def _admin_authorized():
+    """Les routes d'administration exigent l'en-tête X-Admin-Token si BABY_BRAIN_ADMIN_TOKEN est défini"""
+    token = os.environ.get('BABY_BRAIN_ADMIN_TOKEN')
+    return not token or request.headers.get('X-Admin-Token') == token
+
+@app.route('/api/admin/profile', methods=['GET', 'POST'])
+def admin_profile():
+    """
+    Pilote le profilage à chaud
+    POST {"requests": N, "mode": "cprofile"|"sampling", "method_timing": bool}
+    profile les N prochaines interactions; GET retourne l'état courant
+    """
+    if not _admin_authorized():
+        return jsonify({
+            'status': 'error',
+            'message': 'Accès refusé'
+        }), 403
+    
+    if request.method == 'POST':
+        data = request.get_json(silent=True) or {}
+        mode = data.get('mode', 'cprofile')
+        if mode not in Profiler.MODES:
+            return jsonify({
+                'status': 'error',
+                'message': f"Mode de profilage inconnu: {mode}"
+            }), 400
+        if 'requests' in data:
+            try:
+                count = int(data['requests'])
+            except (TypeError, ValueError):
+                count = -1
+            if count < 0 or isinstance(data['requests'], bool):
+                return jsonify({
+                    'status': 'error',
+                    'message': f"Nombre d'interactions à profiler invalide: {data['requests']}"
+                }), 400
+            PROFILER.arm(count, mode=mode)
+        if 'method_timing' in data:
+            PROFILER.method_timing = bool(data['method_timing'])
     
     return jsonify({
-        'status': 'active',
-        'timestamp': datetime.now().isoformat(),
-        'stats': stats
+        'status': 'success',
+        'profiling': PROFILER.state(),
+        'timestamp': datetime.now().isoformat()
     })
 
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """Métriques au format d'exposition texte de Prometheus"""
+    return Response(REGISTRY.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
 @app.route('/api/interact', methods=['POST'])
 def interact():
     """Point d'entrée pour interagir avec le cerveau artificiel"""
@@ -84,19 +129,23 @@ def interact():
         message = data['message']
         is_positive = data.get('is_positive', True)  # Par défaut, considère un message positif
         
-        # Interaction avec le cerveau
+        # Interaction avec le cerveau (une éventuelle recherche web continue en arrière-plan)
         try:
             start_time = time.time()
-            response = brain.process_message(message, is_positive)
+            with PROFILER.profile('interact'):
+                response, research_job = brain.process_message_async(message, is_positive)
             processing_time = time.time() - start_time
             
-            return jsonify({
+            result = {
                 'status': 'success',
                 'input': message,
                 'response': response,
                 'processing_time': processing_time,
                 'timestamp': datetime.now().isoformat()
-            })
+            }
+            if research_job:
+                result['research'] = _research_links(research_job)
+            return jsonify(result)
         except Exception as e:
             print(f"Erreur lors de l'interaction avec le cerveau: {str(e)}")
             return jsonify({
@@ -110,6 +159,161 @@ def interact():
             'message': 'Une erreur inattendue s\'est produite'
         }), 500
 
+def _research_links(job_id):
+    """Description d'une recherche lancée, avec les URLs pour la suivre"""
+    return {
+        'job_id': job_id,
+        'status': 'pending',
+        'poll_url': f'/api/research/{job_id}',
+        'events_url': f'/api/research/{job_id}/events'
+    }
+
+def _research_job_data(job):
+    """Convertit une recherche en arrière-plan pour le JSON"""
+    result = job['result'] or {}
+    return {
+        'job_id': job['id'],
+        'query': job['query'],
+        'status': job['status'],
+        'response': result.get('response'),
+        'pages_explored': result.get('pages_explored'),
+        'error': job['error'],
+        'created_at': job['created_at'],
+        'finished_at': job['finished_at']
+    }
+
+def _sse_event(event, data):
+    """Formate un événement server-sent events"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+def _event_stream(events):
+    """Réponse HTTP diffusant des événements au fil de leur production"""
+    return Response(stream_with_context(events), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+def _research_event_stream(job_id):
+    """Événements 'research' à chaque changement d'état d'une recherche, jusqu'à sa fin"""
+    queue = brain.research_queue
+    known_status = None
+    job = queue.get(job_id)
+    while True:
+        if job is None:
+            # Recherche oubliée entre-temps
+            yield _sse_event('research', {'job_id': job_id, 'status': 'unknown'})
+            return
+        if job['status'] == known_status:
+            # Commentaire périodique pour garder la connexion ouverte
+            yield ": keepalive\n\n"
+        else:
+            known_status = job['status']
+            yield _sse_event('research', _research_job_data(job))
+            if known_status in ('done', 'error'):
+                return
+        job = queue.wait(job_id, timeout=15, known_status=known_status)
+
+@app.route('/api/research/<job_id>', methods=['GET'])
+def research_status(job_id):
+    """
+    Retourne l'état d'une recherche web en arrière-plan
+    Le paramètre `wait` (secondes, 30 au plus) attend la fin de la recherche
+    """
+    if not brain:
+        return jsonify({
+            'status': 'error',
+            'message': 'Le cerveau n\'est pas initialisé'
+        }), 500
+    
+    wait = min(max(request.args.get('wait', 0, type=float), 0), 30)
+    if wait:
+        job = brain.research_queue.wait(job_id, timeout=wait)
+    else:
+        job = brain.research_queue.get(job_id)
+    
+    if job is None:
+        return jsonify({
+            'status': 'error',
+            'message': 'Recherche inconnue'
+        }), 404
+    
+    return jsonify({
+        'status': 'success',
+        'research': _research_job_data(job),
+        'timestamp': datetime.now().isoformat()
+    })
+
+@app.route('/api/research/<job_id>/events', methods=['GET'])
+def research_events(job_id):
+    """Flux d'événements (server-sent events) suivant une recherche web jusqu'à sa fin"""
+    if not brain:
+        return jsonify({
+            'status': 'error',
+            'message': 'Le cerveau n\'est pas initialisé'
+        }), 500
+    
+    if brain.research_queue.get(job_id) is None:
+        return jsonify({
+            'status': 'error',
+            'message': 'Recherche inconnue'
+        }), 404
+    
+    return _event_stream(_research_event_stream(job_id))
+
+@app.route('/api/interact/stream', methods=['POST'])
+def interact_stream():
+    """
+    Variante de /api/interact diffusant chaque étape du traitement en
+    server-sent events: ack, learning, memories, response, status, puis
+    research (recherche web éventuelle) et enfin done
+    """
+    if not brain:
+        return jsonify({
+            'status': 'error',
+            'message': 'Le cerveau n\'est pas initialisé'
+        }), 500
+    
+    data = request.get_json(silent=True)
+    if not data or 'message' not in data:
+        return jsonify({
+            'status': 'error',
+            'message': 'Message obligatoire'
+        }), 400
+    
+    message = data['message']
+    is_positive = data.get('is_positive', True)
+    
+    def events():
+        start_time = time.time()
+        yield _sse_event('ack', {'input': message, 'timestamp': datetime.now().isoformat()})
+        
+        research_job = None
+        try:
+            with PROFILER.profile('interact_stream'):
+                for stage, stage_data in brain.process_message_stages(message, is_positive):
+                    if stage == 'response':
+                        research_job = stage_data['research_job']
+                        stage_data = {
+                            'input': message,
+                            'response': stage_data['response'],
+                            'processing_time': time.time() - start_time,
+                            'timestamp': datetime.now().isoformat()
+                        }
+                        if research_job:
+                            stage_data['research'] = _research_links(research_job)
+                    yield _sse_event(stage, stage_data)
+            
+            # Nouvelles statistiques: le client n'a pas besoin d'interroger /api/status
+            yield _sse_event('status', brain.status_monitor.snapshot()[3])
+        except Exception as e:
+            print(f"Erreur lors de l'interaction avec le cerveau: {str(e)}")
+            yield _sse_event('error', {'message': f"Erreur: {str(e)}"})
+        
+        if research_job:
+            yield from _research_event_stream(research_job)
+        
+        yield _sse_event('done', {'processing_time': time.time() - start_time})
+    
+    return _event_stream(events())
+
 @app.route('/api/feedback', methods=['POST'])
 def feedback():
     """Point d'entrée pour envoyer un feedback sur une réponse précédente"""
@@ -184,6 +388,7 @@ def explore_web():
     
     # Déclenche l'exploration
     pages_explored = brain.web_explorer.explore_web(max_pages)
+    brain.status_monitor.notify()
     
     return jsonify({
         'status': 'success',
@@ -210,6 +415,8 @@ def add_url():
     
     # Ajoute l'URL
     success = brain.web_explorer.add_url_to_explore(data['url'])
+    if success:
+        brain.status_monitor.notify()
     
     return jsonify({
         'status': 'success' if success else 'error',
@@ -255,49 +462,100 @@ def retrieve_memory():
     query = data['query']
     top_k = data.get('top_k', 3)
     
-    # Recherche des souvenirs
-    memories = brain.memory_system.retrieve_memory(query, top_k)
+    # Mode de recherche: similarité seule ou propagation d'activation dans le réseau
+    mode = data.get('mode', 'cosine')
+    if mode not in brain.memory_system.RETRIEVAL_MODES:
+        return jsonify({
+            'status': 'error',
+            'message': f"Mode inconnu (valeurs possibles: {', '.join(brain.memory_system.RETRIEVAL_MODES)})"
+        }), 400
     
-    # Conversion pour le JSON
+    # Recherche des souvenirs, copiés avant qu'une recherche en arrière-plan ne les modifie
     memory_list = []
-    for memory in memories:
-        memory_copy = dict(memory)
-        # Supprime les champs non sérialisables
-        if 'encoding' in memory_copy:
-            memory_copy['encoding'] = memory_copy['encoding'].tolist()
-        memory_list.append(memory_copy)
+    with brain.memory_system.lock:
+        memories = brain.memory_system.retrieve_memory(query, top_k, mode=mode)
+        
+        # Conversion pour le JSON
+        for memory in memories:
+            memory_copy = dict(memory)
+            # Supprime les champs non sérialisables
+            if 'encoding' in memory_copy:
+                memory_copy['encoding'] = memory_copy['encoding'].tolist()
+            memory_list.append(memory_copy)
+    # La recherche peut promouvoir des souvenirs du niveau froid
+    brain.status_monitor.notify()
     
     return jsonify({
         'status': 'success',
         'query': query,
+        'mode': mode,
         'memories': memory_list,
         'timestamp': datetime.now().isoformat()
     })
 
 @app.route('/api/visualize_memory', methods=['GET'])
 def visualize_memory():
-    """Génère et renvoie une visualisation du réseau de mémoire"""
+    """
+    Renvoie une visualisation du réseau de mémoire
+    L'image n'est recalculée (en arrière-plan) que si le réseau a changé; la
+    requête attend au plus ?wait=<secondes> (10 par défaut, 30 au maximum)
+    """
     if not brain:
         return jsonify({
             'status': 'error',
             'message': 'Le cerveau n\'est pas initialisé'
         }), 500
     
-    # Génère la visualisation
-    filename = f'memory_network_{int(time.time())}.png'
-    filepath = os.path.join('static', 'visualizations', filename)
+    wait = min(max(request.args.get('wait', 10, type=float), 0), 30)
+    image = brain.memory_visualizer.request(timeout=wait)
     
-    # Assure que le répertoire existe
-    os.makedirs(os.path.dirname(filepath), exist_ok=True)
-    
-    brain.memory_system.visualize_memory_network(filepath)
+    if image['url'] is None:
+        # Premier rendu encore en cours
+        return jsonify({
+            'status': 'pending',
+            'rendering': image['rendering'],
+            'timestamp': datetime.now().isoformat()
+        }), 202
     
     return jsonify({
         'status': 'success',
-        'visualization_url': f'/static/visualizations/{filename}',
+        'visualization_url': image['url'],
+        'version': image['version'],
+        'up_to_date': image['up_to_date'],
+        'rendering': image['rendering'],
+        'rendered_at': image['rendered_at'],
+        'render_time': image['render_time'],
         'timestamp': datetime.now().isoformat()
     })
 
+@app.route('/api/memory_graph', methods=['GET'])
+def memory_graph():
+    """
+    Sous-graphe du réseau de mémoire en JSON compact pour le rendu dans le navigateur
+    - max_nodes: nombre de nœuds de la page (500 par défaut, 2000 au maximum)
+    - offset: rang du premier nœud (nœuds classés par importance décroissante)
+    """
+    if not brain:
+        return jsonify({
+            'status': 'error',
+            'message': 'Le cerveau n\'est pas initialisé'
+        }), 500
+    
+    max_nodes = min(max(request.args.get('max_nodes', 500, type=int), 1), 2000)
+    offset = max(request.args.get('offset', 0, type=int), 0)
+    
+    try:
+        data = brain.memory_system.graph_data(max_nodes=max_nodes, offset=offset)
+    except Exception as e:
+        print(f"Erreur lors de l'extraction du réseau de mémoire: {str(e)}")
+        return jsonify({
+            'status': 'error',
+            'message': f"Erreur: {str(e)}"
+        }), 500
+    
+    data['status'] = 'success'
+    return jsonify(data)
+
 def start_interface(brain_instance, host='127.0.0.1', port=5000, debug=False):
     """Démarre l'interface web"""
     global brain